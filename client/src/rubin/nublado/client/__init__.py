@@ -7,6 +7,13 @@ try:
 except ImportError:
     pass
 
+from ._batch import NotebookBatch, NotebookBatchResult
+from ._cache import (
+    NubladoMemorySessionCache,
+    NubladoSessionCache,
+    NubladoSessionCookie,
+    NubladoSessionState,
+)
 from ._client import NubladoClient
 from ._exceptions import (
     NubladoDiscoveryError,
@@ -20,7 +27,13 @@ from ._exceptions import (
     NubladoWebError,
     NubladoWebSocketError,
 )
+from ._fleet import NubladoFleet
 from ._http import JupyterAsyncClient
+from ._loadtest import (
+    MockJupyterLoadTest,
+    MockJupyterLoadTestReport,
+    MockJupyterOperationStats,
+)
 from ._mock import (
     MockJupyter,
     MockJupyterAction,
@@ -52,7 +65,12 @@ __all__ = [
     "MockJupyterAction",
     "MockJupyterExecutionParameters",
     "MockJupyterLabSession",
+    "MockJupyterLoadTest",
+    "MockJupyterLoadTestReport",
+    "MockJupyterOperationStats",
     "MockJupyterState",
+    "NotebookBatch",
+    "NotebookBatchResult",
     "NotebookExecutionError",
     "NotebookExecutionResult",
     "NubladoClient",
@@ -60,14 +78,19 @@ __all__ = [
     "NubladoError",
     "NubladoExecutionError",
     "NubladoExecutionTimeoutError",
+    "NubladoFleet",
     "NubladoImage",
     "NubladoImageByClass",
     "NubladoImageByReference",
     "NubladoImageByTag",
     "NubladoImageClass",
     "NubladoImageSize",
+    "NubladoMemorySessionCache",
     "NubladoProtocolError",
     "NubladoRedirectError",
+    "NubladoSessionCache",
+    "NubladoSessionCookie",
+    "NubladoSessionState",
     "NubladoSpawnError",
     "NubladoTimeoutError",
     "NubladoWebError",
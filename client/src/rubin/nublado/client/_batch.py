@@ -0,0 +1,205 @@
+"""Execution of many notebooks concurrently."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from types import TracebackType
+from typing import TYPE_CHECKING, Literal, Self
+
+from ._exceptions import NubladoError, NubladoTimeoutError
+from ._models import CodeContext, NotebookExecutionResult
+
+if TYPE_CHECKING:
+    from ._client import NubladoClient
+
+__all__ = ["NotebookBatch", "NotebookBatchResult"]
+
+
+@dataclass(frozen=True, slots=True)
+class NotebookBatchResult:
+    """Outcome of executing one notebook in a batch."""
+
+    name: str
+    """Name of the notebook, as passed to `NubladoClient.run_notebooks`."""
+
+    elapsed: timedelta
+    """How long the notebook took to execute, including time queued."""
+
+    result: NotebookExecutionResult | None = None
+    """Execution results, if the notebook execution request succeeded.
+
+    If the notebook ran but a cell failed, the ``error`` attribute of the
+    result will be set.
+    """
+
+    error: NubladoError | None = None
+    """Error, if the notebook execution request failed or timed out."""
+
+    cancelled: bool = False
+    """Whether execution was cancelled with `NotebookBatch.cancel`."""
+
+
+class NotebookBatch:
+    """Execute many notebooks with bounded concurrency.
+
+    Objects of this type should be created by calling
+    `NubladoClient.run_notebooks` and used as an async context manager. All
+    notebooks are submitted when the context manager is entered, and the
+    results can be retrieved as they complete by iterating over the batch.
+    Any notebooks still running when the context manager exits are
+    cancelled.
+
+    Each notebook is executed by the notebook execution extension in the
+    user's lab, which starts a new kernel for each notebook, so notebooks
+    running concurrently do not share state.
+
+    Parameters
+    ----------
+    client
+        Client to use to execute the notebooks.
+    username
+        User on whose behalf the notebooks are executed.
+    notebooks
+        Mapping of notebook names to notebook contents.
+    concurrency
+        Maximum number of notebooks to execute at the same time.
+    kernel_name
+        If provided, override the default kernel name.
+    clear_local_site_packages
+        If provided, remove user-installed site-packages before executing
+        each notebook.
+    timeout
+        If provided, how long to allow for the execution of each notebook,
+        not including time spent waiting for other notebooks to finish.
+    """
+
+    def __init__(
+        self,
+        client: "NubladoClient",
+        username: str,
+        notebooks: Mapping[str, str],
+        *,
+        concurrency: int,
+        kernel_name: str | None = None,
+        clear_local_site_packages: bool = False,
+        timeout: timedelta | None = None,
+    ) -> None:
+        self._client = client
+        self._username = username
+        self._notebooks = notebooks
+        self._kernel_name = kernel_name
+        self._clear_local_site_packages = clear_local_site_packages
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._results: asyncio.Queue[NotebookBatchResult | Exception]
+        self._results = asyncio.Queue()
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+    async def __aenter__(self) -> Self:
+        for name, content in self._notebooks.items():
+            task = asyncio.create_task(self._run(name, content))
+            self._tasks[name] = task
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> Literal[False]:
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        return False
+
+    async def __aiter__(self) -> AsyncGenerator[NotebookBatchResult]:
+        """Iterate over the results in the order in which they complete.
+
+        Yields
+        ------
+        NotebookBatchResult
+            Outcome of the next notebook to complete, fail, time out, or be
+            cancelled.
+
+        Raises
+        ------
+        Exception
+            Any exception other than `NubladoError` raised while executing a
+            notebook, such as `rubin.repertoire.RepertoireError`, is raised
+            when its result would have been returned.
+        """
+        for _ in range(len(self._tasks)):
+            result = await self._results.get()
+            if isinstance(result, Exception):
+                raise result
+            yield result
+
+    def cancel(self, name: str) -> None:
+        """Cancel the execution of a notebook.
+
+        If the notebook is waiting to run, it will not be run. If it is
+        already running, the request to execute it is abandoned, although
+        the execution may continue in the lab until it finishes. Either way,
+        its result will have ``cancelled`` set. If the notebook has already
+        finished, this does nothing.
+
+        Parameters
+        ----------
+        name
+            Name of the notebook to cancel.
+
+        Raises
+        ------
+        KeyError
+            Raised if there is no notebook by that name in the batch.
+        """
+        self._tasks[name].cancel()
+
+    async def _run(self, name: str, content: str) -> None:
+        """Execute a single notebook and queue its outcome."""
+        queued = datetime.now(tz=UTC)
+        start = None
+        result = None
+        error: NubladoError | None = None
+        cancelled = False
+        try:
+            async with self._semaphore:
+                start = datetime.now(tz=UTC)
+                timeout = (
+                    self._timeout.total_seconds() if self._timeout else None
+                )
+                async with asyncio.timeout(timeout):
+                    result = await self._client.run_notebook(
+                        content,
+                        kernel_name=self._kernel_name,
+                        clear_local_site_packages=(
+                            self._clear_local_site_packages
+                        ),
+                        read_timeout=self._timeout,
+                    )
+        except asyncio.CancelledError:
+            cancelled = True
+        except TimeoutError:
+            error = NubladoTimeoutError(
+                f"Notebook {name} timed out",
+                self._username,
+                context=CodeContext(notebook=name),
+                started_at=start,
+            )
+        except NubladoError as e:
+            error = e
+            error.context.notebook = name
+        except Exception as e:
+            self._results.put_nowait(e)
+            return
+        elapsed = datetime.now(tz=UTC) - queued
+        self._results.put_nowait(
+            NotebookBatchResult(
+                name=name,
+                elapsed=elapsed,
+                result=result,
+                error=error,
+                cancelled=cancelled,
+            )
+        )
@@ -0,0 +1,114 @@
+"""Caches of per-user JupyterHub and JupyterLab session state."""
+
+from abc import ABCMeta, abstractmethod
+from dataclasses import dataclass, field
+
+__all__ = [
+    "NubladoMemorySessionCache",
+    "NubladoSessionCache",
+    "NubladoSessionCookie",
+    "NubladoSessionState",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class NubladoSessionCookie:
+    """A cookie set by JupyterHub or JupyterLab."""
+
+    name: str
+    """Name of the cookie."""
+
+    value: str
+    """Value of the cookie."""
+
+    domain: str
+    """Domain for which the cookie was set."""
+
+    path: str
+    """Path for which the cookie was set."""
+
+
+@dataclass(frozen=True, slots=True)
+class NubladoSessionState:
+    """State learned by a client while talking to JupyterHub and JupyterLab.
+
+    Discovering this state requires following the redirect chain from
+    JupyterHub through authentication to the user's lab, which takes several
+    round trips. Saving it allows a new client for the same user to skip that
+    discovery.
+    """
+
+    lab_base_url: str | None
+    """Base URL of the user's lab, if known."""
+
+    hub_xsrf: str | None
+    """XSRF token for JupyterHub, if known."""
+
+    lab_xsrf: str | None
+    """XSRF token for JupyterLab, if known."""
+
+    cookies: list[NubladoSessionCookie] = field(default_factory=list)
+    """Cookies set by JupyterHub and JupyterLab."""
+
+
+class NubladoSessionCache(metaclass=ABCMeta):
+    """Storage for session state shared between Nublado clients.
+
+    Implement this interface to store session state somewhere other than in
+    memory, such as in Redis, so that it can be shared between processes.
+    The stored state contains the user's authentication cookies and must be
+    protected accordingly.
+    """
+
+    @abstractmethod
+    async def delete(self, username: str) -> None:
+        """Delete the stored session state for a user, if any.
+
+        Parameters
+        ----------
+        username
+            User whose state should be deleted.
+        """
+
+    @abstractmethod
+    async def get(self, username: str) -> NubladoSessionState | None:
+        """Retrieve the stored session state for a user.
+
+        Parameters
+        ----------
+        username
+            User whose state should be retrieved.
+
+        Returns
+        -------
+        NubladoSessionState or None
+            Stored session state, or `None` if there is none.
+        """
+
+    @abstractmethod
+    async def store(self, username: str, state: NubladoSessionState) -> None:
+        """Store the session state for a user.
+
+        Parameters
+        ----------
+        username
+            User whose state should be stored.
+        state
+            Session state to store, replacing any existing state.
+        """
+
+
+class NubladoMemorySessionCache(NubladoSessionCache):
+    """Store session state shared between Nublado clients in memory."""
+
+    def __init__(self) -> None:
+        self._states: dict[str, NubladoSessionState] = {}
+
+    async def delete(self, username: str) -> None:
+        self._states.pop(username, None)
+
+    async def get(self, username: str) -> NubladoSessionState | None:
+        return self._states.get(username)
+
+    async def store(self, username: str, state: NubladoSessionState) -> None:
+        self._states[username] = state
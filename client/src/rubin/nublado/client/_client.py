@@ -3,17 +3,21 @@
 Allows the caller to login to spawn labs and execute code within the lab.
 """
 
-from collections.abc import AsyncGenerator
+import json
+from collections import deque
+from collections.abc import AsyncGenerator, Mapping
 from contextlib import aclosing
 from datetime import UTC, datetime, timedelta
 
 import structlog
-from httpx import HTTPError, Timeout
+from httpx import AsyncBaseTransport, HTTPError, Timeout
 from httpx_sse import EventSource
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 from rubin.repertoire import DiscoveryClient
 from structlog.stdlib import BoundLogger
 
+from ._batch import NotebookBatch
+from ._cache import NubladoSessionCache
 from ._exceptions import (
     NubladoProtocolError,
     NubladoSpawnError,
@@ -29,6 +33,15 @@ from ._session import JupyterLabSessionManager
 
 __all__ = ["NubladoClient"]
 
+_SPAWN_LOG_MAX_MESSAGES = 100
+"""Maximum number of spawn progress messages to keep for error reports."""
+
+_decode_progress_event = json.JSONDecoder().decode
+"""Decoder for spawn progress events, constructed once."""
+
+_progress_adapter = TypeAdapter(SpawnProgressMessage)
+"""Pydantic validator for spawn progress events, constructed once."""
+
 
 class JupyterSpawnProgress:
     """Async iterator returning spawn progress messages.
@@ -42,11 +55,22 @@ class JupyterSpawnProgress:
         Open EventStream connection.
     logger
         Logger to use.
+    validate
+        Whether to validate the types of the fields of each event with
+        Pydantic. By default, the fields are used without checking their
+        types, which is much faster when many spawns are being watched.
     """
 
-    def __init__(self, event_source: EventSource, logger: BoundLogger) -> None:
+    def __init__(
+        self,
+        event_source: EventSource,
+        logger: BoundLogger,
+        *,
+        validate: bool = False,
+    ) -> None:
         self._source = event_source
         self._logger = logger
+        self._validate = validate
         self._start = datetime.now(tz=UTC)
 
     async def __aiter__(self) -> AsyncGenerator[SpawnProgressMessage]:
@@ -66,12 +90,7 @@ class JupyterSpawnProgress:
         async with aclosing(self._source.aiter_sse()) as sse_events:
             async for sse in sse_events:
                 try:
-                    event_dict = sse.json()
-                    event = SpawnProgressMessage(
-                        progress=event_dict["progress"],
-                        message=event_dict["message"],
-                        ready=event_dict.get("ready", False),
-                    )
+                    event = self._parse_event(sse.data)
                 except Exception as e:
                     err = f"{type(e).__name__}: {e!s}"
                     msg = f"Error parsing progress event, ignoring: {err}"
@@ -86,6 +105,33 @@ class JupyterSpawnProgress:
                 self._logger.info(msg, elapsed=elapsed, status=status)
                 yield event
 
+    def _parse_event(self, data: str) -> SpawnProgressMessage:
+        """Parse the data of a spawn progress event.
+
+        Parameters
+        ----------
+        data
+            Data of the event, which should be a JSON object.
+
+        Returns
+        -------
+        SpawnProgressMessage
+            Parsed progress message.
+
+        Raises
+        ------
+        Exception
+            Raised if the event could not be parsed.
+        """
+        event = _decode_progress_event(data)
+        ready = event.get("ready", False)
+        if self._validate:
+            event["ready"] = ready
+            return _progress_adapter.validate_python(event)
+        return SpawnProgressMessage(
+            progress=event["progress"], message=event["message"], ready=ready
+        )
+
 
 class NubladoClient:
     """Client for talking to JupyterHub and Jupyter labs that use Nublado.
@@ -102,10 +148,21 @@ class NubladoClient:
     logger
         Logger to use. If not given, the default structlog logger will be
         used.
+    session_cache
+        If given, cache of session state shared between clients. The base URL
+        of the user's lab, the XSRF tokens, and the cookies learned by this
+        client are stored in the cache, and a later client for the same user
+        will use them instead of discovering them again. If a request fails
+        while using cached state, the state is discarded and the request is
+        retried once.
     timeout
         Timeout to use when talking to JupyterHub and Jupyter lab. This is
         used as a connection, read, and write timeout for all regular HTTP
         calls.
+    transport
+        If given, HTTPX transport to use for HTTP requests. This is normally
+        only set by `NubladoFleet` to share a connection pool between
+        clients.
     """
 
     def __init__(
@@ -115,13 +172,17 @@ class NubladoClient:
         *,
         discovery_client: DiscoveryClient | None = None,
         logger: BoundLogger | None = None,
+        session_cache: NubladoSessionCache | None = None,
         timeout: timedelta = timedelta(seconds=30),
+        transport: AsyncBaseTransport | None = None,
     ) -> None:
         self._username = username
+        self._session_cache = session_cache
         self._discovery = discovery_client or DiscoveryClient()
         self._logger = logger or structlog.get_logger()
         self._timeout = timeout
         self._token = token
+        self._transport = transport
         self._client = self._build_jupyter_client()
 
     async def aclose(self) -> None:
@@ -220,6 +281,7 @@ class NubladoClient:
         kernel_name: str = "lsst",
         max_websocket_size: int | None = None,
         websocket_open_timeout: timedelta = timedelta(seconds=60),
+        websocket_reconnect_attempts: int = 3,
     ) -> JupyterLabSessionManager:
         """Create a lab session manager.
 
@@ -239,6 +301,11 @@ class NubladoClient:
             Maximum size of a WebSocket message, or `None` for no limit.
         websocket_open_timeout
             Timeout for opening a WebSocket.
+        websocket_reconnect_attempts
+            Number of times to try to reopen the WebSocket to the same kernel
+            session if the connection is lost, such as by an ingress reset.
+            Code execution in progress resumes on the new connection. Set to
+            0 to disable reconnection.
 
         Returns
         -------
@@ -252,6 +319,7 @@ class NubladoClient:
             notebook_name=notebook_name,
             max_websocket_size=max_websocket_size,
             websocket_open_timeout=websocket_open_timeout,
+            websocket_reconnect_attempts=websocket_reconnect_attempts,
             logger=self._logger,
         )
 
@@ -343,6 +411,65 @@ class NubladoClient:
             msg = f"Cannot parse notebook execution results: {e!s}"
             raise NubladoProtocolError(msg) from e
 
+    def run_notebooks(
+        self,
+        notebooks: Mapping[str, str],
+        *,
+        concurrency: int = 10,
+        kernel_name: str | None = None,
+        clear_local_site_packages: bool = False,
+        timeout: timedelta | None = None,
+    ) -> NotebookBatch:
+        """Run many notebooks concurrently with the notebook extension.
+
+        Each notebook is executed as if by `run_notebook`, but up to
+        ``concurrency`` of them are executed at the same time. The returned
+        object must be used as an async context manager, which submits the
+        notebooks, and can be iterated over to get the results as each
+        notebook finishes.
+
+        .. code-block:: python
+
+           async with client.run_notebooks(notebooks) as batch:
+               async for result in batch:
+                   ...
+
+        Parameters
+        ----------
+        notebooks
+            Mapping of notebook names, used only to identify the results, to
+            notebook contents.
+        concurrency
+            Maximum number of notebooks to execute at the same time. The
+            notebook execution extension starts a separate kernel for each
+            notebook, so this is also the maximum number of kernels the batch
+            will use at a time.
+        kernel_name
+            If provided, override the default kernel name.
+        clear_local_site_packages
+            If provided, remove user-installed site-packages before executing
+            each notebook.
+        timeout
+            If provided, how long to allow each notebook to execute. This
+            does not include time spent waiting for other notebooks to finish
+            because of the concurrency limit. This is also used as the read
+            timeout for the underlying API calls.
+
+        Returns
+        -------
+        NotebookBatch
+            Context manager that executes the notebooks.
+        """
+        return NotebookBatch(
+            self,
+            self._username,
+            notebooks,
+            concurrency=concurrency,
+            kernel_name=kernel_name,
+            clear_local_site_packages=clear_local_site_packages,
+            timeout=timeout,
+        )
+
     async def spawn_lab(self, config: NubladoImage) -> None:
         """Spawn a Jupyter lab pod.
 
@@ -414,7 +541,8 @@ class NubladoClient:
             Raised if the URL is outside of Nublado's URL space or there is a
             redirect loop.
         NubladoSpawnError
-            Raised if the spawn failed.
+            Raised if the spawn failed. Its log contains the last 100
+            progress messages.
         NubladoWebError
             Raised if an HTTP error occurred talking to JupyterHub.
         rubin.repertoire.RepertoireError
@@ -422,7 +550,7 @@ class NubladoClient:
         """
         start = datetime.now(tz=UTC)
         message = None
-        log = []
+        log: deque[str] = deque(maxlen=_SPAWN_LOG_MAX_MESSAGES)
         async with aclosing(self.watch_spawn_progress()) as progress:
             async for message in progress:
                 log.append(message.message)
@@ -434,10 +562,12 @@ class NubladoClient:
         # without sending a ready message, which means the spawn failed. Use
         # the last message as the error message.
         error = message.message if message else "No output from spawn attempt"
-        raise NubladoSpawnError(error, log, self._username, started_at=start)
+        raise NubladoSpawnError(
+            error, list(log), self._username, started_at=start
+        )
 
     async def watch_spawn_progress(
-        self,
+        self, *, validate: bool = False
     ) -> AsyncGenerator[SpawnProgressMessage]:
         """Monitor lab spawn progress.
 
@@ -446,6 +576,13 @@ class NubladoClient:
         between the two by checking if the ``ready`` field of the last yielded
         message is `True`, indicating the spawn succeeded.
 
+        Parameters
+        ----------
+        validate
+            Whether to validate the types of the fields of each event with
+            Pydantic. By default, events are only checked for the required
+            fields, which is much faster when many spawns are being watched.
+
         Yields
         ------
         SpawnProgressMessage
@@ -468,7 +605,10 @@ class NubladoClient:
         stream_manager = await self._client.open_sse_stream(route)
         try:
             async with stream_manager as stream:
-                progress = aiter(JupyterSpawnProgress(stream, self._logger))
+                watcher = JupyterSpawnProgress(
+                    stream, self._logger, validate=validate
+                )
+                progress = aiter(watcher)
                 async with aclosing(progress):
                     async for message in progress:
                         yield message
@@ -482,7 +622,9 @@ class NubladoClient:
         return JupyterAsyncClient(
             discovery_client=self._discovery,
             logger=self._logger,
+            session_cache=self._session_cache,
             timeout=self._timeout,
             token=self._token,
+            transport=self._transport,
             username=self._username,
         )
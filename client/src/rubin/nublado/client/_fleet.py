@@ -0,0 +1,171 @@
+"""Shared resources for clients acting on behalf of many users."""
+
+import asyncio
+from datetime import timedelta
+
+import structlog
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    Limits,
+    Request,
+    Response,
+)
+from rubin.repertoire import DiscoveryClient
+from structlog.stdlib import BoundLogger
+
+from ._cache import NubladoSessionCache
+from ._client import NubladoClient
+
+__all__ = ["NubladoFleet"]
+
+
+class _SharedTransport(AsyncBaseTransport):
+    """Transport wrapper that is not closed with the client using it.
+
+    HTTPX closes the transport of a client when the client is closed. Each
+    `JupyterAsyncClient` closes its HTTPX client when it is reset or closed,
+    so the transport shared by a fleet of clients is wrapped in this class to
+    keep its connection pool open until the fleet itself is closed.
+
+    Parameters
+    ----------
+    transport
+        Underlying transport with the shared connection pool.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class _FleetDiscoveryClient(DiscoveryClient):
+    """Discovery client that serializes lookups.
+
+    The discovery client caches its results, but concurrent lookups with an
+    empty or expired cache each query Repertoire. Since every client in a
+    fleet looks up the Nublado URL when it starts, serialize the lookups so
+    that only the first one queries Repertoire and the rest use the cache.
+
+    Parameters
+    ----------
+    http_client
+        HTTP client to use.
+    """
+
+    def __init__(self, http_client: AsyncClient) -> None:
+        super().__init__(http_client)
+        self._lock = asyncio.Lock()
+
+    async def url_for_ui(self, service: str) -> str | None:
+        async with self._lock:
+            return await super().url_for_ui(service)
+
+
+class NubladoFleet:
+    """Create Nublado clients for many users that share resources.
+
+    Each `NubladoClient` normally has its own HTTP connection pool and, unless
+    one is passed in, its own service discovery client. When driving a large
+    number of simulated users from one process, that means one set of
+    connections and TLS handshakes to JupyterHub per user, and repeated
+    service discovery lookups.
+
+    Clients created by this class instead share a single HTTP connection pool
+    and a single service discovery client, so discovery results are cached
+    across all users. Cookies and XSRF tokens are still kept separately for
+    each client, since they are specific to a user.
+
+    Parameters
+    ----------
+    discovery_client
+        If given, Repertoire_ discovery client to share between clients.
+        Otherwise, a new client will be created that uses the shared
+        connection pool and queries Repertoire only once when many clients
+        start at the same time.
+    logger
+        Logger to use. If not given, the default structlog logger will be
+        used.
+    max_connections
+        Maximum number of open HTTP connections across all clients, or `None`
+        for no limit.
+    max_keepalive_connections
+        Maximum number of idle HTTP connections to keep open across all
+        clients, or `None` for no limit.
+    session_cache
+        If given, cache of session state used by all clients.
+    timeout
+        Timeout to use when talking to JupyterHub and Jupyter lab. This is
+        used as a connection, read, and write timeout for all regular HTTP
+        calls.
+    """
+
+    def __init__(
+        self,
+        *,
+        discovery_client: DiscoveryClient | None = None,
+        logger: BoundLogger | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        session_cache: NubladoSessionCache | None = None,
+        timeout: timedelta = timedelta(seconds=30),
+    ) -> None:
+        self._logger = logger or structlog.get_logger()
+        self._session_cache = session_cache
+        self._timeout = timeout
+        limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._pool = AsyncHTTPTransport(limits=limits)
+        self._transport = _SharedTransport(self._pool)
+        self._http_client = AsyncClient(
+            timeout=timeout.total_seconds(), transport=self._transport
+        )
+        self._discovery = discovery_client or _FleetDiscoveryClient(
+            self._http_client
+        )
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool.
+
+        This invalidates the fleet object and all clients created from it.
+        None of them can be used after this method is called. A discovery
+        client passed to the constructor is not closed.
+        """
+        await self._http_client.aclose()
+        await self._pool.aclose()
+
+    def client(self, username: str, token: str) -> NubladoClient:
+        """Create a client for a user that uses the shared resources.
+
+        The client does not need to be closed separately, although closing
+        it is harmless. Its resources are released when the fleet is closed.
+
+        Parameters
+        ----------
+        username
+            User whose lab should be managed.
+        token
+            Token to use for authentication.
+
+        Returns
+        -------
+        NubladoClient
+            Client for that user.
+        """
+        return NubladoClient(
+            username,
+            token,
+            discovery_client=self._discovery,
+            logger=self._logger,
+            session_cache=self._session_cache,
+            timeout=self._timeout,
+            transport=self._transport,
+        )
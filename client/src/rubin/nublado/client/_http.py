@@ -9,13 +9,26 @@ from typing import Any, Concatenate, Literal
 from urllib.parse import urljoin, urlparse
 
 import websockets
-from httpx import AsyncClient, Cookies, HTTPError, Response, Timeout
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    Cookies,
+    HTTPError,
+    HTTPStatusError,
+    Response,
+    Timeout,
+)
 from httpx_sse import EventSource, aconnect_sse
 from rubin.repertoire import DiscoveryClient
 from structlog.stdlib import BoundLogger
 from websockets.asyncio.client import ClientConnection
 from websockets.typing import Subprotocol
 
+from ._cache import (
+    NubladoSessionCache,
+    NubladoSessionCookie,
+    NubladoSessionState,
+)
 from ._exceptions import (
     NubladoDiscoveryError,
     NubladoRedirectError,
@@ -28,13 +41,50 @@ type SecFetchMode = Literal[
 
 __all__ = ["JupyterAsyncClient"]
 
+_AUTH_FAILURE_STATUSES = (401, 403)
+"""HTTP status codes indicating that the session was not accepted."""
+
+_LOGIN_ROUTE = "hub/login"
+"""Route of the JupyterHub login page, relative to the Nublado base URL."""
+
+_STALE_STATE_ERRORS = (HTTPStatusError, NubladoRedirectError)
+"""Exceptions that may indicate that cached session state is stale."""
+
+
+def _is_auth_failure(exc: HTTPStatusError | NubladoRedirectError) -> bool:
+    """Determine whether an exception means the session was not accepted.
+
+    Only these failures are blamed on stale cached session state. Other
+    failures, such as timeouts, are not evidence that the state is stale, and
+    retrying the request could repeat a request that was not idempotent.
+
+    Parameters
+    ----------
+    exc
+        Exception raised by a request.
+
+    Returns
+    -------
+    bool
+        `True` if the request was rejected as unauthenticated or was
+        redirected to the login page, `False` otherwise.
+    """
+    if isinstance(exc, HTTPStatusError):
+        return exc.response.status_code in _AUTH_FAILURE_STATUSES
+    return urlparse(exc.url).path.endswith(f"/{_LOGIN_ROUTE}")
+
 
 def _convert_exception[**P, T](
     f: Callable[
         Concatenate["JupyterAsyncClient", P], Coroutine[None, None, T]
     ],
 ) -> Callable[Concatenate["JupyterAsyncClient", P], Coroutine[None, None, T]]:
-    """Convert HTTPX exceptions to Nublado exceptions."""
+    """Convert HTTPX exceptions to Nublado exceptions.
+
+    If the request is rejected as unauthenticated or redirected to the login
+    page while using session state restored from the session cache, the state
+    may be stale, so discard it and retry the request once.
+    """
 
     @wraps(f)
     async def wrapper(
@@ -42,6 +92,13 @@ def _convert_exception[**P, T](
     ) -> T:
         start = datetime.now(tz=UTC)
         try:
+            try:
+                return await f(client, *args, **kwargs)
+            except _STALE_STATE_ERRORS as e:
+                if not _is_auth_failure(e):
+                    raise
+                if not await client._discard_cached_state():  # noqa: SLF001
+                    raise
             return await f(client, *args, **kwargs)
         except HTTPError as e:
             username = client._username  # noqa: SLF001
@@ -80,12 +137,20 @@ class JupyterAsyncClient:
         Repertoire discovery client, used to find the base URL of JupyterHub.
     logger
         Logger to use.
+    session_cache
+        If given, cache of session state shared with other clients. State for
+        this user is restored from the cache before the first request, and
+        the cache is updated once the user's lab has been found and when the
+        client is closed.
     timeout
         Timeout to use when talking to JupyterHub and JupyterLab. This is
         used as a connection, read, and write timeout for all regular HTTP
         calls.
     token
         Gafaelfawr token to use for authentication.
+    transport
+        If given, HTTPX transport to use for requests, such as one sharing a
+        connection pool with other clients.
     username
         Username on whose behalf the client will be acting.
     """
@@ -95,11 +160,14 @@ class JupyterAsyncClient:
         *,
         discovery_client: DiscoveryClient,
         logger: BoundLogger,
+        session_cache: NubladoSessionCache | None = None,
         timeout: timedelta,
         token: str,
+        transport: AsyncBaseTransport | None = None,
         username: str,
     ) -> None:
         self._discovery = discovery_client
+        self._session_cache = session_cache
         self._token = token
         self._logger = logger
         self._username = username
@@ -107,8 +175,11 @@ class JupyterAsyncClient:
         # Every instance of this client uses a separate HTTPX AsyncClient so
         # that it has a separate cookie jar, since the cookies set by
         # JupyterHub and JupyterLab are user-specific and would overwrite each
-        # other if the same client were reused.
-        self._client = AsyncClient(timeout=timeout.total_seconds())
+        # other if the same client were reused. The transport, which holds
+        # the connection pool, may be shared.
+        self._client = AsyncClient(
+            timeout=timeout.total_seconds(), transport=transport
+        )
 
         # Base URL of the user's lab, or None if not yet determined.
         self._lab_base_url: str | None = None
@@ -117,12 +188,21 @@ class JupyterAsyncClient:
         self._hub_xsrf: str | None = None
         self._lab_xsrf: str | None = None
 
+        # Whether state has been restored from the session cache, and
+        # whether the current state came from the cache rather than from
+        # talking to JupyterHub and JupyterLab.
+        self._restored = session_cache is None
+        self._from_cache = False
+
     async def aclose(self) -> None:
         """Close the underlying HTTP connection pool.
 
         This invalidates the client object. It can no longer be used after
-        this method is called.
+        this method is called. If a session cache is in use, the current
+        session state is saved to it first.
         """
+        if self._restored:
+            await self._save_state()
         await self._client.aclose()
 
     @_convert_exception
@@ -157,7 +237,7 @@ class JupyterAsyncClient:
         url = await self._url_for(route)
         headers = await self._headers_for(route, add_referer=add_referer)
         r = await self._client.delete(url, headers=headers)
-        r.raise_for_status()
+        self._raise_for_status(r)
         return r
 
     @_convert_exception
@@ -239,7 +319,12 @@ class JupyterAsyncClient:
 
     @_convert_exception
     async def open_websocket(
-        self, route: str, *, open_timeout: timedelta, max_size: int | None
+        self,
+        route: str,
+        *,
+        open_timeout: timedelta,
+        max_size: int | None,
+        params: dict[str, str] | None = None,
     ) -> AbstractAsyncContextManager[ClientConnection]:
         """Open a WebSocket connection.
 
@@ -248,8 +333,12 @@ class JupyterAsyncClient:
         route
             Route relative to the base URL of Nublado. Routes starting with
             ``user`` are considered JupyterLab routes.
+        open_timeout
+            Timeout for opening the WebSocket.
         max_size
             Maximum size of a WebSocket message, or `None` for no limit.
+        params
+            Query parameters to add to the WebSocket URL.
 
         Returns
         -------
@@ -269,10 +358,12 @@ class JupyterAsyncClient:
         """
         url = await self._url_for(route)
         headers = await self._headers_for(route)
-        request = self._client.build_request("GET", url, headers=headers)
+        request = self._client.build_request(
+            "GET", url, headers=headers, params=params
+        )
         headers["Cookie"] = request.headers["Cookie"]
         return websockets.connect(
-            self._url_for_websocket(url),
+            self._url_for_websocket(str(request.url)),
             subprotocols=[Subprotocol("v1.kernel.websocket.jupyter.org")],
             additional_headers=headers,
             open_timeout=open_timeout.total_seconds(),
@@ -355,7 +446,7 @@ class JupyterAsyncClient:
             next_url = urljoin(url, r.headers["Location"])
             await self._check_redirect(next_url)
             return await self._get(next_url, headers)
-        r.raise_for_status()
+        self._raise_for_status(r)
         return r
 
     async def _check_redirect(
@@ -373,9 +464,13 @@ class JupyterAsyncClient:
         Raises
         ------
         NubladoRedirectError
-            Raised if the URL is outside of Nublado's URL space.
+            Raised if the URL is outside of Nublado's URL space, or if it is
+            the JupyterHub login page and the session state came from the
+            session cache, in which case that state is stale.
         """
         hub_url = await self._hub_base_url()
+        if self._from_cache and url.startswith(f"{hub_url}/{_LOGIN_ROUTE}"):
+            raise NubladoRedirectError("Redirected to login", url)
         if url.startswith(hub_url):
             return
         lab_base_url = lab_base_url or self._lab_base_url
@@ -383,6 +478,30 @@ class JupyterAsyncClient:
             return
         raise NubladoRedirectError("Unexpected redirect", url)
 
+    async def _discard_cached_state(self) -> bool:
+        """Discard session state restored from the session cache.
+
+        Called after a request fails. If the current session state came from
+        the session cache, it may be stale, so delete it from the cache and
+        reset the client so that the state will be discovered again.
+
+        Returns
+        -------
+        bool
+            `True` if cached state was discarded and the request should be
+            retried, `False` otherwise.
+        """
+        if not self._session_cache or not self._from_cache:
+            return False
+        self._logger.info("Discarding cached session state after failure")
+        await self._session_cache.delete(self._username)
+        self._client.cookies.clear()
+        self._lab_base_url = None
+        self._hub_xsrf = None
+        self._lab_xsrf = None
+        self._from_cache = False
+        return True
+
     def _extract_xsrf(
         self, response: Response, lab_base_url: str | None = None
     ) -> None:
@@ -538,7 +657,7 @@ class JupyterAsyncClient:
                 raise NubladoRedirectError("Redirect loop", url)
             seen[url] += 1
             r = await self._client.get(url, headers=headers)
-        r.raise_for_status()
+        self._raise_for_status(r)
         self._extract_xsrf(r)
         return r
 
@@ -599,6 +718,65 @@ class JupyterAsyncClient:
             raise NubladoDiscoveryError(msg)
         return hub_url.rstrip("/")
 
+    def _raise_for_status(self, response: Response) -> None:
+        """Check the status of a JupyterHub or JupyterLab response.
+
+        A successful response shows that the current session state works, so
+        after the first one, any session state restored from the session
+        cache is no longer considered suspect.
+
+        Parameters
+        ----------
+        response
+            Response at the end of any redirect chain.
+
+        Raises
+        ------
+        httpx.HTTPStatusError
+            Raised if the response status indicates an error.
+        """
+        response.raise_for_status()
+        self._from_cache = False
+
+    async def _restore_state(self) -> None:
+        """Restore session state for this user from the session cache."""
+        self._restored = True
+        if not self._session_cache:
+            return
+        state = await self._session_cache.get(self._username)
+        if not state:
+            return
+        self._lab_base_url = state.lab_base_url
+        self._hub_xsrf = state.hub_xsrf
+        self._lab_xsrf = state.lab_xsrf
+        for cookie in state.cookies:
+            self._client.cookies.set(
+                cookie.name,
+                cookie.value,
+                domain=cookie.domain,
+                path=cookie.path,
+            )
+        self._from_cache = True
+        self._logger.debug("Restored cached session state")
+
+    async def _save_state(self) -> None:
+        """Save the session state for this user to the session cache."""
+        if not self._session_cache:
+            return
+        cookies = [
+            NubladoSessionCookie(
+                name=c.name, value=c.value or "", domain=c.domain, path=c.path
+            )
+            for c in self._client.cookies.jar
+        ]
+        state = NubladoSessionState(
+            lab_base_url=self._lab_base_url,
+            hub_xsrf=self._hub_xsrf,
+            lab_xsrf=self._lab_xsrf,
+            cookies=cookies,
+        )
+        await self._session_cache.store(self._username, state)
+
     async def _url_for(self, route: str) -> str:
         """Construct a JupyterHub or JupyterLab URL from a route.
 
@@ -634,9 +812,12 @@ class JupyterAsyncClient:
         rubin.repertoire.RepertoireError
             Raised if there was an error talking to service discovery.
         """
+        if not self._restored:
+            await self._restore_state()
         if route.startswith("user/"):
             if not self._lab_base_url:
                 self._lab_base_url = await self._find_lab_base_url()
+                await self._save_state()
             return f"{self._lab_base_url}/{route}"
 
         # Remaining cases are URLs at JupyterHub and should use service
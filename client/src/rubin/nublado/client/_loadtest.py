@@ -0,0 +1,211 @@
+"""Load testing of the Nublado client against the Jupyter mock."""
+
+import asyncio
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from statistics import quantiles
+
+from ._client import NubladoClient
+from ._models import NubladoImage, NubladoImageByClass
+
+__all__ = [
+    "MockJupyterLoadTest",
+    "MockJupyterLoadTestReport",
+    "MockJupyterOperationStats",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class MockJupyterOperationStats:
+    """Timing statistics for one client operation in a load test."""
+
+    operation: str
+    """Name of the operation, such as ``run_python``."""
+
+    count: int
+    """Number of times the operation succeeded."""
+
+    errors: int
+    """Number of times the operation failed."""
+
+    p50: timedelta
+    """Median duration of successful operations."""
+
+    p95: timedelta
+    """95th percentile duration of successful operations."""
+
+    p99: timedelta
+    """99th percentile duration of successful operations."""
+
+    throughput: float
+    """Successful operations per second over the whole load test."""
+
+
+@dataclass(frozen=True, slots=True)
+class MockJupyterLoadTestReport:
+    """Results of a load test."""
+
+    users: int
+    """Number of simulated users."""
+
+    elapsed: timedelta
+    """Wall clock duration of the load test."""
+
+    operations: dict[str, MockJupyterOperationStats]
+    """Statistics for each client operation, in the order first run."""
+
+    def to_text(self) -> str:
+        """Format the report as a table for display.
+
+        Returns
+        -------
+        str
+            Multi-line table with one row per operation, durations in
+            milliseconds, and throughput in operations per second.
+        """
+        seconds = self.elapsed.total_seconds()
+        header = (
+            f"{'operation':<16} {'count':>6} {'errors':>6} {'p50':>8}"
+            f" {'p95':>8} {'p99':>8} {'ops/s':>9}"
+        )
+        lines = [f"{self.users} users in {seconds:.3f}s", header]
+        for stats in self.operations.values():
+            p50, p95, p99 = (
+                d.total_seconds() * 1000
+                for d in (stats.p50, stats.p95, stats.p99)
+            )
+            lines.append(
+                f"{stats.operation:<16} {stats.count:>6} {stats.errors:>6}"
+                f" {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}"
+                f" {stats.throughput:>9.1f}"
+            )
+        return "\n".join(lines)
+
+
+class MockJupyterLoadTest:
+    """Run many simulated users concurrently through the Nublado client.
+
+    Each simulated user authenticates to JupyterHub, spawns a lab, waits for
+    the spawn, authenticates to the lab, opens a session, runs some code,
+    closes the session, and stops the lab, timing each of those client
+    operations. All users run concurrently.
+
+    This is intended to be run against `MockJupyter`, with the mock latency
+    configured with `MockJupyter.set_latency`, so that the load test runs
+    entirely in-process. The resulting timings measure the overhead of the
+    client and of the mock rather than of a real Nublado deployment, which
+    makes them useful for catching performance regressions in the client.
+
+    Parameters
+    ----------
+    clients
+        One client for each simulated user. These may be created with
+        `NubladoFleet` to share a connection pool.
+    code
+        Python code each user runs in its lab.
+    executions
+        Number of times each user runs the code in its session.
+    image
+        Image to spawn.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[NubladoClient],
+        *,
+        code: str = "print(2 + 2)",
+        executions: int = 1,
+        image: NubladoImage | None = None,
+    ) -> None:
+        self._clients = clients
+        self._code = code
+        self._executions = executions
+        self._image = image or NubladoImageByClass()
+        self._timings: defaultdict[str, list[float]] = defaultdict(list)
+        self._errors: defaultdict[str, int] = defaultdict(int)
+
+    async def run(self) -> MockJupyterLoadTestReport:
+        """Run the load test.
+
+        Failures of individual operations are counted rather than raised.
+        A simulated user stops at its first failure.
+
+        Returns
+        -------
+        MockJupyterLoadTestReport
+            Timing statistics for each operation.
+        """
+        self._timings.clear()
+        self._errors.clear()
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(self._run_user(c) for c in self._clients), return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+        operations = {
+            o: self._build_stats(o, elapsed)
+            for o in [*self._timings, *self._errors]
+        }
+        return MockJupyterLoadTestReport(
+            users=len(self._clients),
+            elapsed=timedelta(seconds=elapsed),
+            operations=operations,
+        )
+
+    def _build_stats(
+        self, operation: str, elapsed: float
+    ) -> MockJupyterOperationStats:
+        """Calculate the statistics for one operation."""
+        timings = self._timings.get(operation, [])
+        if len(timings) > 1:
+            percentiles = quantiles(timings, n=100, method="inclusive")
+            p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+        else:
+            p50 = p95 = p99 = timings[0] if timings else 0.0
+        return MockJupyterOperationStats(
+            operation=operation,
+            count=len(timings),
+            errors=self._errors.get(operation, 0),
+            p50=timedelta(seconds=p50),
+            p95=timedelta(seconds=p95),
+            p99=timedelta(seconds=p99),
+            throughput=len(timings) / elapsed if elapsed else 0.0,
+        )
+
+    async def _run_user(self, client: NubladoClient) -> None:
+        """Run one simulated user through the lab lifecycle."""
+        async with self._measure("auth_to_hub"):
+            await client.auth_to_hub()
+        async with self._measure("spawn_lab"):
+            await client.spawn_lab(self._image)
+        async with self._measure("wait_for_spawn"):
+            await client.wait_for_spawn()
+        async with self._measure("auth_to_lab"):
+            await client.auth_to_lab()
+        session_manager = client.lab_session()
+        async with self._measure("open_session"):
+            session = await session_manager.__aenter__()
+        try:
+            for _ in range(self._executions):
+                async with self._measure("run_python"):
+                    await session.run_python(self._code)
+        finally:
+            async with self._measure("close_session"):
+                await session_manager.__aexit__(None, None, None)
+        async with self._measure("stop_lab"):
+            await client.stop_lab()
+
+    @asynccontextmanager
+    async def _measure(self, operation: str) -> AsyncIterator[None]:
+        """Record the duration or failure of an operation."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self._errors[operation] += 1
+            raise
+        self._timings[operation].append(time.perf_counter() - start)
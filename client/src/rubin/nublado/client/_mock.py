@@ -4,7 +4,7 @@ import asyncio
 import json
 import os
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import (
     AsyncGenerator,
     AsyncIterator,
@@ -29,6 +29,7 @@ import websockets
 from httpx import URL, Request, Response
 from rubin.gafaelfawr import GafaelfawrClient
 from rubin.repertoire import DiscoveryClient
+from websockets.exceptions import ConnectionClosedError
 
 from ._models import NotebookExecutionResult
 from ._websocket import decode_websocket_message, encode_websocket_message
@@ -102,6 +103,36 @@ class MockJupyterState(Enum):
     LAB_RUNNING = "lab running"
 
 
+@dataclass
+class _MockJupyterKernel:
+    """State of the kernel behind a mock Jupyter lab session.
+
+    This is kept separately from the WebSocket connection so that it survives
+    the WebSocket being dropped and reopened, as a real kernel would.
+    """
+
+    requests: asyncio.Queue[tuple[dict[str, str], str]] = field(
+        default_factory=asyncio.Queue
+    )
+    """Execution requests not yet run, with their headers and code."""
+
+    outbox: deque[bytes] = field(default_factory=deque)
+    """Encoded replies not yet delivered over a WebSocket."""
+
+    variables: dict[str, Any] = field(default_factory=dict)
+    """Global and local variables, preserved across cell executions."""
+
+    client_session: str | None = None
+    """Session ID passed by the client when opening the WebSocket.
+
+    Like Jupyter Server, undelivered replies are only replayed to a new
+    WebSocket connection that passes the same session ID.
+    """
+
+    drop_after: int | None = None
+    """Drop the WebSocket after delivering this many more messages."""
+
+
 type _MockHandler = Callable[
     ["MockJupyter", Request, str], Coroutine[None, None, Response]
 ]
@@ -154,15 +185,19 @@ class MockJupyter:
         self._delete_at: dict[str, datetime | None] = {}
         self._delete_delay: timedelta | None = None
         self._fail: defaultdict[str, set[MockJupyterAction]] = defaultdict(set)
+        self._kernels: dict[str, _MockJupyterKernel] = {}
+        self._latency: Callable[[], timedelta] | None = None
         self._lab_form: dict[str, dict[str, str]] = {}
         self._execution_parameters: dict[
             str, MockJupyterExecutionParameters
         ] = {}
+        self._notebook_delays: dict[str, timedelta | None] = {}
         self._notebook_kernel: dict[str, str] = {}
         self._notebook_results: dict[str, NotebookExecutionResult] = {}
         self._redirect_loop = False
         self._sessions: dict[str, MockJupyterLabSession] = {}
         self._spawn_delay: timedelta | None = None
+        self._spawn_progress: list[dict[str, Any]] | None = None
         self._state: dict[str, MockJupyterState] = {}
 
     async def build_code_result(
@@ -217,6 +252,25 @@ class MockJupyter:
             exec(code, variables)  # noqa: S102
         return output.getvalue()
 
+    def drop_websocket(self, username: str, *, after: int = 0) -> None:
+        """Drop the WebSocket connection to the user's lab session.
+
+        The connection is closed abnormally, as if by a network failure,
+        after the given number of further messages have been sent to the
+        client. The kernel keeps running and any remaining replies are
+        buffered, so a client that reconnects with the same session ID will
+        receive them.
+
+        Parameters
+        ----------
+        username
+            User whose WebSocket connection should be dropped.
+        after
+            Number of further messages to send before dropping the
+            connection.
+        """
+        self._kernels[username].drop_after = after
+
     def fail_on(
         self,
         username: str,
@@ -396,7 +450,11 @@ class MockJupyter:
         respx_mock.post(url__regex=regex).mock(side_effect=handler)
 
     def register_notebook_result(
-        self, notebook: str, result: NotebookExecutionResult
+        self,
+        notebook: str,
+        result: NotebookExecutionResult,
+        *,
+        delay: timedelta | None = None,
     ) -> None:
         """Register the result of full notebook execution.
 
@@ -406,8 +464,12 @@ class MockJupyter:
             Full notebook contents as a JSON-formatted string.
         result
             Results to return when that notebook is executed via the mock.
+        delay
+            If set, delay for this long before returning the registered
+            result. This can be used to test timeout handling.
         """
         self._notebook_results[notebook] = result
+        self._notebook_delays[notebook] = delay
 
     def register_python_result(
         self,
@@ -455,6 +517,34 @@ class MockJupyter:
         """
         self._delete_delay = delay
 
+    def set_latency(self, latency: Callable[[], timedelta] | None) -> None:
+        """Set the simulated latency of requests to the mock.
+
+        If set, every HTTP request to JupyterHub or JupyterLab and every code
+        execution request sent over a WebSocket will be delayed by the
+        duration returned by calling ``latency``. This can be used to
+        simulate network and server latency, including a random distribution
+        of latencies, when load testing a client.
+
+        Parameters
+        ----------
+        latency
+            Function returning the latency of the next request, or `None` to
+            not add latency.
+
+        Examples
+        --------
+        To simulate latencies with a log-normal distribution with a median
+        of 20ms:
+
+        .. code-block:: python
+
+           mock.set_latency(
+               lambda: timedelta(seconds=random.lognormvariate(-3.9, 0.5))
+           )
+        """
+        self._latency = latency
+
     def set_redirect_loop(self, *, enabled: bool) -> None:
         """Set whether to return an infinite redirect loop.
 
@@ -482,6 +572,30 @@ class MockJupyter:
         """
         self._spawn_delay = delay
 
+    def set_spawn_progress(self, events: list[dict[str, Any]] | None) -> None:
+        """Set the spawn progress events returned while a lab spawns.
+
+        This can be used to test handling of unexpected or malformed spawn
+        progress events. Each event is serialized to JSON and sent as the
+        data of one server-sent event.
+
+        Parameters
+        ----------
+        events
+            Spawn progress events to return, or `None` to return the default
+            events for a successful spawn.
+        """
+        self._spawn_progress = events
+
+    async def simulate_latency(self) -> None:
+        """Wait for the latency configured with `set_latency`, if any.
+
+        Normally, this is only used by the handlers of the mock and the
+        JupyterLab WebSocket mock.
+        """
+        if self._latency:
+            await asyncio.sleep(self._latency().total_seconds())
+
     def _check_xsrf(
         self, request: Request, *, is_lab_route: bool = False
     ) -> None:
@@ -561,6 +675,21 @@ class MockJupyter:
         else:
             return None
 
+    def _open_kernel_channels(
+        self, username: str, client_session: str | None
+    ) -> _MockJupyterKernel:
+        """Get the kernel for a new WebSocket connection to a lab session.
+
+        Undelivered replies are discarded unless the client passed the same
+        session ID as the previous connection.
+        """
+        kernel = self._kernels[username]
+        if not client_session or client_session != kernel.client_session:
+            kernel.outbox.clear()
+        kernel.client_session = client_session
+        kernel.drop_after = None
+        return kernel
+
     def _url(self, route: str, host: str | None = None) -> str:
         """Construct a URL for a redirect.
 
@@ -625,6 +754,7 @@ class MockJupyter:
             async def wrapper(
                 mock: "MockJupyter", request: Request
             ) -> Response:
+                await mock.simulate_latency()
                 user = await mock._get_user_from_headers(request)
                 if user is None:
                     return Response(403, request=request)
@@ -727,12 +857,14 @@ class MockJupyter:
             if self._spawn_delay:
                 await asyncio.sleep(self._spawn_delay.total_seconds())
             self._state[user] = MockJupyterState.LAB_RUNNING
-            body = (
-                'data: {"progress": 0, "message": "Server requested"}\n\n'
-                'data: {"progress": 50, "message": "Spawning server..."}\n\n'
-                'data: {"progress": 100, "ready": true, "message": "Ready"}\n'
-                "\n"
-            )
+            events = self._spawn_progress
+            if events is None:
+                events = [
+                    {"progress": 0, "message": "Server requested"},
+                    {"progress": 50, "message": "Spawning server..."},
+                    {"progress": 100, "ready": True, "message": "Ready"},
+                ]
+            body = "".join(f"data: {json.dumps(e)}\n\n" for e in events)
         headers = {"Content-Type": "text/event-stream"}
         return Response(200, text=body, headers=headers, request=request)
 
@@ -845,6 +977,8 @@ class MockJupyter:
         except Exception:
             notebook = request.content.decode()
             resources = {}
+        if delay := self._notebook_delays.get(notebook):
+            await asyncio.sleep(delay.total_seconds())
         if result := self._notebook_results.get(notebook):
             result_json = result.model_dump()
         else:
@@ -875,6 +1009,7 @@ class MockJupyter:
             type=body["type"],
         )
         self._sessions[user] = session
+        self._kernels[user] = _MockJupyterKernel()
         response = {
             "id": session.session_id,
             "kernel": {"id": session.kernel_id},
@@ -895,6 +1030,7 @@ class MockJupyter:
         )
         self._check_xsrf(request, is_lab_route=True)
         del self._sessions[user]
+        del self._kernels[user]
         return Response(204, request=request)
 
 
@@ -910,30 +1046,31 @@ class MockJupyterWebSocket:
     """
 
     def __init__(
-        self, username: str, session_id: str, parent: MockJupyter
+        self,
+        username: str,
+        session_id: str,
+        parent: MockJupyter,
+        kernel: _MockJupyterKernel,
     ) -> None:
         self._username = username
         self._session_id = session_id
         self._parent = parent
+        self._closed = False
 
-        # Header of the message sent to JupyterLab, which should therefore be
-        # present in all responses.
-        self._header: dict[str, str] | None = None
-
-        # Code block currently being executed.
-        self._code: str | None = None
-
-        # Holds local and global variables across cell executions so that
-        # notebook state between cells can be simulated.
-        self._state: dict[str, Any] = {}
+        # Execution requests, replies, and variables are held by the kernel,
+        # which outlives this connection. Requests are executed in the order
+        # received, as a kernel would.
+        self._kernel = kernel
 
     async def close(self) -> None:
         """Simulate close of the WebSocket."""
 
     async def send(
-        self, message: str | bytes, *, text: bool | None = None
+        self, message: str | bytes | bytearray, *, text: bool | None = None
     ) -> None:
         """Simulate sending a message to the JupyterLab WebSocket."""
+        if self._closed:
+            raise ConnectionClosedError(None, None)
         message_json = decode_websocket_message(message)
         expected = {
             "header": {
@@ -958,31 +1095,42 @@ class MockJupyterWebSocket:
         assert message_json == expected, (
             f"Unexpected WebSocket message: {message_json} != {expected}"
         )
-        self._header = message_json["header"]
-        self._code = message_json["content"]["code"]
+        header = message_json["header"]
+        code = message_json["content"]["code"]
+        self._kernel.requests.put_nowait((header, code))
 
     async def __aiter__(self) -> AsyncIterator[bytes]:
         """Simulate receiving messages from the JupyterLab WebSocket."""
+        kernel = self._kernel
         while True:
-            async for response in self._build_response():
-                yield encode_websocket_message(response)
-
-    async def _build_response(self) -> AsyncIterator[dict[str, Any]]:
+            if not kernel.outbox:
+                header, code = await kernel.requests.get()
+                await self._parent.simulate_latency()
+                async for response in self._build_response(header, code):
+                    kernel.outbox.append(encode_websocket_message(response))
+            if kernel.drop_after == 0:
+                kernel.drop_after = None
+                self._closed = True
+                raise ConnectionClosedError(None, None)
+            if kernel.drop_after:
+                kernel.drop_after -= 1
+            yield kernel.outbox.popleft()
+
+    async def _build_response(
+        self, header: dict[str, str], code: str
+    ) -> AsyncIterator[dict[str, Any]]:
         """Construct a response to a code execution request."""
-        assert self._header, "Read from WebSocket before sending message"
-        assert self._code is not None, (
-            "Read from WebSocket before sending message"
-        )
         parent = self._parent
         try:
-            result = await parent.build_code_result(self._code, self._state)
-            self._code = None
+            result = await parent.build_code_result(
+                code, self._kernel.variables
+            )
         except asyncio.CancelledError:
             raise
         except BaseException as e:
             yield {
                 "header": {"msg_type": "execute_reply"},
-                "parent_header": self._header,
+                "parent_header": header,
                 "channel": "shell",
                 "content": {
                     "status": "error",
@@ -994,24 +1142,25 @@ class MockJupyterWebSocket:
         else:
             yield {
                 "header": {"msg_type": "execute_reply"},
-                "parent_header": self._header,
+                "parent_header": header,
                 "channel": "shell",
                 "content": {"status": "ok"},
             }
-            yield {
-                "header": {"msg_type": "stream"},
-                "channel": "iopub",
-                "parent_header": self._header,
-                "content": {"text": result},
-            }
+            # Send each line of output as a separate message, as a kernel
+            # would for code that prints several times.
+            for text in result.splitlines(keepends=True) or [result]:
+                yield {
+                    "header": {"msg_type": "stream"},
+                    "channel": "iopub",
+                    "parent_header": header,
+                    "content": {"text": text},
+                }
             yield {
                 "header": {"msg_type": "status"},
                 "channel": "iopub",
-                "parent_header": self._header,
+                "parent_header": header,
                 "content": {"execution_state": "idle"},
             }
-        self._header = None
-        return
 
 
 def _url_regex(base_regex: str, route: str) -> Pattern[str]:
@@ -1055,7 +1204,12 @@ def _mock_jupyter_websocket(
     assert kernel_id == session.kernel_id, (
         f"Kernel doesn't match session: {kernel_id} != {session.kernel_id}"
     )
-    return MockJupyterWebSocket(username, session.session_id, mock_jupyter)
+    query = parse_qs(urlparse(url).query)
+    client_session = query["session_id"][0] if "session_id" in query else None
+    kernel = mock_jupyter._open_kernel_channels(username, client_session)
+    return MockJupyterWebSocket(
+        username, session.session_id, mock_jupyter, kernel
+    )
 
 
 @asynccontextmanager
@@ -1,8 +1,8 @@
 """JupyterLab session management."""
 
 import asyncio
-from collections.abc import AsyncIterator
-from contextlib import AbstractAsyncContextManager
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, aclosing, suppress
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from types import TracebackType
@@ -11,7 +11,7 @@ from uuid import uuid4
 
 from structlog.stdlib import BoundLogger
 from websockets.asyncio.client import ClientConnection
-from websockets.exceptions import WebSocketException
+from websockets.exceptions import ConnectionClosedError, WebSocketException
 
 from ._asyncio import aclosing_iter
 from ._exceptions import (
@@ -23,7 +23,10 @@ from ._exceptions import (
 )
 from ._http import JupyterAsyncClient
 from ._models import CodeContext
-from ._websocket import decode_websocket_message, encode_websocket_message
+from ._websocket import ExecuteRequestEncoder, WebSocketMessage
+
+_RECONNECT_ERRORS = (OSError, WebSocketException)
+"""Exceptions that indicate an attempt to reopen a WebSocket failed."""
 
 __all__ = ["JupyterLabSession", "JupyterLabSessionManager"]
 
@@ -57,6 +60,18 @@ class JupyterLabSession:
     Objects of this type should be created via the `JupyterLabSessionManager`
     context manager.
 
+    A background task reads all messages from the WebSocket and routes each
+    reply to the execution request it answers, so several calls to
+    `run_python` or `run_python_stream` may be in flight at once. The kernel
+    runs the code in the order in which it was sent.
+
+    If the WebSocket connection is closed abnormally, such as by an ingress
+    reset, and a reconnect function is provided, the background task opens a
+    new WebSocket to the same kernel session. Jupyter Server buffers replies
+    sent while the client is disconnected and replays them when the client
+    reconnects with the same session ID, so requests that were in flight
+    receive their remaining output and are not sent again.
+
     Parameters
     ----------
     username
@@ -67,6 +82,12 @@ class JupyterLabSession:
         Open WebSocket connection.
     logger
         Logger to use.
+    reconnect
+        If given, function to call to open a new WebSocket connection to the
+        same kernel session when the connection is lost.
+    reconnect_attempts
+        Number of times to try to reopen the WebSocket connection each time
+        it is lost before giving up.
     """
 
     _IGNORED_MESSAGE_TYPES = (
@@ -94,11 +115,43 @@ class JupyterLabSession:
         session_id: str,
         socket: ClientConnection,
         logger: BoundLogger,
+        reconnect: Callable[[], Awaitable[ClientConnection]] | None = None,
+        reconnect_attempts: int = 3,
     ) -> None:
         self._username = username
-        self._session_id = session_id
         self._socket = socket
         self._logger = logger
+        self._reconnect = reconnect
+        self._reconnect_attempts = reconnect_attempts if reconnect else 0
+        self._encoder = ExecuteRequestEncoder(
+            username=username, session_id=session_id
+        )
+
+        # Set and replaced by the background reader whenever it replaces the
+        # WebSocket or gives up, so that a send that failed because the
+        # connection was lost can wait for a new connection.
+        self._socket_changed = asyncio.Event()
+
+        # Queues of replies for each in-flight execution request, keyed by
+        # message ID. None indicates the WebSocket was closed, and an
+        # exception indicates the WebSocket failed with that exception.
+        self._pending: dict[
+            str, asyncio.Queue[WebSocketMessage | BaseException | None]
+        ] = {}
+        self._reader: asyncio.Task[None] | None = None
+        self._error: BaseException | None = None
+
+    async def aclose(self) -> None:
+        """Stop reading messages from the WebSocket.
+
+        This is called automatically by `JupyterLabSessionManager` when the
+        session is closed. The session cannot be used afterwards.
+        """
+        if self._reader:
+            self._reader.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
 
     async def run_python(
         self,
@@ -135,7 +188,8 @@ class JupyterLabSession:
             not safe to continue to use the session and it should be closed.
         NubladoWebSocketError
             Raised if there was a WebSocket protocol error while running code
-            or waiting for the response.
+            or waiting for the response, or if the WebSocket connection was
+            lost and could not be reopened.
 
         Notes
         -----
@@ -153,38 +207,125 @@ class JupyterLabSession:
         channels are, but not about the low-level implementation details of
         how those channels are established over ZMQ, for instance.
         """
+        async with aclosing(self._execute(code, context, timeout)) as output:
+            chunks = [chunk async for chunk in output]
+        return "".join(chunks)
+
+    async def run_python_stream(
+        self,
+        code: str,
+        context: CodeContext | None = None,
+        *,
+        timeout: timedelta | None = None,
+        max_output_size: int | None = None,
+    ) -> AsyncGenerator[str]:
+        """Run a block of Python code, returning output as it arrives.
+
+        Behaves the same as `run_python` except that the output of the cell
+        is returned in chunks as the kernel sends it rather than all at once
+        after execution completes, so that long-running code that prints a
+        lot of output can be processed incrementally.
+
+        Parameters
+        ----------
+        code
+            Code to run.
+        context
+            Code context for error reporting.
+        timeout
+            Timeout to enforce on gathering the results of the execution,
+            including the time spent by the caller processing each chunk.
+        max_output_size
+            If set, stop returning output once this many bytes of output,
+            measured in UTF-8, have been returned. The final chunk is
+            truncated to fit. The remaining output is discarded, but
+            execution is still awaited so that errors are reported and the
+            session can be reused.
+
+        Yields
+        ------
+        str
+            Next chunk of output from the kernel.
+
+        Raises
+        ------
+        NubladoExecutionError
+            Raised if an error was reported by the Jupyter lab kernel.
+        NubladoExecutionTimeoutError
+            Raised if the code execution timed out. After this happens, it is
+            not safe to continue to use the session and it should be closed.
+        NubladoWebSocketError
+            Raised if there was a WebSocket protocol error while running code
+            or waiting for the response.
+        """
+        remaining = max_output_size
+        async with aclosing(self._execute(code, context, timeout)) as output:
+            async for chunk in output:
+                if remaining is None:
+                    yield chunk
+                elif remaining > 0:
+                    data = chunk.encode()[:remaining]
+                    remaining -= len(data)
+                    if text := data.decode(errors="ignore"):
+                        yield text
+
+    async def _execute(
+        self, code: str, context: CodeContext | None, timeout: timedelta | None
+    ) -> AsyncGenerator[str]:
+        """Run a block of Python code and return its output as it arrives.
+
+        Parameters
+        ----------
+        code
+            Code to run.
+        context
+            Code context for error reporting.
+        timeout
+            Timeout to enforce on gathering the results of the execution.
+
+        Yields
+        ------
+        str
+            Next non-empty chunk of output from the kernel.
+
+        Raises
+        ------
+        NubladoExecutionError
+            Raised if an error was reported by the Jupyter lab kernel.
+        NubladoExecutionTimeoutError
+            Raised if the code execution timed out.
+        NubladoWebSocketError
+            Raised if there was a WebSocket protocol error while running code
+            or waiting for the response.
+        """
         start = datetime.now(tz=UTC)
         message_id = uuid4().hex
-        request = {
-            "header": {
-                "username": self._username,
-                "version": "5.4",
-                "session": self._session_id,
-                "date": start.isoformat(),
-                "msg_id": message_id,
-                "msg_type": "execute_request",
-            },
-            "parent_header": {},
-            "channel": "shell",
-            "content": {
-                "code": code,
-                "silent": False,
-                "store_history": False,
-                "user_expressions": {},
-                "allow_stdin": False,
-            },
-            "metadata": {},
-        }
+        request = self._encoder.encode(
+            code, msg_id=message_id, date=start.isoformat()
+        )
 
-        # Send the message and consume messages waiting for the response.
+        # Send the message and consume messages waiting for the response. The
+        # timeout is enforced as a deadline on each read rather than around
+        # the whole loop, since the caller runs between chunks of output and
+        # must not be cancelled by a timeout intended for the kernel.
+        deadline = None
+        if timeout:
+            deadline = asyncio.get_running_loop().time()
+            deadline += timeout.total_seconds()
+        replies: asyncio.Queue[WebSocketMessage | BaseException | None]
+        replies = asyncio.Queue()
+        self._pending[message_id] = replies
+        if not self._reader:
+            self._reader = asyncio.create_task(self._read_messages())
+        elif self._reader.done():
+            replies.put_nowait(self._error)
         try:
-            await self._socket.send(encode_websocket_message(request))
-            async with aclosing_iter(aiter(self._socket)) as messages:
-                if timeout:
-                    async with asyncio.timeout(timeout.total_seconds()):
-                        result = await self._read_result(messages, message_id)
-                else:
-                    result = await self._read_result(messages, message_id)
+            await self._send(request)
+            async with aclosing(
+                self._read_output(replies, deadline)
+            ) as output:
+                async for chunk in output:
+                    yield chunk
         except NubladoExecutionError as e:
             e.code = code
             e.started_at = start
@@ -201,22 +342,16 @@ class JupyterLabSession:
             if context:
                 exc.context = context
             raise exc from e
+        finally:
+            del self._pending[message_id]
 
-        # Return the code output.
-        return result
-
-    def _parse_message(
-        self, message: str | bytes, message_id: str
-    ) -> _JupyterOutput | None:
-        """Parse a WebSocket message from a Jupyter lab kernel.
+    def _parse_message(self, data: WebSocketMessage) -> _JupyterOutput | None:
+        """Parse a reply from a Jupyter lab kernel.
 
         Parameters
         ----------
-        message
-            Raw message.
-        message_id
-            Message ID of the message we went, so that we can look for
-            replies.
+        data
+            Message whose parent is an execution request we sent.
 
         Returns
         -------
@@ -229,76 +364,200 @@ class JupyterLabSession:
             Raised if the WebSocket message wasn't in the expected format.
         NubladoExecutionError
             Raised if code execution fails.
-        TypeError
-            Raised if the WebSocket message was Text, which would mean the
-            protocol negotiation was not honored.
         ValueError
             Raised if the WebSocket message wasn't in the expected format.
         """
-        data = decode_websocket_message(message)
-        self._logger.debug("Received kernel message", message=data)
-
-        # Ignore headers not intended for us. The web socket is rather
-        # chatty with broadcast status messages.
-        if data.get("parent_header", {}).get("msg_id") != message_id:
-            return None
+        self._logger.debug("Received kernel message", message=data.to_dict())
 
         # Analyze the message type to figure out what to do with the response.
-        match data["header"]["msg_type"]:
+        match data.header["msg_type"]:
             case "execute_reply":
-                status = data["content"]["status"]
+                status = data.content["status"]
                 if status == "ok":
                     return _JupyterOutput(content="", done=True)
                 else:
-                    traceback = data["content"].get("traceback")
+                    traceback = data.content.get("traceback")
                     raise NubladoExecutionError(
                         self._username,
                         status=status,
                         error="".join(traceback) if traceback else None,
                     )
             case "status":
-                if data["content"]["execution_state"] == "idle":
+                if data.content["execution_state"] == "idle":
                     return _JupyterOutput(content="", idle=True)
                 else:
                     return None
             case "stream":
-                return _JupyterOutput(content=data["content"]["text"])
+                return _JupyterOutput(content=data.content["text"])
             case msg_type if msg_type in self._IGNORED_MESSAGE_TYPES:
                 return None
             case _:
                 msg = "Ignoring unrecognized WebSocket message"
-                self._logger.warning(msg, message_type=msg_type, message=data)
+                self._logger.warning(
+                    msg, message_type=msg_type, message=data.to_dict()
+                )
                 return None
 
-    async def _read_result(
-        self, messages: AsyncIterator[str | bytes], message_id: str
-    ) -> str:
-        """Wait for the result of code execution and return the output.
+    async def _read_messages(self) -> None:
+        """Read messages from the WebSocket and route them to requests.
+
+        Runs as a background task for the life of the session. Messages whose
+        parent is not one of our in-flight execution requests, such as the
+        many broadcast status messages, are discarded after decoding only
+        their parent header.
+        """
+        while True:
+            try:
+                async with aclosing_iter(aiter(self._socket)) as messages:
+                    async for message in messages:
+                        self._route_message(message)
+            except ConnectionClosedError as e:
+                try:
+                    if await self._reopen_socket(e):
+                        continue
+                except Exception as exc:
+                    self._error = exc
+                else:
+                    self._error = e
+            except Exception as e:
+                self._error = e
+            break
+
+        # The WebSocket closed or failed, so no more replies will arrive. Tell
+        # all of the requests still waiting for one, and wake any request
+        # waiting to resend.
+        for replies in self._pending.values():
+            replies.put_nowait(self._error)
+        self._socket_changed.set()
+
+    async def _reopen_socket(self, error: ConnectionClosedError) -> bool:
+        """Try to reopen the WebSocket after it was closed abnormally.
 
         Parameters
         ----------
-        messages
-            Asynchronous iterator over the WebSocket messages.
-        message_id
-            Message ID of the previously-sent ``execute_request`` message,
-            used to find relevant responses.
+        error
+            Exception that indicated the connection was lost.
 
         Returns
         -------
+        bool
+            `True` if the WebSocket was reopened, `False` if reconnection is
+            disabled or every attempt failed.
+        """
+        if not self._reconnect:
+            return False
+        self._logger.warning(
+            "Lost WebSocket connection to lab",
+            error=f"{type(error).__name__}: {error!s}",
+            pending=len(self._pending),
+        )
+        for attempt in range(self._reconnect_attempts):
+            if attempt > 0:
+                await asyncio.sleep(2 ** (attempt - 1))
+            try:
+                self._socket = await self._reconnect()
+            except _RECONNECT_ERRORS as e:
+                self._logger.warning(
+                    "Failed to reopen WebSocket connection to lab",
+                    attempt=attempt + 1,
+                    error=f"{type(e).__name__}: {e!s}",
+                )
+                continue
+            self._logger.info("Reopened WebSocket connection to lab")
+            self._socket_changed.set()
+            self._socket_changed = asyncio.Event()
+            return True
+        return False
+
+    def _route_message(self, message: str | bytes) -> None:
+        """Route a message from the WebSocket to the request it answers.
+
+        Parameters
+        ----------
+        message
+            Raw WebSocket message.
+        """
+        try:
+            data = WebSocketMessage(message)
+            replies = self._pending.get(data.parent_msg_id or "")
+        except Exception as e:
+            error = f"{type(e).__name__}: {e!s}"
+            msg = "Ignoring unparsable web socket message"
+            self._logger.warning(msg, error=error, message=message)
+            return
+        if replies:
+            replies.put_nowait(data)
+
+    async def _send(self, message: bytes | bytearray) -> None:
+        """Send a message, waiting for a new connection if necessary.
+
+        If the WebSocket connection was already lost when the message was
+        sent, the message cannot have reached the kernel, so it is safe to
+        send it again once the background reader has reopened the WebSocket.
+
+        Parameters
+        ----------
+        message
+            Encoded message to send.
+
+        Raises
+        ------
+        websockets.exceptions.WebSocketException
+            Raised if the message could not be sent and the WebSocket could
+            not be reopened.
+        """
+        while True:
+            socket = self._socket
+            changed = self._socket_changed
+            try:
+                await socket.send(message)
+            except ConnectionClosedError:
+                if not self._reconnect_attempts or not self._reader:
+                    raise
+                await changed.wait()
+                if self._reader.done():
+                    raise
+            else:
+                return
+
+    async def _read_output(
+        self,
+        replies: asyncio.Queue[WebSocketMessage | BaseException | None],
+        deadline: float | None,
+    ) -> AsyncGenerator[str]:
+        """Wait for the result of code execution and return the output.
+
+        Parameters
+        ----------
+        replies
+            Queue of replies to the previously-sent ``execute_request``
+            message.
+        deadline
+            Event loop time by which execution must complete, if any.
+
+        Yields
+        ------
         str
-            Accumulated cell output on success.
+            Next non-empty chunk of cell output.
 
         Raises
         ------
         NubladoExecutionError
             Raised if an error was reported by the Jupyter lab kernel.
+        TimeoutError
+            Raised if the deadline passed before execution completed.
         """
-        result = ""
         complete = False
         idle = False
-        async for message in messages:
+        while not (complete and idle):
+            async with asyncio.timeout_at(deadline):
+                message = await replies.get()
+            if message is None:
+                break
+            if isinstance(message, BaseException):
+                raise message
             try:
-                output = self._parse_message(message, message_id)
+                output = self._parse_message(message)
             except NubladoExecutionError:
                 raise
             except Exception as e:
@@ -307,18 +566,14 @@ class JupyterLabSession:
                 self._logger.warning(msg, error=error, message=message)
                 continue
 
-            # Accumulate the output, and repeat until we receive both
-            # an execution complete message and a kernel idle message.
+            # Return the output, and repeat until we receive both an
+            # execution complete message and a kernel idle message.
             if not output:
                 continue
-            result += output.content
+            if output.content:
+                yield output.content
             complete = complete or output.done
             idle = idle or output.idle
-            if complete and idle:
-                break
-
-        # Return the results.
-        return result
 
 
 class JupyterLabSessionManager:
@@ -345,6 +600,9 @@ class JupyterLabSessionManager:
         Maximum size of a WebSocket message to allow.
     websocket_open_timeout
         Timeout for opening a WebSocket.
+    websocket_reconnect_attempts
+        Number of times to try to reopen the WebSocket to the same kernel
+        session if it is closed abnormally. Set to 0 to disable reconnection.
     logger
         Logger to use.
     """
@@ -358,6 +616,7 @@ class JupyterLabSessionManager:
         notebook_name: str | None = None,
         max_websocket_size: int | None,
         websocket_open_timeout: timedelta = timedelta(seconds=60),
+        websocket_reconnect_attempts: int = 3,
         logger: BoundLogger,
     ) -> None:
         self._username = username
@@ -366,12 +625,15 @@ class JupyterLabSessionManager:
         self._notebook = notebook_name
         self._max_websocket_size = max_websocket_size
         self._websocket_open_timeout = websocket_open_timeout
+        self._websocket_reconnect_attempts = websocket_reconnect_attempts
         self._logger = logger
 
         self._session_id: str | None = None
+        self._route: str | None = None
         self._session: AbstractAsyncContextManager[ClientConnection] | None
         self._session = None
         self._socket: ClientConnection | None = None
+        self._lab_session: JupyterLabSession | None = None
 
     async def __aenter__(self) -> JupyterLabSession:
         """Create the session and open the WebSocket connection."""
@@ -406,21 +668,18 @@ class JupyterLabSessionManager:
         # and raised background exceptions. This approach allows more explicit
         # control of when the context manager is shut down and ensures it
         # happens immediately when the context exits.
-        route = f"user/{username}/api/kernels/{kernel}/channels"
+        self._route = f"user/{username}/api/kernels/{kernel}/channels"
         start = datetime.now(tz=UTC)
         self._logger.debug("Opening WebSocket connection")
         try:
-            self._session = await self._client.open_websocket(
-                route,
-                open_timeout=self._websocket_open_timeout,
-                max_size=self._max_websocket_size,
-            )
-            self._socket = await self._session.__aenter__()
-            return JupyterLabSession(
+            socket = await self._open_websocket()
+            self._lab_session = JupyterLabSession(
                 username=username,
                 session_id=self._session_id,
-                socket=self._socket,
+                socket=socket,
                 logger=self._logger,
+                reconnect=self._reopen_websocket,
+                reconnect_attempts=self._websocket_reconnect_attempts,
             )
         except WebSocketException as e:
             exc = NubladoWebSocketError.from_exception(e, username)
@@ -429,6 +688,7 @@ class JupyterLabSessionManager:
         except TimeoutError as e:
             msg = "Timed out attempting to open WebSocket to lab session"
             raise NubladoTimeoutError(msg, username, started_at=start) from e
+        return self._lab_session
 
     async def __aexit__(
         self,
@@ -447,6 +707,9 @@ class JupyterLabSessionManager:
         # almost certainly more interesting than the exception from closing
         # the lab session.
         try:
+            if self._lab_session:
+                await self._lab_session.aclose()
+            self._lab_session = None
             if self._session:
                 await self._session.__aexit__(exc_type, exc_val, exc_tb)
             self._session = None
@@ -466,3 +729,30 @@ class JupyterLabSessionManager:
                 raise exc from e
 
         return False
+
+    async def _open_websocket(self) -> ClientConnection:
+        """Open a WebSocket to the kernel of the session.
+
+        The session ID is passed as a query parameter so that, if the
+        WebSocket is later reopened, Jupyter Server replays any replies sent
+        while it was disconnected.
+        """
+        if not self._route or not self._session_id:
+            raise RuntimeError("Lab session not yet created")
+        self._session = await self._client.open_websocket(
+            self._route,
+            open_timeout=self._websocket_open_timeout,
+            max_size=self._max_websocket_size,
+            params={"session_id": self._session_id},
+        )
+        self._socket = await self._session.__aenter__()
+        return self._socket
+
+    async def _reopen_websocket(self) -> ClientConnection:
+        """Close the lost WebSocket and open a new one to the same kernel."""
+        if self._session:
+            with suppress(*_RECONNECT_ERRORS):
+                await self._session.__aexit__(None, None, None)
+            self._session = None
+            self._socket = None
+        return await self._open_websocket()
@@ -6,17 +6,259 @@ jupyter-server-documents extension only implements
 """
 
 import json
+import struct
 from typing import Any
 
-__all__ = ["decode_websocket_message", "encode_websocket_message"]
+_OFFSETS = struct.Struct("<7Q")
+"""Format of the offset table of a message with the standard five parts."""
 
+__all__ = [
+    "ExecuteRequestEncoder",
+    "WebSocketMessage",
+    "decode_websocket_message",
+    "encode_websocket_message",
+]
 
-def decode_websocket_message(message: str | bytes) -> dict[str, Any]:
-    """Decode a message in the JupyterLab WebSocket binary format.
+
+class ExecuteRequestEncoder:
+    """Encoder for code execution requests sent by one session.
+
+    Every ``execute_request`` message sent by a session is identical except
+    for the message ID, the date, and the code to run. This precompiles the
+    rest of the message into encoded fragments when it is created, so
+    encoding a request only requires serializing those three values,
+    calculating the offsets, and copying the parts into a single buffer.
+
+    The result is byte-for-byte identical to calling
+    `encode_websocket_message` on the equivalent message.
+
+    Parameters
+    ----------
+    username
+        User the session is for.
+    session_id
+        Session ID of the JupyterLab session.
+    """
+
+    def __init__(self, *, username: str, session_id: str) -> None:
+        username_json = json.dumps(username)
+        session_json = json.dumps(session_id)
+        self._channel = b"shell"
+        self._header_prefix = (
+            f'{{"username": {username_json}, "version": "5.4",'
+            f' "session": {session_json}, "date": '
+        ).encode()
+        self._header_middle = b', "msg_id": '
+        self._header_suffix = b', "msg_type": "execute_request"}'
+        self._empty = b"{}"
+        self._content_prefix = b'{"code": '
+        self._content_suffix = (
+            b', "silent": false, "store_history": false,'
+            b' "user_expressions": {}, "allow_stdin": false}'
+        )
+
+        # The header and the code are the only variable-length parts, so
+        # everything else about the layout can be computed once.
+        self._channel_offset = _OFFSETS.size
+        self._header_offset = self._channel_offset + len(self._channel)
+        self._static_header_size = (
+            len(self._header_prefix)
+            + len(self._header_middle)
+            + len(self._header_suffix)
+        )
+        self._static_content_size = len(self._content_prefix) + len(
+            self._content_suffix
+        )
+
+    def encode(self, code: str, *, msg_id: str, date: str) -> bytearray:
+        """Encode an execution request.
+
+        Parameters
+        ----------
+        code
+            Code to execute.
+        msg_id
+            Message ID of the request.
+        date
+            Date of the request in ISO 8601 format.
+
+        Returns
+        -------
+        bytearray
+            Message encoded in the binary protocol.
+        """
+        date_json = json.dumps(date).encode()
+        msg_id_json = json.dumps(msg_id).encode()
+        code_json = json.dumps(code).encode()
+
+        # Calculate the offsets of each part, and from that the total size.
+        header_size = self._static_header_size + len(date_json)
+        header_size += len(msg_id_json)
+        parent_offset = self._header_offset + header_size
+        metadata_offset = parent_offset + len(self._empty)
+        content_offset = metadata_offset + len(self._empty)
+        end = content_offset + self._static_content_size + len(code_json)
+
+        # Write the offset table and then copy in each fragment in turn.
+        message = bytearray(end)
+        _OFFSETS.pack_into(
+            message,
+            0,
+            6,
+            self._channel_offset,
+            self._header_offset,
+            parent_offset,
+            metadata_offset,
+            content_offset,
+            end,
+        )
+        position = self._channel_offset
+        for fragment in (
+            self._channel,
+            self._header_prefix,
+            date_json,
+            self._header_middle,
+            msg_id_json,
+            self._header_suffix,
+            self._empty,
+            self._empty,
+            self._content_prefix,
+            code_json,
+            self._content_suffix,
+        ):
+            size = len(fragment)
+            message[position : position + size] = fragment
+            position += size
+        return message
+
+
+class WebSocketMessage:
+    """Lazily-decoded message in the JupyterLab WebSocket binary format.
 
     Only supports ``v1.kernel.websocket.jupyter.org``, which is negotiated by
     the client as a subprotocol.
 
+    Most messages received on a kernel WebSocket are broadcasts that are not
+    replies to any request of ours, so only the offset table is parsed when
+    the object is created. Each part of the message is decoded the first time
+    it is accessed, from a `memoryview` of the original message so that no
+    copies are made of the parts that are never decoded.
+
+    Parameters
+    ----------
+    message
+        The message as either Text or Binary.
+
+    Raises
+    ------
+    TypeError
+        Raised if a Text WebSocket message was received.
+    ValueError
+        Raised if the offset table of the message is malformed.
+    """
+
+    __slots__ = (
+        "_content",
+        "_header",
+        "_metadata",
+        "_offsets",
+        "_parent_header",
+        "_view",
+    )
+
+    def __init__(self, message: str | bytes | bytearray) -> None:
+        if isinstance(message, str):
+            raise TypeError("Unexpected Text WebSocket message")
+        self._view = memoryview(message)
+
+        # The message starts with the count of offsets, followed by the
+        # offsets to the channel, header, parent header, metadata, and
+        # content in turn, all as 8-byte little-endian numbers.
+        try:
+            (count,) = struct.unpack_from("<Q", self._view)
+            self._offsets = struct.unpack_from(f"<{count}Q", self._view, 8)
+        except struct.error as e:
+            raise ValueError(f"Invalid WebSocket message: {e!s}") from e
+        if count < 6:
+            raise ValueError(f"Too few offsets in WebSocket message: {count}")
+
+        self._header: dict[str, Any] | None = None
+        self._parent_header: dict[str, Any] | None = None
+        self._metadata: dict[str, Any] | None = None
+        self._content: dict[str, Any] | None = None
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    @property
+    def channel(self) -> str:
+        """Channel on which the message was sent."""
+        return self._decode_part(0).decode()
+
+    @property
+    def content(self) -> dict[str, Any]:
+        """Content of the message."""
+        if self._content is None:
+            self._content = json.loads(self._decode_part(4))
+        return self._content
+
+    @property
+    def header(self) -> dict[str, Any]:
+        """Header of the message."""
+        if self._header is None:
+            self._header = json.loads(self._decode_part(1))
+        return self._header
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Metadata of the message."""
+        if self._metadata is None:
+            self._metadata = json.loads(self._decode_part(3))
+        return self._metadata
+
+    @property
+    def parent_header(self) -> dict[str, Any]:
+        """Header of the message to which this message is a reply."""
+        if self._parent_header is None:
+            self._parent_header = json.loads(self._decode_part(2))
+        return self._parent_header
+
+    @property
+    def parent_msg_id(self) -> str | None:
+        """Message ID of the message to which this message is a reply."""
+        return self.parent_header.get("msg_id")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Decode the full message.
+
+        Returns
+        -------
+        dict
+            The decoded message.
+        """
+        return {
+            "channel": self.channel,
+            "header": self.header,
+            "parent_header": self.parent_header,
+            "metadata": self.metadata,
+            "content": self.content,
+        }
+
+    def _decode_part(self, index: int) -> bytes:
+        """Extract one part of the message as bytes."""
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._view[start:end].tobytes()
+
+
+def decode_websocket_message(
+    message: str | bytes | bytearray,
+) -> dict[str, Any]:
+    """Decode a message in the JupyterLab WebSocket binary format.
+
+    Only supports ``v1.kernel.websocket.jupyter.org``, which is negotiated by
+    the client as a subprotocol. Use `WebSocketMessage` instead to decode
+    only the parts of the message that are needed.
+
     Parameters
     ----------
     message
@@ -37,35 +279,7 @@ def decode_websocket_message(message: str | bytes) -> dict[str, Any]:
     ValueError
         Raised if the message is malformed.
     """
-    if isinstance(message, str):
-        raise TypeError("Unexpected Text WebSocket message")
-
-    # Assume the message is in the v1.kernel.websocket.jupyter.org protocol
-    # and get the count of offsets.
-    offset_count = int.from_bytes(message[:8], byteorder="little")
-
-    # Decode all of the offsets. These will be to the channel, header, parent
-    # header, metadata, and content in turn.
-    offset = [
-        int.from_bytes(message[8 * (i + 1) : 8 * (i + 2)], byteorder="little")
-        for i in range(offset_count)
-    ]
-
-    # Decode the parts of the message:
-    channel = message[offset[0] : offset[1]].decode()
-    header = json.loads(message[offset[1] : offset[2]])
-    parent_header = json.loads(message[offset[2] : offset[3]])
-    metadata = json.loads(message[offset[3] : offset[4]])
-    content = json.loads(message[offset[4] : offset[5]])
-
-    # Return the parsed message:
-    return {
-        "channel": channel,
-        "header": header,
-        "parent_header": parent_header,
-        "metadata": metadata,
-        "content": content,
-    }
+    return WebSocketMessage(message).to_dict()
 
 
 def encode_websocket_message(message: dict[str, Any]) -> bytes:
@@ -0,0 +1,86 @@
+"""Tests for sharing session state between clients."""
+
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+import respx
+from structlog.stdlib import BoundLogger
+
+from rubin.nublado.client import (
+    MockJupyter,
+    NubladoClient,
+    NubladoImageByClass,
+    NubladoMemorySessionCache,
+    NubladoWebError,
+)
+
+
+@pytest.mark.asyncio
+async def test_session_cache(
+    *,
+    logger: BoundLogger,
+    mock_jupyter: MockJupyter,
+    respx_mock: respx.Router,
+    token: str,
+    username: str,
+) -> None:
+    cache = NubladoMemorySessionCache()
+    client = NubladoClient(username, token, logger=logger, session_cache=cache)
+    await client.auth_to_hub()
+    await client.spawn_lab(NubladoImageByClass())
+    await client.wait_for_spawn()
+    async with client.lab_session() as session:
+        assert await session.run_python("print(2)") == "2\n"
+    await client.aclose()
+    state = await cache.get(username)
+    assert state
+    assert state.lab_base_url
+    assert state.hub_xsrf
+    assert state.lab_xsrf
+    assert state.cookies
+
+    # A new client should be able to use the lab without discovering its
+    # base URL. Once a request has succeeded with the cached state, later
+    # failures should no longer be blamed on it.
+    client = NubladoClient(username, token, logger=logger, session_cache=cache)
+    http_client = client._client
+    find = http_client._find_lab_base_url
+    with patch.object(http_client, "_find_lab_base_url", wraps=find) as spy:
+        async with client.lab_session() as session:
+            assert await session.run_python("print(3)") == "3\n"
+        assert spy.call_count == 0
+    assert not await http_client._discard_cached_state()
+    await client.aclose()
+
+    # If the cached state is stale, it should be discarded and discovered
+    # again after the first authentication failure.
+    stale_url = "https://stale.example.org/nb"
+    respx_mock.route(host="stale.example.org").respond(403)
+    await cache.store(username, replace(state, lab_base_url=stale_url))
+    client = NubladoClient(username, token, logger=logger, session_cache=cache)
+    http_client = client._client
+    find = http_client._find_lab_base_url
+    with patch.object(http_client, "_find_lab_base_url", wraps=find) as spy:
+        async with client.lab_session() as session:
+            assert await session.run_python("print(4)") == "4\n"
+        assert spy.call_count == 1
+    state = await cache.get(username)
+    assert state
+    assert state.lab_base_url != stale_url
+    await client.aclose()
+
+    # Other failures are not evidence that the cached state is stale, so they
+    # should be raised without discarding the state or retrying the request.
+    broken_url = "https://broken.example.org/nb"
+    route = respx_mock.route(host="broken.example.org").respond(500)
+    await cache.store(username, replace(state, lab_base_url=broken_url))
+    client = NubladoClient(username, token, logger=logger, session_cache=cache)
+    with pytest.raises(NubladoWebError):
+        async with client.lab_session():
+            pass
+    assert route.call_count == 1
+    state = await cache.get(username)
+    assert state
+    assert state.lab_base_url == broken_url
+    await client.aclose()
@@ -1,5 +1,7 @@
 """Tests for the Nublado client."""
 
+import asyncio
+import json
 from contextlib import aclosing
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
@@ -28,7 +30,10 @@ from rubin.nublado.client import (
     NubladoImageSize,
     NubladoRedirectError,
     NubladoSpawnError,
+    NubladoTimeoutError,
     NubladoWebError,
+    NubladoWebSocketError,
+    SpawnProgressMessage,
 )
 
 
@@ -148,6 +153,61 @@ async def test_run_notebook(
     assert params.clear_local_site_packages
 
 
+@pytest.mark.asyncio
+async def test_run_notebooks(
+    client: NubladoClient, mock_jupyter: MockJupyter
+) -> None:
+    notebooks = {
+        n: json.dumps({"cells": [], "metadata": {"name": n}})
+        for n in ("fast", "slow", "hung", "cancelled")
+    }
+    delays = {"fast": 0.0, "slow": 0.1, "hung": 10.0, "cancelled": 10.0}
+    for name, delay in delays.items():
+        mock_jupyter.register_notebook_result(
+            notebooks[name],
+            NotebookExecutionResult(notebook=name),
+            delay=timedelta(seconds=delay),
+        )
+
+    await client.auth_to_hub()
+    await client.spawn_lab(NubladoImageByClass())
+    await client.wait_for_spawn()
+
+    # All four notebooks run concurrently, so results arrive in order of
+    # completion. The cancelled notebook is cancelled once the fast one
+    # finishes, and the hung one times out after the slow one finishes.
+    timeout = timedelta(seconds=1)
+    results = []
+    batch = client.run_notebooks(notebooks, concurrency=4, timeout=timeout)
+    async with batch:
+        async for result in batch:
+            results.append(result)
+            if result.name == "fast":
+                batch.cancel("cancelled")
+    assert [r.name for r in results] == ["fast", "cancelled", "slow", "hung"]
+    fast, cancelled, slow, hung = results
+    assert fast.result == NotebookExecutionResult(notebook="fast")
+    assert fast.error is None
+    assert not fast.cancelled
+    assert slow.result == NotebookExecutionResult(notebook="slow")
+    assert slow.elapsed >= timedelta(seconds=0.1)
+    assert cancelled.cancelled
+    assert cancelled.result is None
+    assert hung.result is None
+    assert isinstance(hung.error, NubladoTimeoutError)
+    assert hung.error.context.notebook == "hung"
+    assert hung.elapsed < timedelta(seconds=5)
+
+    # With a concurrency of one, the notebooks run in order.
+    del notebooks["hung"]
+    del notebooks["cancelled"]
+    notebooks = dict(reversed(notebooks.items()))
+    batch = client.run_notebooks(notebooks, concurrency=1)
+    async with batch:
+        names = [r.name async for r in batch]
+    assert names == ["slow", "fast"]
+
+
 @dataclass
 class FormTestCase:
     image: NubladoImage
@@ -373,6 +433,40 @@ async def test_spawn_failure(
     assert "Spawn failed!" in info.attachments["spawn_log.txt"]
 
 
+@pytest.mark.asyncio
+async def test_spawn_progress_validation(
+    client: NubladoClient, mock_jupyter: MockJupyter
+) -> None:
+    mock_jupyter.set_spawn_progress(
+        [
+            {"progress": "50", "message": "Spawning"},
+            {"progress": "half", "message": "Still spawning"},
+            {"progress": 100, "ready": True, "message": "Ready"},
+        ]
+    )
+    await client.auth_to_hub()
+
+    # Without validation, the fields are used as-is.
+    await client.spawn_lab(NubladoImageByClass())
+    progress = client.watch_spawn_progress()
+    async with aclosing(progress) as spawn_progress:
+        messages = [m async for m in spawn_progress]
+    assert [m.progress for m in messages] == ["50", "half", 100]
+    assert messages[-1].ready
+
+    # With validation, the fields are converted to the correct types and
+    # events that fail validation are skipped.
+    await client.stop_lab()
+    await client.spawn_lab(NubladoImageByClass())
+    progress = client.watch_spawn_progress(validate=True)
+    async with aclosing(progress) as spawn_progress:
+        messages = [m async for m in spawn_progress]
+    assert messages == [
+        SpawnProgressMessage(progress=50, message="Spawning", ready=False),
+        SpawnProgressMessage(progress=100, message="Ready", ready=True),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_redirect_loop(
     client: NubladoClient, username: str, mock_jupyter: MockJupyter
@@ -495,6 +589,89 @@ async def test_execution_failure(
     assert "ZeroDivisionError" in error.code
 
 
+@pytest.mark.asyncio
+async def test_run_python_stream(client: NubladoClient) -> None:
+    await client.auth_to_hub()
+    await client.spawn_lab(NubladoImageByClass())
+    await client.wait_for_spawn()
+
+    code = "for i in range(1000):\n    print('é' * 10)"
+    async with client.lab_session() as session:
+        expected = await session.run_python(code)
+        assert len(expected.splitlines()) == 1000
+
+        async with aclosing(session.run_python_stream(code)) as stream:
+            chunks = [c async for c in stream]
+        assert len(chunks) == 1000
+        assert "".join(chunks) == expected
+
+        # The output cap is in bytes, so truncation should not split the
+        # multi-byte character. The session must still be usable afterwards.
+        stream = session.run_python_stream(code, max_output_size=30)
+        async with aclosing(stream):
+            chunks = [c async for c in stream]
+        assert chunks == ["é" * 10 + "\n", "é" * 4]
+        assert await session.run_python("print(1)") == "1\n"
+
+
+@pytest.mark.asyncio
+async def test_pipelined_execution(
+    client: NubladoClient, mock_jupyter: MockJupyter
+) -> None:
+    await client.auth_to_hub()
+    await client.spawn_lab(NubladoImageByClass())
+    await client.wait_for_spawn()
+
+    # Register a slow first cell to ensure the later requests are sent while
+    # it is still running and their replies are routed correctly.
+    delay = timedelta(milliseconds=100)
+    mock_jupyter.register_python_result("slow", "slow\n", delay=delay)
+    mock_jupyter.register_python_result("fail", ValueError("some error"))
+    async with client.lab_session() as session:
+        results = await asyncio.gather(
+            session.run_python("slow"),
+            session.run_python("x = 6"),
+            session.run_python("fail"),
+            session.run_python("print(x * 7)"),
+            return_exceptions=True,
+        )
+        assert results[0] == "slow\n"
+        assert results[1] == ""
+        assert isinstance(results[2], NubladoExecutionError)
+        assert results[2].code == "fail"
+        assert results[3] == "42\n"
+
+
+@pytest.mark.asyncio
+async def test_websocket_reconnect(
+    client: NubladoClient, username: str, mock_jupyter: MockJupyter
+) -> None:
+    await client.auth_to_hub()
+    await client.spawn_lab(NubladoImageByClass())
+    await client.wait_for_spawn()
+
+    # Drop the connection after the execute reply and the first line of
+    # output. The rest of the output should be replayed on the new
+    # connection, and the kernel state should be preserved.
+    code = "for i in range(3):\n    print(i)"
+    async with client.lab_session() as session:
+        assert await session.run_python("x = 6") == ""
+        mock_jupyter.drop_websocket(username, after=2)
+        assert await session.run_python(code) == "0\n1\n2\n"
+        assert await session.run_python("print(x * 7)") == "42\n"
+
+        # Drop the connection again, this time while waiting for the
+        # execution to start.
+        mock_jupyter.drop_websocket(username)
+        assert await session.run_python(code) == "0\n1\n2\n"
+
+    # With reconnection disabled, losing the connection is an error.
+    async with client.lab_session(websocket_reconnect_attempts=0) as session:
+        mock_jupyter.drop_websocket(username, after=2)
+        with pytest.raises(NubladoWebSocketError):
+            await session.run_python(code)
+
+
 @pytest.mark.asyncio
 async def test_cell_timeout(
     *,
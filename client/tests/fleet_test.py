@@ -0,0 +1,66 @@
+"""Tests for clients sharing resources across many users."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from rubin.gafaelfawr import GafaelfawrUserInfo, MockGafaelfawr
+from structlog.stdlib import BoundLogger
+
+from rubin.nublado.client import (
+    MockJupyter,
+    MockJupyterState,
+    NubladoClient,
+    NubladoFleet,
+    NubladoImageByClass,
+)
+
+
+async def run_user(client: NubladoClient, code: str) -> str:
+    await client.auth_to_hub()
+    await client.spawn_lab(NubladoImageByClass())
+    await client.wait_for_spawn()
+    await client.auth_to_lab()
+    async with client.lab_session() as session:
+        result = await session.run_python(code)
+    await client.stop_lab()
+    return result
+
+
+@pytest.mark.asyncio
+async def test_fleet(
+    *,
+    logger: BoundLogger,
+    mock_gafaelfawr: MockGafaelfawr,
+    mock_jupyter: MockJupyter,
+) -> None:
+    usernames = [f"user{i}" for i in range(10)]
+    for username in usernames:
+        userinfo = GafaelfawrUserInfo(username=username)
+        mock_gafaelfawr.set_user_info(username, userinfo)
+    fleet = NubladoFleet(logger=logger)
+    clients = [
+        fleet.client(u, mock_gafaelfawr.create_token(u)) for u in usernames
+    ]
+
+    # Run all the users in parallel. Service discovery should be queried
+    # only once for the whole fleet.
+    http_client = fleet._http_client
+    with patch.object(http_client, "get", wraps=http_client.get) as spy:
+        results = await asyncio.gather(
+            *(run_user(c, f"print('{c._username}')") for c in clients)
+        )
+    assert spy.call_count == 1
+    assert results == [f"{u}\n" for u in usernames]
+    for username in usernames:
+        state = mock_jupyter.get_state(username)
+        assert state == MockJupyterState.LOGGED_IN
+
+    # Each client must have its own cookie jar.
+    cookies = {id(c._client._client.cookies) for c in clients}
+    assert len(cookies) == len(clients)
+
+    # Closing a client should not affect the other clients.
+    await clients[0].aclose()
+    assert await run_user(clients[1], "print(1)") == "1\n"
+    await fleet.aclose()
@@ -0,0 +1,92 @@
+"""Tests for load testing the client against the Jupyter mock."""
+
+import random
+from collections.abc import Callable
+from datetime import timedelta
+
+import pytest
+from rubin.gafaelfawr import GafaelfawrUserInfo, MockGafaelfawr
+from structlog.stdlib import BoundLogger
+
+from rubin.nublado.client import (
+    MockJupyter,
+    MockJupyterAction,
+    MockJupyterLoadTest,
+    MockJupyterLoadTestReport,
+    NubladoFleet,
+)
+
+
+async def run_load_test(
+    logger: BoundLogger,
+    mock_gafaelfawr: MockGafaelfawr,
+    mock_jupyter: MockJupyter,
+) -> MockJupyterLoadTestReport:
+    """Run a load test of 20 users, one of whom fails to spawn."""
+    rng = random.Random(42)  # noqa: S311
+    mock_jupyter.set_latency(
+        lambda: timedelta(seconds=rng.lognormvariate(-7, 0.5))
+    )
+    usernames = [f"user{i}" for i in range(20)]
+    for username in usernames:
+        userinfo = GafaelfawrUserInfo(username=username)
+        mock_gafaelfawr.set_user_info(username, userinfo)
+    mock_jupyter.fail_on("user0", MockJupyterAction.SPAWN)
+    fleet = NubladoFleet(logger=logger)
+    clients = [
+        fleet.client(u, mock_gafaelfawr.create_token(u)) for u in usernames
+    ]
+    load_test = MockJupyterLoadTest(clients, executions=3)
+    report = await load_test.run()
+    await fleet.aclose()
+    return report
+
+
+@pytest.mark.asyncio
+async def test_load_test(
+    *,
+    logger: BoundLogger,
+    mock_gafaelfawr: MockGafaelfawr,
+    mock_jupyter: MockJupyter,
+) -> None:
+    report = await run_load_test(logger, mock_gafaelfawr, mock_jupyter)
+
+    assert report.users == 20
+    assert list(report.operations) == [
+        "auth_to_hub",
+        "spawn_lab",
+        "wait_for_spawn",
+        "auth_to_lab",
+        "open_session",
+        "run_python",
+        "close_session",
+        "stop_lab",
+    ]
+    assert report.operations["auth_to_hub"].count == 20
+    assert report.operations["spawn_lab"].count == 19
+    assert report.operations["spawn_lab"].errors == 1
+    run_python = report.operations["run_python"]
+    assert run_python.count == 19 * 3
+    assert run_python.errors == 0
+    assert run_python.p50 <= run_python.p95 <= run_python.p99
+    assert run_python.throughput > 0
+    assert "run_python" in report.to_text()
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_load_test_benchmark(
+    *,
+    logger: BoundLogger,
+    mock_gafaelfawr: MockGafaelfawr,
+    mock_jupyter: MockJupyter,
+    record_property: Callable[[str, object], None],
+) -> None:
+    report = await run_load_test(logger, mock_gafaelfawr, mock_jupyter)
+
+    # Record the timings in the test report so that regressions in the
+    # client can be tracked.
+    for stats in report.operations.values():
+        name = stats.operation
+        record_property(f"{name}_p95_ms", stats.p95.total_seconds() * 1000)
+        record_property(f"{name}_per_second", stats.throughput)
@@ -0,0 +1,113 @@
+"""Tests for the JupyterLab WebSocket protocol."""
+
+import json
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from rubin.nublado.client._websocket import (
+    ExecuteRequestEncoder,
+    WebSocketMessage,
+    decode_websocket_message,
+    encode_websocket_message,
+)
+
+
+def test_lazy_decode() -> None:
+    message = {
+        "channel": "iopub",
+        "header": {"msg_id": "reply", "msg_type": "stream"},
+        "parent_header": {"msg_id": "request"},
+        "metadata": {},
+        "content": {"name": "stdout", "text": "hello\n"},
+    }
+    encoded = encode_websocket_message(message)
+    assert decode_websocket_message(encoded) == message
+
+    # Only the offset table should be parsed until a part is requested, so a
+    # message with a corrupt body can still be filtered by its parent.
+    corrupt = bytearray(encoded)
+    corrupt[-1] = ord("{")
+    data = WebSocketMessage(bytes(corrupt))
+    assert data.parent_msg_id == "request"
+    assert data.header["msg_type"] == "stream"
+    assert data.channel == "iopub"
+    with pytest.raises(json.JSONDecodeError):
+        _ = data.content
+
+    with pytest.raises(TypeError):
+        WebSocketMessage("{}")
+    with pytest.raises(ValueError, match="Invalid"):
+        WebSocketMessage(encoded[:4])
+
+
+def _build_execute_request(
+    username: str, session_id: str, code: str, msg_id: str, date: str
+) -> dict[str, Any]:
+    return {
+        "header": {
+            "username": username,
+            "version": "5.4",
+            "session": session_id,
+            "date": date,
+            "msg_id": msg_id,
+            "msg_type": "execute_request",
+        },
+        "parent_header": {},
+        "channel": "shell",
+        "content": {
+            "code": code,
+            "silent": False,
+            "store_history": False,
+            "user_expressions": {},
+            "allow_stdin": False,
+        },
+        "metadata": {},
+    }
+
+
+def test_execute_request_encoder() -> None:
+    encoder = ExecuteRequestEncoder(username="rachel", session_id="session")
+    for code in ("print(2 + 2)", 'print("\u00e9t\u00e9")\n', ""):
+        msg_id = uuid4().hex
+        date = datetime.now(tz=UTC).isoformat()
+        request = _build_execute_request(
+            "rachel", "session", code, msg_id, date
+        )
+        expected = encode_websocket_message(request)
+        encoded = encoder.encode(code, msg_id=msg_id, date=date)
+        assert encoded == expected
+        assert decode_websocket_message(bytes(encoded)) == request
+
+
+@pytest.mark.benchmark
+def test_execute_request_encoder_benchmark(
+    record_property: Callable[[str, object], None],
+) -> None:
+    # Record the rate at which each encoder can construct execution requests
+    # in the test report, including building the message for the generic
+    # encoder.
+    encoder = ExecuteRequestEncoder(username="rachel", session_id="session")
+    code = "import numpy as np\nprint(np.arange(10).sum())"
+    count = 10000
+    start = time.perf_counter()
+    for _ in range(count):
+        msg_id = uuid4().hex
+        date = datetime.now(tz=UTC).isoformat()
+        request = _build_execute_request(
+            "rachel", "session", code, msg_id, date
+        )
+        encode_websocket_message(request)
+    elapsed = time.perf_counter() - start
+    record_property("generic_messages_per_second", count / elapsed)
+    start = time.perf_counter()
+    for _ in range(count):
+        msg_id = uuid4().hex
+        date = datetime.now(tz=UTC).isoformat()
+        encoder.encode(code, msg_id=msg_id, date=date)
+    elapsed = time.perf_counter() - start
+    record_property("template_messages_per_second", count / elapsed)
@@ -9,6 +9,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import click
+from pydantic import TypeAdapter
 from safir.asyncio import run_with_asyncio
 from safir.click import display_help
 from safir.datetime import parse_timedelta
@@ -26,6 +27,7 @@ from .models.images import RSPImageTagCollection
 from .purger.config import Config as PurgerConfig
 from .purger.constants import CONFIG_FILE as PURGER_CONFIG_FILE
 from .purger.constants import CONFIG_FILE_ENV_VAR as PURGER_CONFIG_FILE_ENV_VAR
+from .purger.models.plan import OwnerWarning, UsageRecord
 from .purger.purger import Purger
 from .startup.services.preparer import Preparer
 
@@ -250,12 +252,7 @@ async def images_prune(
 
 
 def _make_purger(
-    *,
-    config_file: Path,
-    policy_file: Path | None,
-    dry_run: bool,
-    debug: bool,
-    future_duration: timedelta | None = None,
+    *, config_file: Path, policy_file: Path | None, dry_run: bool, debug: bool
 ) -> Purger:
     """Construct a Purger, overriding config from CLI options."""
     # Prefer config file from env var
@@ -276,13 +273,20 @@ def _make_purger(
     if dry_run:
         config.dry_run = dry_run
 
-    # Add the time-into-the-future (used for warning only)
-    if future_duration:
-        config.future_duration = future_duration
-
     return Purger(config=config)
 
 
+def _write_purger_json[T](
+    adapter: TypeAdapter[T], data: T, output: Path | None
+) -> None:
+    """Write purger output as JSON to a file or, if none given, stdout."""
+    result = adapter.dump_json(data, by_alias=True, indent=2).decode()
+    if output:
+        output.write_text(result + "\n")
+    else:
+        sys.stdout.write(result + "\n")
+
+
 @main.group()
 @_purger_common
 async def purger(
@@ -327,7 +331,17 @@ async def execute(
     "--future-duration",
     "-t",
     type=parse_timedelta,
-    help="Duration from now to future time to build a plan for",
+    multiple=True,
+    help=(
+        "Duration from now to future time to build a plan for (may be given"
+        " multiple times)"
+    ),
+)
+@click.option(
+    "--output",
+    "-o",
+    type=Path,
+    help="File to which to write per-user warnings (default: stdout)",
     default=None,
 )
 @_purger_common
@@ -339,20 +353,60 @@ async def warn(
     policy_file: Path | None,
     dry_run: bool,
     debug: bool,
-    future_duration: timedelta,
+    future_duration: tuple[timedelta, ...],
+    output: Path | None,
 ) -> None:
-    """Make a plan for some time in the future, and report as if it were
-    that time.
+    """Make a plan for some times in the future, and report as if it were
+    those times.
+
+    Each file is reported under the earliest future time at which it would
+    be purged. A JSON summary of the files to be purged, grouped by owning
+    UID, is written for use by user notification jobs.
     """
     purger = _make_purger(
         config_file=config_file,
         policy_file=policy_file,
         dry_run=dry_run,
         debug=debug,
-        future_duration=future_duration,
     )
-    await purger.plan()
+    await purger.plan(horizons=list(future_duration) or None)
     await purger.report()
+    warnings = await purger.warn()
+    _write_purger_json(TypeAdapter(list[OwnerWarning]), warnings, output)
+
+
+@purger.command()
+@click.option(
+    "--output",
+    "-o",
+    type=Path,
+    help="File to which to write usage (default: stdout)",
+    default=None,
+)
+@_purger_common
+async def usage(
+    *,
+    config_file: Path,
+    policy_file: Path | None,
+    dry_run: bool,
+    debug: bool,
+    output: Path | None,
+) -> None:
+    """Report disk usage and purge candidates by user.
+
+    Usage is gathered during the same filesystem scan used to make the purge
+    plan and is written as JSON, broken down by owning UID, file class, and
+    directory policy.
+    """
+    purger = _make_purger(
+        config_file=config_file,
+        policy_file=policy_file,
+        dry_run=dry_run,
+        debug=debug,
+    )
+    await purger.plan()
+    records = await purger.usage()
+    _write_purger_json(TypeAdapter(list[UsageRecord]), records, output)
 
 
 @main.command()
@@ -10,6 +10,7 @@ from safir.slack.webhook import SlackWebhookClient
 from structlog.stdlib import BoundLogger
 
 from .config import Config
+from .constants import LAB_JOURNAL_INTERVAL, SECRET_REFRESH_INTERVAL
 from .services.fileserver import FileserverManager
 from .services.image import ImageService
 from .services.lab import LabManager
@@ -28,7 +29,11 @@ class BackgroundTaskManager:
     #. Prepull images to all eligible nodes.
     #. Reconcile Kubernetes lab state with internal data structures.
     #. Reap tasks that were monitoring lab spawning or deletion.
+    #. Refresh the cached secrets used to build user lab secrets.
+    #. Write lab operation history to the optional journal.
     #. Watch file servers for changes in pod status (startup or timeout).
+    #. Maintain in-memory caches of file server Kubernetes objects.
+    #. Keep the optional warm pool of file server shells full.
     #. Reconcile Kubernetes file server state with internal data structures.
 
     This class manages all of these background tasks including, where
@@ -96,6 +101,7 @@ class BackgroundTaskManager:
             self._logger.info("Populating internal state")
             tg.create_task(self._image_service.refresh())
             tg.create_task(self._lab_manager.reconcile())
+            tg.create_task(self._lab_manager.refresh_secrets())
             if self._fileserver_manager:
                 tg.create_task(self._fileserver_manager.reconcile())
 
@@ -113,7 +119,20 @@ class BackgroundTaskManager:
                 "reconciling lab state",
             ),
             self._lab_manager.reap_spawners(),
+            self._loop(
+                self._lab_manager.refresh_secrets,
+                SECRET_REFRESH_INTERVAL,
+                "refreshing lab secrets",
+            ),
         ]
+        if self._config.lab.journal_path:
+            coros.append(
+                self._loop(
+                    self._lab_manager.flush_journal,
+                    LAB_JOURNAL_INTERVAL,
+                    "writing lab journal",
+                )
+            )
         if self._fileserver_manager and self._config.fileserver.enabled:
             coros.append(
                 self._loop(
@@ -123,6 +142,9 @@ class BackgroundTaskManager:
                 )
             )
             coros.append(self._fileserver_manager.watch_servers())
+            coros.append(self._fileserver_manager.watch_state())
+            if self._config.fileserver.warm_pool_size:
+                coros.append(self._fileserver_manager.maintain_pool())
         self._logger.info("Starting background tasks")
         for coro in coros:
             await self._scheduler.spawn(coro)
@@ -139,6 +161,14 @@ class BackgroundTaskManager:
         self._logger.info("Stopping background tasks")
         await self._scheduler.close()
         self._scheduler = None
+
+        # Record the history of any in-progress operations before cancelling
+        # them, so that it can be restored by the next controller.
+        try:
+            await self._lab_manager.flush_journal()
+        except Exception as e:
+            self._logger.exception("Uncaught exception writing lab journal")
+            await report_exception(e, self._slack)
         await self._lab_manager.stop_monitor_tasks()
 
     async def _loop(
@@ -518,6 +518,20 @@ class EnabledFileserverConfig(FileserverConfig):
         ),
     ] = []
 
+    warm_pool_size: Annotated[
+        int,
+        Field(
+            title="Warm pool size",
+            description=(
+                "Number of unassigned file server ingress and service shells"
+                " to keep ready. A new file server is bound to one of these"
+                " if available, which avoids waiting for its ingress to get"
+                " an IP address. Set to 0 to disable the warm pool."
+            ),
+            ge=0,
+        ),
+    ] = 0
+
 
 class FSAdminConfig(BaseModel):
     """Configuration for filesystem administration environment."""
@@ -1048,6 +1062,19 @@ class LabConfig(BaseModel):
         ),
     ] = ["/opt/lsst/software/jupyterlab/runlab.sh"]
 
+    journal_path: Annotated[
+        Path | None,
+        Field(
+            title="Path to lab operation journal",
+            description=(
+                "If set, record the most recent operation and its events for"
+                " each lab in a SQLite database at this path, so that event"
+                " history for in-progress spawns survives a controller"
+                " restart. This should be on a persistent volume."
+            ),
+        ),
+    ] = None
+
     namespace_annotations: Annotated[
         dict[str, str],
         Field(
@@ -1106,6 +1133,19 @@ class LabConfig(BaseModel):
         ),
     ] = None
 
+    readiness_probe: Annotated[
+        bool,
+        Field(
+            title="Probe labs for readiness",
+            description=(
+                "If set, after the lab pod starts, wait for the Jupyter server"
+                " in the lab to respond to HTTP requests before reporting that"
+                " the lab has started. This time counts against the spawn"
+                " timeout."
+            ),
+        ),
+    ] = False
+
     reconcile_interval: Annotated[
         HumanTimedelta,
         Field(
@@ -1151,16 +1191,34 @@ class LabConfig(BaseModel):
         ),
     ] = []
 
+    spawn_concurrency: Annotated[
+        int | None,
+        Field(
+            title="Maximum concurrent lab spawns",
+            description=(
+                "If set, at most this many labs will be spawned at the same"
+                " time. Additional spawn requests wait in a queue and are"
+                " started in the order in which they were received. The limit"
+                " is reduced automatically if the Kubernetes API server is"
+                " slow to respond."
+            ),
+            ge=1,
+        ),
+    ] = None
+
     spawn_timeout: Annotated[
         HumanTimedelta,
         Field(
             title="Timeout for lab spawning",
             description=(
                 "Creation of the lab will fail if it takes longer than this"
-                " for the lab pod to be created and start running. This does"
-                " not include the time spent by JupyterHub waiting for the lab"
-                " to start listening to the network. It should generally be"
-                " shorter than the spawn timeout set in JupyterHub."
+                " for the lab pod to be created and start running. Unless"
+                " readiness probing is enabled, this does not include the time"
+                " spent by JupyterHub waiting for the lab to start listening"
+                " to the network. Time spent waiting in the queue for other"
+                " spawns when spawnConcurrency is set is not included. It"
+                " should generally be shorter than the spawn timeout set in"
+                " JupyterHub."
             ),
             examples=[300],
         ),
@@ -1179,6 +1237,22 @@ class LabConfig(BaseModel):
         ),
     ] = False
 
+    suspend_timeout: Annotated[
+        HumanTimedelta | None,
+        Field(
+            title="Lifetime of suspended labs",
+            description=(
+                "If set, stopping a lab only deletes its pod and leaves the"
+                " rest of its Kubernetes objects in place, so that the next"
+                " spawn with compatible settings only has to create a new pod."
+                " Suspended labs that are not resumed within this interval are"
+                " deleted during reconciliation. If not set, stopping a lab"
+                " deletes all of its objects."
+            ),
+            examples=[86400],
+        ),
+    ] = None
+
     tolerations: Annotated[
         list[Toleration],
         Field(
@@ -8,13 +8,23 @@ __all__ = [
     "CONFIGURATION_PATH",
     "DOCKER_CREDENTIALS_PATH",
     "DROPDOWN_SENTINEL_VALUE",
+    "FILESERVER_DELETE_CONCURRENCY",
     "GROUPNAME_REGEX",
     "KUBERNETES_NAME_PATTERN",
     "KUBERNETES_REQUEST_TIMEOUT",
+    "LAB_DIGEST_ANNOTATION",
+    "LAB_JOURNAL_INTERVAL",
+    "LAB_PROBE_INITIAL_DELAY",
+    "LAB_PROBE_MAX_DELAY",
+    "LAB_REATTACH_INTERVAL",
     "MEMORY_TO_TMP_SIZE_RATIO",
     "METADATA_PATH",
     "RESERVED_ENV",
     "RESERVED_PATHS",
+    "SECRET_REFRESH_INTERVAL",
+    "SPAWN_HISTOGRAM_BUCKETS",
+    "SPAWN_LATENCY_TARGET",
+    "SPAWN_LATENCY_WEIGHT",
     "USERNAME_REGEX",
 ]
 
@@ -39,6 +49,15 @@ DOCKER_CREDENTIALS_PATH = Path("/etc/secrets/.dockerconfigjson")
 DROPDOWN_SENTINEL_VALUE = "use_image_from_dropdown"
 """Used in the lab form for ``image_list`` when ``image_dropdown`` is used."""
 
+FILESERVER_DELETE_CONCURRENCY = 10
+"""Maximum number of file servers deleted in parallel during reconcile.
+
+Deleting a file server waits for each of its objects to go away, so deleting
+them one at a time makes reconcile take time proportional to the number of
+broken file servers. Bound the parallelism to avoid flooding the Kubernetes
+control plane after, for example, a mass file server failure.
+"""
+
 KUBERNETES_NAME_PATTERN = "^[a-z0-9]([-a-z0-9]*[a-z0-9])?$"
 """Pattern matching valid Kubernetes names."""
 
@@ -51,6 +70,34 @@ one-off operations, just to impose an upper limit on how long we'll wait of
 the control plane is nonresponsive.
 """
 
+LAB_DIGEST_ANNOTATION = "nublado.lsst.io/lab-digest"
+"""Namespace annotation holding a digest of the lab objects kept on suspend.
+
+A suspended lab is only resumed if the objects that a new spawn would create
+have the same digest. Otherwise, it is deleted and recreated from scratch.
+"""
+
+LAB_JOURNAL_INTERVAL = timedelta(seconds=5)
+"""How frequently to write changed lab operation history to the journal."""
+
+LAB_PROBE_INITIAL_DELAY = timedelta(milliseconds=100)
+"""Initial delay between attempts to contact a newly-started lab.
+
+The delay doubles after each failed attempt, up to `LAB_PROBE_MAX_DELAY`.
+"""
+
+LAB_PROBE_MAX_DELAY = timedelta(seconds=2)
+"""Maximum delay between attempts to contact a newly-started lab."""
+
+LAB_REATTACH_INTERVAL = timedelta(milliseconds=100)
+"""Delay between resuming monitoring of each pending lab spawn.
+
+After a controller restart, every lab spawn that was in progress is found
+during the first reconcile. Monitoring of those spawns is started with this
+delay between each one, rather than opening Kubernetes watches for all of
+them at once.
+"""
+
 JUPYTERLAB_DIR = "/usr/local/share/jupyterlab"
 """Location where our RSP Jupyterlab configuration is rooted."""
 
@@ -107,6 +154,35 @@ RESERVED_PATHS = {"/etc/group", "/etc/passwd", "/tmp"}
 No files or volumes may be mounted over these paths.
 """
 
+SECRET_REFRESH_INTERVAL = timedelta(minutes=5)
+"""How frequently to refresh the cached secrets used for user labs."""
+
+SPAWN_HISTOGRAM_BUCKETS = (
+    0.1,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+)
+"""Upper bounds in seconds of the buckets of the spawn timing histograms."""
+
+SPAWN_LATENCY_TARGET = timedelta(seconds=5)
+"""Target time to create the Kubernetes objects for a lab.
+
+If a moving average of the time taken to create the Kubernetes objects for a
+lab exceeds this, the limit on concurrent spawns, if any, is reduced in
+proportion, on the theory that the Kubernetes API server is overloaded.
+"""
+
+SPAWN_LATENCY_WEIGHT = 0.2
+"""Weight of each new sample in the moving average of spawn latency."""
+
 # These must be kept in sync with Gafaelfawr until we can import the models
 # from Gafaelfawr directly.
 
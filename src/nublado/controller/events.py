@@ -95,7 +95,77 @@ class SpawnSuccessEvent(LabMetadata):
         title="Duration of spawn",
         description=(
             "How long the spawn took before Kubernetes resources were ready."
-            " This does not include the startup time of the lab itself."
+            " This does not include the startup time of the lab itself unless"
+            " readiness probing is enabled."
+        ),
+    )
+
+    queue_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of admission wait",
+        description=(
+            "How long the spawn waited for other spawns to finish, if the"
+            " number of concurrent spawns is limited"
+        ),
+    )
+
+    delete_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of deletion",
+        description=(
+            "How long it took to delete a previous failed lab, if there was"
+            " one"
+        ),
+    )
+
+    secrets_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of secret retrieval",
+        description="How long it took to gather the secrets for the lab",
+    )
+
+    create_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of object creation",
+        description=(
+            "How long it took to build and create the Kubernetes objects for"
+            " the lab"
+        ),
+    )
+
+    schedule_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of scheduling",
+        description=(
+            "How long Kubernetes took to schedule the lab pod, if a scheduling"
+            " event was seen"
+        ),
+    )
+
+    pull_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of image pulls",
+        description=(
+            "Time from the first image pull starting to the last image pull"
+            " finishing, if any images had to be pulled"
+        ),
+    )
+
+    start_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of pod startup",
+        description=(
+            "How long the lab pod took to start running, excluding scheduling"
+            " and image pulls"
+        ),
+    )
+
+    ready_elapsed: timedelta | None = Field(
+        None,
+        title="Duration of lab startup",
+        description=(
+            "How long the lab took to respond to HTTP requests after its pod"
+            " started running, if readiness probing is enabled"
         ),
     )
 
@@ -32,12 +32,14 @@ from .services.prepuller import Prepuller
 from .services.source.base import ImageSource
 from .services.source.docker import DockerImageSource
 from .services.source.gar import GARImageSource
+from .storage.journal import LabJournal
 from .storage.kubernetes.fileserver import FileserverStorage
 from .storage.kubernetes.fsadmin import FSAdminStorage
 from .storage.kubernetes.lab import LabStorage
 from .storage.kubernetes.node import NodeStorage
 from .storage.kubernetes.pod import PodStorage
 from .storage.metadata import MetadataStorage
+from .storage.probe import LabProbe
 
 __all__ = ["Factory", "ProcessContext"]
 
@@ -211,6 +213,9 @@ class ProcessContext:
         await event_manager.initialize()
         lab_events = LabEvents()
         await lab_events.initialize(event_manager)
+        journal = None
+        if config.lab.journal_path:
+            journal = LabJournal(config.lab.journal_path)
         lab_manager = LabManager(
             config=config.lab,
             image_service=image_service,
@@ -224,6 +229,8 @@ class ProcessContext:
             lab_storage=LabStorage(
                 kubernetes_client, config.watch_reconnect_timeout, logger
             ),
+            lab_probe=LabProbe(http_client, logger),
+            journal=journal,
             events=lab_events,
             slack_client=slack_client,
             logger=logger,
@@ -2,7 +2,7 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from safir.models import ErrorLocation, ErrorModel
 from safir.slack.webhook import SlackRouteErrorHandler
 from sse_starlette import EventSourceResponse
@@ -18,7 +18,8 @@ from ..exceptions import (
     UnknownUserError,
 )
 from ..models.domain.gafaelfawr import GafaelfawrUser
-from ..models.v1.lab import LabSpecification, LabState
+from ..models.v1.lab import LabSecretStatus, LabSpecification, LabState
+from ..models.v1.metrics import SpawnMetrics
 
 router = APIRouter(route_class=SlackRouteErrorHandler)
 """Router to mount into the application."""
@@ -140,7 +141,9 @@ async def delete_user_lab(
     description=(
         "Returns a stream of server-sent events representing progress in"
         " creating the user's lab. The stream ends when the lab creation"
-        " succeeds or fails."
+        " succeeds or fails. A reconnecting client may send the ID of the"
+        " last event it received in the Last-Event-ID header to receive"
+        " only subsequent events."
     ),
     responses={
         200: {
@@ -155,11 +158,46 @@ async def delete_user_lab(
 async def get_lab_events(
     username: Annotated[str, Depends(username_path_dependency)],
     context: Annotated[RequestContext, Depends(context_dependency)],
+    last_event_id: Annotated[
+        str | None,
+        Header(
+            alias="Last-Event-ID",
+            title="Last event ID",
+            description="ID of the last event received by the client",
+        ),
+    ] = None,
 ) -> EventSourceResponse:
     try:
-        generator = context.lab_manager.events_for_user(username)
+        generator = context.lab_manager.events_for_user(
+            username, last_event_id
+        )
         return EventSourceResponse(generator)
     except UnknownUserError as e:
         e.location = ErrorLocation.path
         e.field_path = ["username"]
         raise
+
+
+@router.get(
+    "/spawner/v1/metrics/spawn", summary="Timing of lab spawns", tags=["admin"]
+)
+async def get_spawn_metrics(
+    context: Annotated[RequestContext, Depends(context_dependency)],
+) -> SpawnMetrics:
+    return context.lab_manager.get_spawn_metrics()
+
+
+@router.get(
+    "/spawner/v1/secrets",
+    description=(
+        "Report problems with the secrets listed in the lab configuration."
+        " The secrets are checked at startup and periodically thereafter, so"
+        " fixed problems may continue to be reported until the next check."
+    ),
+    summary="Status of lab secrets",
+    tags=["admin"],
+)
+async def get_secret_status(
+    context: Annotated[RequestContext, Depends(context_dependency)],
+) -> LabSecretStatus:
+    return context.lab_manager.get_secret_status()
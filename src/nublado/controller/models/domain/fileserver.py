@@ -11,7 +11,7 @@ from kubernetes_asyncio.client import (
     V1Service,
 )
 
-__all__ = ["FileserverObjects", "FileserverStateObjects"]
+__all__ = ["FileserverObjects", "FileserverShell", "FileserverStateObjects"]
 
 
 @dataclass
@@ -24,12 +24,42 @@ class FileserverObjects:
     ingress: dict[str, Any]
     """``GafaelfawrIngress`` object for the fileserver."""
 
-    service: V1Service
-    """Service for reaching the fileserver."""
+    service: V1Service | None
+    """Service for reaching the fileserver.
+
+    This is `None` if the fileserver is bound to a warm pool shell, since the
+    shell's service is reused.
+    """
 
     job: V1Job
     """Job that runs the fileserver itself."""
 
+    shell: str | None = None
+    """Name of the warm pool shell bound to this fileserver, if any.
+
+    If set, ``ingress`` replaces the existing ``GafaelfawrIngress`` of the
+    shell rather than creating a new one.
+    """
+
+
+@dataclass
+class FileserverShell:
+    """Kubernetes objects making up an unassigned warm pool shell.
+
+    A shell is a ``GafaelfawrIngress`` and ``Service`` created in advance so
+    that the ingress already has an IP address when a user's fileserver is
+    bound to it.
+    """
+
+    name: str
+    """Name of the shell, shared by all of its objects."""
+
+    ingress: dict[str, Any]
+    """``GafaelfawrIngress`` object for the shell."""
+
+    service: V1Service
+    """Service that will route to the fileserver bound to the shell."""
+
 
 @dataclass
 class FileserverStateObjects:
@@ -45,6 +45,7 @@ __all__ = [
     "PodAffinityTerm",
     "PodAntiAffinity",
     "PodChange",
+    "PodEvent",
     "PodPhase",
     "PreferredSchedulingTerm",
     "PropagationPolicy",
@@ -614,6 +615,17 @@ class PodChange:
     """Full object for the pod that changed."""
 
 
+@dataclass
+class PodEvent:
+    """A Kubernetes event involving a pod."""
+
+    message: str
+    """Human-readable message for the event."""
+
+    reason: str | None = None
+    """Machine-readable reason for the event, such as ``Scheduled``."""
+
+
 class PropagationPolicy(Enum):
     """Possible values for the ``propagationPolicy`` parameter to delete."""
 
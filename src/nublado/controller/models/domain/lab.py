@@ -2,6 +2,7 @@
 
 import json
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 from typing import Annotated
 
@@ -21,9 +22,11 @@ from sse_starlette import ServerSentEvent
 __all__ = [
     "Event",
     "EventType",
+    "LabJournalEntry",
     "LabObjectNames",
     "LabObjects",
     "LabStateObjects",
+    "LabSuspension",
 ]
 
 
@@ -75,9 +78,15 @@ class Event(BaseModel):
         """Whether this event indicates the event stream should stop."""
         return self.type in (EventType.COMPLETE, EventType.FAILED)
 
-    def to_sse(self) -> ServerSentEvent:
+    def to_sse(self, event_id: str | None = None) -> ServerSentEvent:
         """Convert to event suitable for sending to the client.
 
+        Parameters
+        ----------
+        event_id
+            If given, identifier for the event, which the client will send
+            back in the ``Last-Event-ID`` header if it reconnects.
+
         Returns
         -------
         sse_starlette.ServerSentEvent
@@ -86,7 +95,31 @@ class Event(BaseModel):
         data: dict[str, str | int] = {"message": self.message}
         if self.progress:
             data["progress"] = self.progress
-        return ServerSentEvent(data=json.dumps(data), event=self.type.value)
+        return ServerSentEvent(
+            data=json.dumps(data), event=self.type.value, id=event_id
+        )
+
+
+class LabJournalEntry(BaseModel):
+    """Journal record of the most recent operation on a user's lab.
+
+    Stored by `~nublado.controller.storage.journal.LabJournal` so that the
+    operation history survives a restart of the lab controller.
+    """
+
+    operation: Annotated[
+        str, Field(title="Operation", description="Type of the lab operation")
+    ]
+
+    started: Annotated[
+        datetime,
+        Field(title="Started", description="When the operation started"),
+    ]
+
+    events: Annotated[
+        list[Event],
+        Field(title="Events", description="Events from the operation"),
+    ] = []
 
 
 @dataclass
@@ -117,6 +150,9 @@ class LabObjectNames:
     pod: str
     """Name of the pod."""
 
+    suspension: str
+    """Name of the config map marking a suspended lab."""
+
 
 @dataclass
 class LabStateObjects:
@@ -159,3 +195,20 @@ class LabObjects(LabStateObjects):
 
     service: V1Service
     """Service for talking to the user's pod."""
+
+
+@dataclass
+class LabSuspension:
+    """Record of a suspended lab.
+
+    When suspension is enabled, stopping a lab only deletes the pod and the
+    environment config map, leaving the other lab objects in place so that
+    they can be reused by the next spawn. This record is stored in a config
+    map in the lab namespace.
+    """
+
+    digest: str
+    """Digest of the lab objects that were left in place."""
+
+    suspended: datetime
+    """When the lab was suspended."""
@@ -24,6 +24,7 @@ __all__ = [
     "LabOptions",
     "LabRequestOptions",
     "LabResources",
+    "LabSecretStatus",
     "LabSize",
     "LabSpecification",
     "LabState",
@@ -689,3 +690,21 @@ class LabState(BaseModel):
     def is_running(self) -> bool:
         """Whether the lab is currently running."""
         return self.status not in (LabStatus.TERMINATED, LabStatus.FAILED)
+
+
+class LabSecretStatus(BaseModel):
+    """Status of the secrets used to construct user lab secrets."""
+
+    problems: Annotated[
+        list[str],
+        Field(
+            title="Secret configuration problems",
+            description=(
+                "Problems with the secrets listed in the lab configuration"
+                " found by the most recent check, such as missing secrets or"
+                " missing keys. Spawns of new labs will fail while there are"
+                " problems."
+            ),
+            examples=[["Secret nublado/lab-secrets does not have key token"]],
+        ),
+    ]
@@ -0,0 +1,117 @@
+"""API-visible models for lab spawn timing metrics."""
+
+from enum import StrEnum
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+__all__ = ["Histogram", "HistogramBucket", "SpawnMetrics", "SpawnPhase"]
+
+
+class SpawnPhase(StrEnum):
+    """Phases of a lab spawn whose duration is measured."""
+
+    QUEUE = "queue"
+    """Waiting for other lab spawns to finish if spawns are limited."""
+
+    DELETE = "delete"
+    """Deleting a previous failed lab for the same user."""
+
+    SECRETS = "secrets"
+    """Gathering the secrets for the lab."""
+
+    CREATE = "create"
+    """Building and creating the Kubernetes objects for the lab.
+
+    This includes waiting for the default service account in the new
+    namespace, which is required before the pod can be created.
+    """
+
+    SCHEDULE = "schedule"
+    """Waiting for Kubernetes to schedule the lab pod onto a node."""
+
+    PULL = "pull"
+    """Pulling images for the lab pod, if they were not already present."""
+
+    START = "start"
+    """Running init containers and starting the lab container."""
+
+    READY = "ready"
+    """Waiting for the lab to respond, if readiness probing is enabled."""
+
+
+class HistogramBucket(BaseModel):
+    """One bucket of a histogram of durations."""
+
+    le: Annotated[
+        float | None,
+        Field(
+            title="Upper bound",
+            description=(
+                "Upper bound of the bucket in seconds, or null for the bucket"
+                " containing all observations"
+            ),
+            examples=[10.0],
+        ),
+    ]
+
+    count: Annotated[
+        int,
+        Field(
+            title="Count",
+            description=(
+                "Number of observations less than or equal to the upper bound"
+            ),
+            examples=[4],
+        ),
+    ]
+
+
+class Histogram(BaseModel):
+    """Histogram of durations.
+
+    Buckets are cumulative, following the conventions of Prometheus, so the
+    count of each bucket includes all observations in the smaller buckets.
+    """
+
+    buckets: Annotated[
+        list[HistogramBucket],
+        Field(
+            title="Buckets",
+            description="Cumulative buckets in order of upper bound",
+        ),
+    ]
+
+    count: Annotated[
+        int, Field(title="Count", description="Total number of observations")
+    ]
+
+    sum: Annotated[
+        float,
+        Field(
+            title="Sum", description="Sum of all observed durations in seconds"
+        ),
+    ]
+
+
+class SpawnMetrics(BaseModel):
+    """Timing of successful lab spawns since the controller started."""
+
+    total: Annotated[
+        Histogram,
+        Field(
+            title="Total spawn time",
+            description="Histogram of the total duration of each lab spawn",
+        ),
+    ]
+
+    phases: Annotated[
+        dict[SpawnPhase, Histogram],
+        Field(
+            title="Spawn phase times",
+            description=(
+                "Histogram of the duration of each phase of a lab spawn. Only"
+                " spawns that went through the phase are counted."
+            ),
+        ),
+    ]
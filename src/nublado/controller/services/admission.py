@@ -0,0 +1,164 @@
+"""Admission control for lab spawns."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+
+from structlog.stdlib import BoundLogger
+
+from ..constants import SPAWN_LATENCY_TARGET, SPAWN_LATENCY_WEIGHT
+
+__all__ = ["SpawnAdmission"]
+
+
+@dataclass
+class _Waiter:
+    """A spawn waiting for admission."""
+
+    future: asyncio.Future[None]
+    """Resolved when the spawn is admitted."""
+
+    on_queued: Callable[[int], None] | None
+    """Called with the spawn's position in the queue whenever it changes."""
+
+
+class SpawnAdmission:
+    """Limit the number of lab spawns in progress at the same time.
+
+    Each lab spawn makes a burst of Kubernetes API calls. If many users start
+    labs at once, such as at the start of a tutorial, running all of those
+    spawns concurrently overloads the Kubernetes API server and many of the
+    spawns time out. This class admits only a limited number of spawns at a
+    time and queues the rest in the order in which they arrived.
+
+    The limit is also reduced if Kubernetes object creation for admitted
+    spawns is slower than `~nublado.controller.constants.SPAWN_LATENCY_TARGET`,
+    as measured by a moving average of the times reported to
+    `record_latency`, so that fewer spawns are admitted while the Kubernetes
+    API server is struggling.
+
+    Parameters
+    ----------
+    limit
+        Maximum number of concurrent spawns, or `None` to not limit spawns.
+    logger
+        Logger to use.
+    """
+
+    def __init__(self, limit: int | None, logger: BoundLogger) -> None:
+        self._limit = limit
+        self._logger = logger
+        self._active = 0
+        self._latency: float | None = None
+        self._waiters: deque[_Waiter] = deque()
+
+    @property
+    def active(self) -> int:
+        """Number of admitted spawns that have not yet finished."""
+        return self._active
+
+    @property
+    def limit(self) -> int | None:
+        """Current limit on concurrent spawns, after any backpressure."""
+        if not self._limit:
+            return None
+        target = SPAWN_LATENCY_TARGET.total_seconds()
+        if self._latency is None or self._latency <= target:
+            return self._limit
+        return max(1, int(self._limit * target / self._latency))
+
+    @property
+    def queued(self) -> int:
+        """Number of spawns waiting to be admitted."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(
+        self, on_queued: Callable[[int], None] | None = None
+    ) -> AsyncIterator[None]:
+        """Wait until a spawn may proceed.
+
+        The spawn is considered to be in progress until the context manager
+        exits.
+
+        Parameters
+        ----------
+        on_queued
+            If the spawn has to wait, called with its position in the queue,
+            starting from 1, when it is first queued and whenever its
+            position changes.
+        """
+        limit = self.limit
+        if limit is None:
+            yield
+            return
+        if self._active < limit and not self._waiters:
+            self._active += 1
+        else:
+            loop = asyncio.get_running_loop()
+            waiter = _Waiter(future=loop.create_future(), on_queued=on_queued)
+            self._waiters.append(waiter)
+            if on_queued:
+                on_queued(len(self._waiters))
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self._release()
+                else:
+                    self._waiters.remove(waiter)
+                    self._report_positions()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def record_latency(self, elapsed: timedelta) -> None:
+        """Record how long Kubernetes object creation took for a spawn.
+
+        Parameters
+        ----------
+        elapsed
+            Time spent creating the Kubernetes objects for a lab.
+        """
+        sample = elapsed.total_seconds()
+        if self._latency is None:
+            self._latency = sample
+        else:
+            self._latency += SPAWN_LATENCY_WEIGHT * (sample - self._latency)
+        if self._limit and self.limit != self._limit:
+            self._logger.info(
+                "Reducing spawn concurrency",
+                latency=self._latency,
+                limit=self.limit,
+            )
+        self._admit_waiters()
+
+    def _admit_waiters(self) -> None:
+        """Admit queued spawns up to the current limit."""
+        limit = self.limit
+        admitted = False
+        while self._waiters and (limit is None or self._active < limit):
+            waiter = self._waiters.popleft()
+            if waiter.future.done():
+                continue
+            self._active += 1
+            waiter.future.set_result(None)
+            admitted = True
+        if admitted:
+            self._report_positions()
+
+    def _release(self) -> None:
+        """Release the slot of a finished spawn."""
+        self._active -= 1
+        self._admit_waiters()
+
+    def _report_positions(self) -> None:
+        """Report the new queue positions to all waiting spawns."""
+        for position, waiter in enumerate(self._waiters, start=1):
+            if waiter.on_queued:
+                waiter.on_queued(position)
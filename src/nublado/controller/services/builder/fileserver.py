@@ -1,6 +1,7 @@
 """Construction of Kubernetes objects for user fileservers."""
 
 import re
+import secrets
 from typing import Any
 from urllib.parse import urlparse
 
@@ -29,6 +30,7 @@ from ...config import EnabledFileserverConfig, PVCVolumeSource, VolumeConfig
 from ...constants import ARGO_CD_ANNOTATIONS
 from ...models.domain.fileserver import (
     FileserverObjects,
+    FileserverShell,
     FileserverStateObjects,
 )
 from ...storage.kubernetes.ingress import ingress_has_ip_address
@@ -66,26 +68,62 @@ class FileserverBuilder:
         self._volume_builder = VolumeBuilder()
         self._container = _introspect_container(logger)
 
-    def build(self, user: GafaelfawrUserInfo) -> FileserverObjects:
+    def build(
+        self, user: GafaelfawrUserInfo, shell: str | None = None
+    ) -> FileserverObjects:
         """Construct the objects that make up a user's fileserver.
 
         Parameters
         ----------
         user
             User for whom to create a fileserver.
+        shell
+            If given, bind the fileserver to this warm pool shell. The
+            ``GafaelfawrIngress`` will replace the one for the shell, no
+            ``Service`` will be created, and the pod will be labeled so that
+            the shell's ``Service`` routes to it.
 
         Returns
         -------
         FileserverObjects
             Kubernetes objects for the fileserver.
         """
+        name = shell or self.build_name(user.username)
         return FileserverObjects(
             pvcs=self._build_pvcs(user.username),
-            ingress=self._build_ingress(user.username),
-            service=self._build_service(user.username),
-            job=self._build_job(user),
+            ingress=self._build_ingress(user.username, name),
+            service=None if shell else self._build_service(user.username),
+            job=self._build_job(user, shell),
+            shell=shell,
         )
 
+    def build_shell(self) -> FileserverShell:
+        """Construct the objects for a new, unassigned warm pool shell.
+
+        The ``GafaelfawrIngress`` of the shell serves a path that cannot
+        conflict with any user's fileserver path, and its ``Service`` does not
+        match any pod until a fileserver is bound to the shell.
+
+        Returns
+        -------
+        FileserverShell
+            Kubernetes objects for the shell.
+        """
+        name = f"fs-pool-{secrets.token_hex(4)}"
+        metadata = self._build_shell_metadata(name)
+        ingress = self._build_ingress(None, name)
+        service = V1Service(
+            metadata=metadata,
+            spec=V1ServiceSpec(
+                ports=[V1ServicePort(port=8000, target_port=8000)],
+                selector={
+                    "nublado.lsst.io/category": "fileserver",
+                    "nublado.lsst.io/fileserver-shell": name,
+                },
+            ),
+        )
+        return FileserverShell(name=name, ingress=ingress, service=service)
+
     def build_name(self, username: str) -> str:
         """Construct the name of fileserver objects.
 
@@ -101,6 +139,23 @@ class FileserverBuilder:
         """
         return f"{username}-fs"
 
+    def get_shell_for_job(self, job: V1Job) -> str | None:
+        """Determine the warm pool shell a file server job is bound to.
+
+        Parameters
+        ----------
+        job
+            Job object.
+
+        Returns
+        -------
+        str or None
+            Name of the shell, or `None` if the file server was created
+            without one.
+        """
+        annotations = job.metadata.annotations or {}
+        return annotations.get("nublado.lsst.io/fileserver-shell")
+
     def get_username_for_pod(self, pod: V1Pod) -> str | None:
         """Determine the username for a file server pod.
 
@@ -178,45 +233,69 @@ class FileserverBuilder:
         annotations = ARGO_CD_ANNOTATIONS.copy()
         return V1ObjectMeta(name=name, labels=labels, annotations=annotations)
 
-    def _build_ingress(self, username: str) -> dict[str, Any]:
-        """Construct ``GafaelfawrIngress`` object for the fileserver."""
+    def _build_shell_metadata(self, name: str) -> V1ObjectMeta:
+        """Construct the metadata for the objects of a warm pool shell."""
+        labels = {
+            "nublado.lsst.io/category": "fileserver-pool",
+            "nublado.lsst.io/fileserver-shell": name,
+        }
+        if self._config.application:
+            labels["argocd.argoproj.io/instance"] = self._config.application
+        annotations = ARGO_CD_ANNOTATIONS.copy()
+        return V1ObjectMeta(name=name, labels=labels, annotations=annotations)
+
+    def _build_ingress(
+        self, username: str | None, name: str
+    ) -> dict[str, Any]:
+        """Construct ``GafaelfawrIngress`` object for the fileserver.
+
+        If ``username`` is `None`, construct the ingress for an unassigned
+        warm pool shell. Usernames cannot start with a period, so its path
+        cannot conflict with the path of any user's fileserver.
+        """
         host = urlparse(self._base_url).hostname
-        metadata = self._build_metadata(username).to_dict(serialize=True)
+        if username:
+            metadata = self._build_metadata(username)
+            metadata.name = name
+            path_suffix = username
+        else:
+            metadata = self._build_shell_metadata(name)
+            path_suffix = f".pool/{name}"
         path = {
-            "path": f"{self._config.path_prefix}/{username}",
+            "path": f"{self._config.path_prefix}/{path_suffix}",
             "pathType": "Prefix",
-            "backend": {
-                "service": {
-                    "name": self.build_name(username),
-                    "port": {"number": 8000},
-                }
-            },
+            "backend": {"service": {"name": name, "port": {"number": 8000}}},
         }
+        config: dict[str, Any] = {
+            "allowOptions": True,
+            "authType": "basic",
+            "baseUrl": self._base_url,
+            "scopes": {"all": ["write:files"]},
+            "service": "nublado-files",
+        }
+        if username:
+            config["username"] = username
         return {
             "apiVersion": "gafaelfawr.lsst.io/v1alpha1",
             "kind": "GafaelfawrIngress",
-            "metadata": metadata,
-            "config": {
-                "allowOptions": True,
-                "authType": "basic",
-                "baseUrl": self._base_url,
-                "scopes": {"all": ["write:files"]},
-                "service": "nublado-files",
-                "username": username,
-            },
+            "metadata": metadata.to_dict(serialize=True),
+            "config": config,
             "template": {
                 "metadata": {
-                    "name": metadata["name"],
+                    "name": name,
                     "labels": {
-                        "nublado.lsst.io/category": "fileserver",
-                        "nublado.lsst.io/user": username,
+                        k: v
+                        for k, v in metadata.labels.items()
+                        if k.startswith("nublado.lsst.io/")
                     },
                 },
                 "spec": {"rules": [{"host": host, "http": {"paths": [path]}}]},
             },
         }
 
-    def _build_job(self, user: GafaelfawrUserInfo) -> V1Job:
+    def _build_job(
+        self, user: GafaelfawrUserInfo, shell: str | None = None
+    ) -> V1Job:
         """Construct the job for a fileserver."""
         wanted_volumes = {m.volume_name for m in self._config.volume_mounts}
         volumes = self._volume_builder.build_volumes(
@@ -255,6 +334,13 @@ class FileserverBuilder:
         metadata = self._build_metadata(user.username)
         if self._config.extra_annotations:
             metadata.annotations.update(self._config.extra_annotations)
+        pod_labels = {
+            "nublado.lsst.io/category": "fileserver",
+            "nublado.lsst.io/user": user.username,
+        }
+        if shell:
+            metadata.annotations["nublado.lsst.io/fileserver-shell"] = shell
+            pod_labels["nublado.lsst.io/fileserver-shell"] = shell
         affinity = None
         if self._config.affinity:
             affinity = self._config.affinity.to_kubernetes()
@@ -268,10 +354,7 @@ class FileserverBuilder:
                 template=V1PodTemplateSpec(
                     metadata=V1ObjectMeta(
                         name=metadata.name,
-                        labels={
-                            "nublado.lsst.io/category": "fileserver",
-                            "nublado.lsst.io/user": user.username,
-                        },
+                        labels=pod_labels,
                         annotations=self._config.extra_annotations.copy(),
                     ),
                     spec=V1PodSpec(
@@ -1,13 +1,18 @@
 """Construction of Kubernetes objects for user lab environments."""
 
+import hashlib
 import json
 import os
 import re
 import shlex
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 from jinja2 import Template
 from kubernetes_asyncio.client import (
+    V1Affinity,
     V1Capabilities,
     V1ConfigMap,
     V1ConfigMapEnvSource,
@@ -45,6 +50,7 @@ from kubernetes_asyncio.client import (
     V1Service,
     V1ServicePort,
     V1ServiceSpec,
+    V1Toleration,
     V1Volume,
     V1VolumeMount,
 )
@@ -59,8 +65,17 @@ from ...config import (
     PVCVolumeSource,
     UserHomeDirectorySchema,
 )
-from ...constants import ARGO_CD_ANNOTATIONS, MEMORY_TO_TMP_SIZE_RATIO
-from ...models.domain.lab import LabObjectNames, LabObjects, LabStateObjects
+from ...constants import (
+    ARGO_CD_ANNOTATIONS,
+    LAB_DIGEST_ANNOTATION,
+    MEMORY_TO_TMP_SIZE_RATIO,
+)
+from ...models.domain.lab import (
+    LabObjectNames,
+    LabObjects,
+    LabStateObjects,
+    LabSuspension,
+)
 from ...models.domain.volumes import MountedVolume
 from ...models.v1.lab import (
     LabOptions,
@@ -79,6 +94,56 @@ from .volumes import VolumeBuilder
 __all__ = ["LabBuilder"]
 
 
+@dataclass
+class _LabSkeleton:
+    """User-independent parts of the Kubernetes objects for a lab.
+
+    These are derived solely from the lab configuration, so they are built
+    once when the builder is created and then shared by every lab it builds.
+    The objects stored here are shared between labs and therefore must never
+    be modified. Each lab gets fresh lists and top-level objects that refer
+    to them.
+    """
+
+    namespace_templates: dict[str, Template]
+    """Compiled Jinja templates for the namespace annotations."""
+
+    env: dict[str, str]
+    """Standard environment variables that do not vary by user or size."""
+
+    files: dict[str, str]
+    """Extra files added to the files ``ConfigMap``, keyed by ``ConfigMap``
+    key.
+    """
+
+    volume_mounts: list[V1VolumeMount]
+    """Mounts of configured volumes for the lab and setup containers."""
+
+    secret_mounts: list[V1VolumeMount]
+    """Mounts of secrets at additional paths for the lab container."""
+
+    init_container_mounts: list[list[V1VolumeMount]]
+    """Mounts for each configured init container, in the same order."""
+
+    startup_volumes: tuple[MountedVolume, MountedVolume]
+    """Startup volume as mounted by the init containers and the lab."""
+
+    downward_api_volume: MountedVolume
+    """Volume providing downward API information."""
+
+    pull_secrets: list[V1LocalObjectReference] | None
+    """Image pull secrets for the lab pod."""
+
+    affinity: V1Affinity | None
+    """Affinity rules for the lab pod."""
+
+    node_selector: dict[str, str] | None
+    """Node selector for the lab pod."""
+
+    tolerations: list[V1Toleration]
+    """Tolerations for the lab pod."""
+
+
 class LabBuilder:
     """Construct Kubernetes objects for user lab environments.
 
@@ -108,6 +173,8 @@ class LabBuilder:
         self._logger = logger
         self._volume_builder = VolumeBuilder()
         self._container = _introspect_container(logger)
+        self._skeleton = self._build_skeleton()
+        self._discovery_cache: tuple[dict[str, Any], str] | None = None
 
     def build_internal_url(self, username: str, env: dict[str, str]) -> str:
         """Determine the URL of a newly-spawned lab.
@@ -154,6 +221,7 @@ class LabBuilder:
             env_config_map=f"{username}-nb-env",
             quota=f"{username}-nb",
             pod=f"{username}-nb",
+            suspension=f"{username}-nb-suspended",
         )
 
     async def build_lab(
@@ -185,7 +253,7 @@ class LabBuilder:
         LabObjects
             Kubernetes objects that make up the user's lab.
         """
-        return LabObjects(
+        objects = LabObjects(
             namespace=self._build_namespace(user),
             env_config_map=self._build_env_config_map(user, lab, image),
             config_maps=await self._build_config_maps(user),
@@ -196,6 +264,72 @@ class LabBuilder:
             service=self._build_service(user.username),
             pod=self._build_pod(user, lab, image),
         )
+        if self._config.suspend_timeout:
+            digest = self._build_digest(objects)
+            objects.namespace.metadata.annotations[LAB_DIGEST_ANNOTATION] = (
+                digest
+            )
+        return objects
+
+    def build_suspension(
+        self, username: str, namespace: V1Namespace
+    ) -> V1ConfigMap | None:
+        """Construct the config map marking a suspended lab.
+
+        Parameters
+        ----------
+        username
+            User whose lab is being suspended.
+        namespace
+            Namespace of the lab, as read from Kubernetes.
+
+        Returns
+        -------
+        kubernetes_asyncio.client.models.V1ConfigMap or None
+            Config map recording when the lab was suspended and the digest of
+            the objects left in place, or `None` if the namespace has no
+            digest and therefore the lab cannot be resumed.
+        """
+        annotations = namespace.metadata.annotations or {}
+        digest = annotations.get(LAB_DIGEST_ANNOTATION)
+        if not digest:
+            return None
+        name = self.build_object_names(username).suspension
+        suspended = datetime.now(tz=UTC)
+        return V1ConfigMap(
+            metadata=self._build_metadata(name, username),
+            immutable=True,
+            data={"digest": digest, "suspended": suspended.isoformat()},
+        )
+
+    def recreate_suspension(
+        self, username: str, config_map: V1ConfigMap
+    ) -> LabSuspension | None:
+        """Recreate the record of a suspended lab from Kubernetes.
+
+        Parameters
+        ----------
+        username
+            User whose lab was suspended.
+        config_map
+            Config map marking the suspended lab.
+
+        Returns
+        -------
+        LabSuspension or None
+            Record of the suspended lab, or `None` if the config map could not
+            be parsed.
+        """
+        data = config_map.data or {}
+        try:
+            return LabSuspension(
+                digest=data["digest"],
+                suspended=datetime.fromisoformat(data["suspended"]),
+            )
+        except Exception as e:
+            msg = "Invalid suspended lab record"
+            self._logger.exception(msg, user=username, error=str(e))
+            return None
 
     async def recreate_lab_state(
         self, username: str, objects: LabStateObjects | None
@@ -284,6 +418,41 @@ class LabBuilder:
             logger.exception("Invalid lab environment", error=str(e))
             return None
 
+    async def _build_discovery_json(self) -> str:
+        """Construct the serialized discovery information for the lab.
+
+        The discovery client caches the underlying data, so the dictionary
+        returned is normally identical between spawns. Cache the serialized
+        form and only serialize it again if the data changes.
+        """
+        discovery_dict = await self._discovery.build_nublado_dict()
+        if self._discovery_cache:
+            cached_dict, cached_json = self._discovery_cache
+            if cached_dict == discovery_dict:
+                return cached_json
+        discovery_json = json.dumps(discovery_dict, sort_keys=True, indent=2)
+        self._discovery_cache = (discovery_dict, discovery_json)
+        return discovery_json
+
+    def _build_digest(self, objects: LabObjects) -> str:
+        """Construct a digest of the lab objects left in place on suspend.
+
+        This covers every object other than the pod and the environment
+        config map, which are recreated on every spawn.
+        """
+        preserved = [
+            objects.namespace,
+            *objects.config_maps,
+            objects.network_policy,
+            *objects.pvcs,
+            objects.quota,
+            *objects.secrets,
+            objects.service,
+        ]
+        data = [o.to_dict() if o else None for o in preserved]
+        serialized = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
     def _build_home_directory(self, username: str) -> str:
         """Construct the home directory path for a user."""
         prefix = self._config.homedir_prefix
@@ -296,6 +465,76 @@ class LabBuilder:
             home += "/" + self._config.homedir_suffix
         return home
 
+    def _build_skeleton(self) -> _LabSkeleton:
+        """Construct the user-independent parts of the lab objects.
+
+        Everything returned is derived only from the configuration, which
+        does not change during the lifetime of the builder. Any change in
+        configuration requires a restart, which creates a new builder.
+        """
+        config = self._config
+        activity = str(int(config.activity_interval.total_seconds()))
+        env = {
+            # Activity reporting interval.
+            "JUPYTERHUB_ACTIVITY_INTERVAL": activity,
+            # Used by code running in the lab to find other services.
+            "EXTERNAL_INSTANCE_URL": self._base_url,
+            # Information about where our Lab config, runtime-info mounts can
+            # be found, and command to launch the lab
+            "JUPYTERLAB_CONFIG_DIR": config.jupyterlab_config_dir,
+            "JUPYTERLAB_START_COMMAND": shlex.join(config.lab_start_command),
+            "NUBLADO_RUNTIME_MOUNTS_DIR": config.runtime_mounts_dir,
+        }
+        files = {
+            re.sub(r"[_.]", "-", Path(k).name): v
+            for k, v in config.files.items()
+        }
+        secret_mounts = [
+            V1VolumeMount(
+                mount_path=spec.path,
+                name="secrets",
+                read_only=True,
+                sub_path=spec.secret_key,
+            )
+            for spec in config.secrets
+            if spec.path
+        ]
+        init_container_mounts = [
+            self._volume_builder.build_mounts(spec.volume_mounts)
+            for spec in config.init_containers
+        ]
+
+        # "640k ought to be enough for anybody." -- Bill Gates
+        startup_volumes = (
+            self._build_pod_startup_volume(size=640 * 1024, lab=False),
+            self._build_pod_startup_volume(size=640 * 1024, lab=True),
+        )
+
+        pull_secrets = None
+        if config.pull_secret:
+            pull_secrets = [V1LocalObjectReference(name="pull-secret")]
+        affinity = None
+        if config.affinity:
+            affinity = config.affinity.to_kubernetes()
+        return _LabSkeleton(
+            namespace_templates={
+                k: Template(v) for k, v in config.namespace_annotations.items()
+            },
+            env=env,
+            files=files,
+            volume_mounts=self._volume_builder.build_mounts(
+                config.volume_mounts
+            ),
+            secret_mounts=secret_mounts,
+            init_container_mounts=init_container_mounts,
+            startup_volumes=startup_volumes,
+            downward_api_volume=self._build_pod_downward_api_volume(),
+            pull_secrets=pull_secrets,
+            affinity=affinity,
+            node_selector=config.node_selector or None,
+            tolerations=[t.to_kubernetes() for t in config.tolerations],
+        )
+
     def _build_metadata(self, name: str, username: str) -> V1ObjectMeta:
         """Construct the metadata for an object.
 
@@ -316,9 +555,9 @@ class LabBuilder:
         name = f"{self._config.namespace_prefix}-{user.username}"
         metadata = self._build_metadata(name, user.username)
         context = {"uid": user.uid, "gid": user.gid}
-        for annotation, template in self._config.namespace_annotations.items():
-            value = Template(template).render(**context)
-            metadata.annotations[annotation] = value
+        templates = self._skeleton.namespace_templates
+        for annotation, template in templates.items():
+            metadata.annotations[annotation] = template.render(**context)
         return V1Namespace(metadata=metadata)
 
     async def _build_config_maps(
@@ -344,7 +583,6 @@ class LabBuilder:
 
         # Add standard environment variables.
         size = self._config.get_size_definition(lab.options.size)
-        activity = str(int(self._config.activity_interval.total_seconds()))
         resources = size.resources
         env.update(
             {
@@ -362,19 +600,9 @@ class LabBuilder:
                 "CPU_LIMIT": str(resources.limits.cpu),
                 "MEM_GUARANTEE": str(resources.requests.memory),
                 "MEM_LIMIT": str(resources.limits.memory),
-                # Activity reporting interval.
-                "JUPYTERHUB_ACTIVITY_INTERVAL": activity,
-                # Used by code running in the lab to find other services.
-                "EXTERNAL_INSTANCE_URL": self._base_url,
-                # Information about where our Lab config, runtime-info
-                # mounts can be found, and command to launch the lab
-                "JUPYTERLAB_CONFIG_DIR": self._config.jupyterlab_config_dir,
-                "JUPYTERLAB_START_COMMAND": shlex.join(
-                    self._config.lab_start_command
-                ),
-                "NUBLADO_RUNTIME_MOUNTS_DIR": self._config.runtime_mounts_dir,
             }
         )
+        env.update(self._skeleton.env)
 
         # Inject REPERTOIRE_BASE_URL if we know it.
         rep_base = os.environ.get("REPERTOIRE_BASE_URL")
@@ -396,15 +624,8 @@ class LabBuilder:
 
     async def _build_file_config_map(self, username: str) -> V1ConfigMap:
         """Build the config map holding supplemental mounted files."""
-        discovery_dict = await self._discovery.build_nublado_dict()
-        discovery_json = json.dumps(discovery_dict, sort_keys=True, indent=2)
-        data = {"discovery-v1-json": discovery_json}
-        if self._config.files:
-            extra_files = {
-                re.sub(r"[_.]", "-", Path(k).name): v
-                for k, v in self._config.files.items()
-            }
-            data.update(extra_files)
+        discovery_json = await self._build_discovery_json()
+        data = {"discovery-v1-json": discovery_json, **self._skeleton.files}
         return V1ConfigMap(
             metadata=self._build_metadata(f"{username}-nb-files", username),
             immutable=True,
@@ -549,10 +770,7 @@ class LabBuilder:
         size = self._config.get_size_definition(lab.options.size)
         resources = size.resources
 
-        # Construct the pull secrets.
-        pull_secrets = None
-        if self._config.pull_secret:
-            pull_secrets = [V1LocalObjectReference(name="pull-secret")]
+        skeleton = self._skeleton
 
         # Construct the pod metadata.
         metadata = self._build_metadata(f"{user.username}-nb", user.username)
@@ -566,18 +784,11 @@ class LabBuilder:
             self._build_pod_secret_volume(user.username),
             self._build_pod_env_volume(user.username),
             self._build_pod_tmp_volume(mem_size=resources.limits.memory),
-            self._build_pod_downward_api_volume(user.username),
-        ]
-        init_mounted_volumes = [
-            *shared_mounted_volumes,
-            # "640k ought to be enough for anybody." -- Bill Gates
-            self._build_pod_startup_volume(size=640 * 1024, lab=False),
-        ]
-        lab_mounted_volumes = [
-            *shared_mounted_volumes,
-            # "640k ought to be enough for anybody." -- Bill Gates
-            self._build_pod_startup_volume(size=640 * 1024, lab=True),
+            skeleton.downward_api_volume,
         ]
+        init_startup_volume, lab_startup_volume = skeleton.startup_volumes
+        init_mounted_volumes = [*shared_mounted_volumes, init_startup_volume]
+        lab_mounted_volumes = [*shared_mounted_volumes, lab_startup_volume]
         volumes = self._build_pod_volumes(user.username, lab_mounted_volumes)
 
         # Build the pod object itself.
@@ -592,17 +803,16 @@ class LabBuilder:
             resources,
             image,
         )
-        affinity = None
-        if self._config.affinity:
-            affinity = self._config.affinity.to_kubernetes()
         node_selector = None
-        if self._config.node_selector:
-            node_selector = self._config.node_selector.copy()
-        tolerations = [t.to_kubernetes() for t in self._config.tolerations]
+        if skeleton.node_selector:
+            node_selector = skeleton.node_selector.copy()
+        pull_secrets = None
+        if skeleton.pull_secrets:
+            pull_secrets = list(skeleton.pull_secrets)
         return V1Pod(
             metadata=metadata,
             spec=V1PodSpec(
-                affinity=affinity,
+                affinity=skeleton.affinity,
                 automount_service_account_token=False,
                 containers=containers,
                 image_pull_secrets=pull_secrets,
@@ -612,7 +822,7 @@ class LabBuilder:
                 security_context=V1PodSecurityContext(
                     supplemental_groups=user.supplemental_groups
                 ),
-                tolerations=tolerations,
+                tolerations=list(skeleton.tolerations),
                 volumes=volumes,
             ),
         )
@@ -643,18 +853,9 @@ class LabBuilder:
         self, username: str, mounted_volumes: list[MountedVolume]
     ) -> list[V1VolumeMount]:
         """Construct the volume mounts for the user's pod."""
-        mounts = self._volume_builder.build_mounts(self._config.volume_mounts)
+        mounts = list(self._skeleton.volume_mounts)
         mounts.extend(v.volume_mount for v in mounted_volumes)
-        for spec in self._config.secrets:
-            if not spec.path:
-                continue
-            mount = V1VolumeMount(
-                mount_path=spec.path,
-                name="secrets",
-                read_only=True,
-                sub_path=spec.secret_key,
-            )
-            mounts.append(mount)
+        mounts.extend(self._skeleton.secret_mounts)
         return mounts
 
     def _build_pod_config_map_volume(
@@ -813,7 +1014,7 @@ class LabBuilder:
             ),
         )
 
-    def _build_pod_downward_api_volume(self, username: str) -> MountedVolume:
+    def _build_pod_downward_api_volume(self) -> MountedVolume:
         """Build the volume that mounts downward API information.
 
         This is redundant with environment variables we set that contain the
@@ -907,8 +1108,10 @@ class LabBuilder:
 
         # Now we add the config-requested init containers, in order.
         # These have their own set of volume mounts.
-        for spec in self._config.init_containers:
-            c_mounts = self._volume_builder.build_mounts(spec.volume_mounts)
+        init_container_mounts = self._skeleton.init_container_mounts
+        for spec, c_mounts in zip(
+            self._config.init_containers, init_container_mounts, strict=True
+        ):
             container = V1Container(
                 name=spec.name,
                 command=spec.command,
@@ -918,7 +1121,7 @@ class LabBuilder:
                 image_pull_policy=spec.image.pull_policy.value,
                 resources=resources.to_kubernetes(),
                 security_context=as_root if spec.privileged else as_user,
-                volume_mounts=c_mounts,
+                volume_mounts=list(c_mounts),
             )
             containers.append(container)
 
@@ -3,6 +3,8 @@
 import asyncio
 import builtins
 import contextlib
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 
@@ -13,8 +15,12 @@ from safir.slack.webhook import SlackWebhookClient
 from structlog.stdlib import BoundLogger
 
 from ..config import EnabledFileserverConfig
-from ..constants import KUBERNETES_REQUEST_TIMEOUT
+from ..constants import (
+    FILESERVER_DELETE_CONCURRENCY,
+    KUBERNETES_REQUEST_TIMEOUT,
+)
 from ..exceptions import UnknownUserError
+from ..models.domain.fileserver import FileserverStateObjects
 from ..models.domain.kubernetes import PodPhase
 from ..models.v1.fileserver import FileserverStatus
 from ..storage.kubernetes.fileserver import FileserverStorage
@@ -37,6 +43,9 @@ class _State:
     in_progress: bool = False
     """Whether an operation is currently in progress."""
 
+    shell: str | None = None
+    """Name of the warm pool shell bound to the file server, if any."""
+
     last_modified: datetime = field(
         default_factory=lambda: datetime.now(tz=UTC)
     )
@@ -124,6 +133,12 @@ class FileserverManager:
         # Mapping of usernames to internal state.
         self._servers: dict[str, _State] = {}
 
+        # Names of ready, unassigned warm pool shells, shells that are being
+        # created, and an event set whenever the pool needs refilling.
+        self._pool: deque[str] = deque()
+        self._pool_pending: set[str] = set()
+        self._pool_changed = asyncio.Event()
+
     async def create(self, user: GafaelfawrUserInfo) -> None:
         """Ensure a file server exists for the given user.
 
@@ -160,6 +175,9 @@ class FileserverManager:
             try:
                 state.in_progress = True
                 state.last_modified = datetime.now(tz=UTC)
+                if not state.shell and self._pool:
+                    state.shell = self._pool.popleft()
+                    self._pool_changed.set()
                 async with timeout.enforce():
                     await self._create_file_server(user, timeout)
             except Exception as e:
@@ -240,18 +258,25 @@ class FileserverManager:
         # Check each fileserver we found to see if it's properly running. If
         # it is and we didn't know about it, add it to our internal state and
         # assume it's supposed to be running. (This is the normal case for
-        # reconcile during process startup.) If the file server isn't valid,
-        # queue it up for removal.
+        # reconcile during process startup.) Leave alone any file server with
+        # an operation in progress or that changed since the reconcile
+        # started, since its objects are created in parallel and a creation
+        # that later fails may look valid midway. If the file server isn't
+        # valid, queue it up for removal.
         to_delete = set()
-        unexpected = set()
+        unexpected = {}
         for username, state in seen.items():
+            shell = self._builder.get_shell_for_job(state.job)
             if self._builder.is_valid(username, state):
+                current = self._servers.get(username)
+                if current and current.modified_since(start):
+                    continue
                 if username not in known_users:
-                    self._servers[username] = _State(running=True)
+                    self._servers[username] = _State(running=True, shell=shell)
             elif username in self._servers:
                 to_delete.add(username)
             else:
-                unexpected.add(username)
+                unexpected[username] = shell
 
         # Delete running file servers that are invalid in some way.
         await self._delete_invalid_servers(to_delete, start)
@@ -267,6 +292,12 @@ class FileserverManager:
         seen_users = {u for u in seen if u not in to_delete}
         await self._delete_missing_servers(known_users - seen_users, start)
 
+        # Delete any warm pool shells that are neither in the pool nor bound
+        # to a file server, such as unassigned shells from before a restart.
+        # Skip this if the warm pool is disabled to avoid an extra API call.
+        if self._config.warm_pool_size:
+            await self._delete_orphaned_shells(seen)
+
         # Log completion.
         self._logger.debug("File server reconciliation complete")
 
@@ -283,14 +314,15 @@ class FileserverManager:
             Start of the reconcile. Servers modified since then will be left
             alone.
         """
+        usernames = []
         for username in to_delete:
             if username in self._servers:
                 if self._servers[username].modified_since(start):
                     continue
             msg = "Removing broken fileserver for user"
             self._logger.warning(msg, user=username)
-            with contextlib.suppress(UnknownUserError):
-                await self.delete(username)
+            usernames.append(username)
+        await self._delete_concurrently(usernames, self._delete_if_running)
 
     async def _delete_missing_servers(
         self, to_delete: set[str], start: datetime
@@ -305,17 +337,47 @@ class FileserverManager:
             Start of the reconcile. Servers modified since then will be left
             alone.
         """
+        usernames = []
         for username in to_delete:
             if username in self._servers:
                 if self._servers[username].modified_since(start):
                     continue
             msg = "No file server job for user, removing remnants"
             self._logger.warning(msg, user=username)
-            with contextlib.suppress(UnknownUserError):
-                await self.delete(username)
+            usernames.append(username)
+        await self._delete_concurrently(usernames, self._delete_if_running)
+
+    async def _delete_orphaned_shells(
+        self, seen: dict[str, FileserverStateObjects]
+    ) -> None:
+        """Delete warm pool shells that are not in use.
+
+        Parameters
+        ----------
+        seen
+            File server state found in Kubernetes during this reconcile.
+        """
+        timeout = Timeout(
+            "Listing file server shells", KUBERNETES_REQUEST_TIMEOUT
+        )
+        shells = await self._storage.list_shells(
+            self._config.namespace, timeout
+        )
+
+        # Determine the shells in use only after the list call returns, so
+        # that shells added to the pool while it was running are included.
+        in_use = set(self._pool) | self._pool_pending
+        in_use.update(s.shell for s in self._servers.values() if s.shell)
+        for state in seen.values():
+            if shell := self._builder.get_shell_for_job(state.job):
+                in_use.add(shell)
+        orphans = [s for s in shells if s not in in_use]
+        for shell in orphans:
+            self._logger.info("Deleting unused file server shell", name=shell)
+        await self._delete_concurrently(orphans, self._delete_shell)
 
     async def _delete_unexpected_servers(
-        self, to_delete: set[str], start: datetime
+        self, to_delete: dict[str, str | None], start: datetime
     ) -> None:
         """Delete invalid servers that weren't expected to be running.
 
@@ -326,28 +388,167 @@ class FileserverManager:
         Parameters
         ----------
         to_delete
-            Usernames for servers to delete.
+            Usernames for servers to delete, mapped to the name of the warm
+            pool shell each is bound to, if any.
         start
             Start of the reconcile. Servers modified since then will be left
             alone.
         """
+        usernames = []
         for username in to_delete:
             if username in self._servers:
                 continue
             msg = "File server present but not valid or wanted, deleting"
             self._logger.info(msg, user=username)
+            usernames.append(username)
+        await self._delete_concurrently(
+            usernames, lambda u: self._delete_unexpected(u, to_delete[u])
+        )
 
-            # There is an unavoidable race condition where if the user for
-            # this invalid file server attempts to create a valid file server
-            # just as we make this call, we may delete parts of their new file
-            # server. Solving this is complicated; live with it for now.
-            name = self._builder.build_name(username)
-            timeout = Timeout(
-                "Deleting file server", KUBERNETES_REQUEST_TIMEOUT, username
-            )
+    async def _delete_concurrently(
+        self,
+        usernames: Iterable[str],
+        delete: Callable[[str], Awaitable[None]],
+    ) -> None:
+        """Delete file servers in parallel with bounded concurrency.
+
+        Failures are not raised, since they have already been logged and
+        reported by the deletion function and should not prevent the
+        remaining file servers from being deleted.
+
+        Parameters
+        ----------
+        usernames
+            Usernames whose file servers should be deleted.
+        delete
+            Function to call to delete the file server for one user.
+        """
+        semaphore = asyncio.Semaphore(FILESERVER_DELETE_CONCURRENCY)
+
+        async def delete_one(username: str) -> None:
+            async with semaphore:
+                with contextlib.suppress(Exception):
+                    await delete(username)
+
+        async with asyncio.TaskGroup() as tg:
+            for username in usernames:
+                tg.create_task(delete_one(username))
+
+    async def _delete_if_running(self, username: str) -> None:
+        """Delete a file server we believe to be running, if it still is.
+
+        Parameters
+        ----------
+        username
+            Username of user.
+        """
+        with contextlib.suppress(UnknownUserError):
+            await self.delete(username)
+
+    async def _delete_unexpected(
+        self, username: str, shell: str | None
+    ) -> None:
+        """Delete a file server that isn't in our internal state.
+
+        Parameters
+        ----------
+        username
+            Username of user.
+        shell
+            Name of the warm pool shell the file server is bound to, if any.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        # There is an unavoidable race condition where if the user for this
+        # invalid file server attempts to create a valid file server just as
+        # we make this call, we may delete parts of their new file server.
+        # Solving this is complicated; live with it for now.
+        name = self._builder.build_name(username)
+        timeout = Timeout(
+            "Deleting file server", KUBERNETES_REQUEST_TIMEOUT, username
+        )
+        try:
             await self._storage.delete(
-                name, self._config.namespace, username, timeout
+                name, self._config.namespace, username, timeout, shell=shell
             )
+        except Exception as e:
+            msg = "Error deleting file server"
+            self._logger.exception(msg, user=username)
+            await self._maybe_post_exception(e, username)
+            raise
+
+    async def _delete_shell(self, name: str) -> None:
+        """Delete a warm pool shell.
+
+        Parameters
+        ----------
+        name
+            Name of the shell.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        timeout = Timeout(
+            "Deleting file server shell", self._config.delete_timeout
+        )
+        try:
+            async with timeout.enforce():
+                await self._storage.delete_shell(
+                    name, self._config.namespace, timeout
+                )
+        except Exception as e:
+            msg = "Error deleting file server shell"
+            self._logger.exception(msg, name=name)
+            await self._maybe_post_exception(e)
+            raise
+
+    async def maintain_pool(self) -> None:
+        """Keep the warm pool of file server shells full.
+
+        Creates new shells whenever the pool drops below its configured size,
+        either because a shell was bound to a new file server or because
+        creating a shell failed. This method runs as a background task and
+        should only be started if the warm pool is enabled.
+        """
+        interval = self._config.reconcile_interval.total_seconds()
+        while True:
+            self._pool_changed.clear()
+            wanted = self._config.warm_pool_size
+            missing = wanted - len(self._pool) - len(self._pool_pending)
+            if missing > 0:
+                self._logger.debug(f"Creating {missing} file server shells")
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(missing):
+                        tg.create_task(self._add_shell())
+
+            # Wake up when a shell is taken, but also periodically to retry
+            # any shells whose creation failed.
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(interval):
+                    await self._pool_changed.wait()
+
+    async def watch_state(self) -> None:
+        """Maintain the in-memory caches of file server objects.
+
+        Reconciliation reads file server state from these caches rather than
+        making Kubernetes API calls for every file server. This method runs as
+        a background task and restarts the caches if their watches fail.
+        Until the caches are populated, reconciliation falls back on reading
+        state directly from Kubernetes.
+        """
+        namespace = self._config.namespace
+        while True:
+            try:
+                await self._storage.watch_state(namespace)
+            except Exception as e:
+                self._logger.exception("Error watching file server state")
+                await self._maybe_post_exception(e)
+                await asyncio.sleep(1)
 
     async def watch_servers(self) -> None:
         """Watch the file server namespace for completed file servers.
@@ -398,10 +599,38 @@ class FileserverManager:
         KubernetesError
             Raised if there is some failure in a Kubernetes API call.
         """
-        fileserver = self._builder.build(user)
+        shell = self._servers[user.username].shell
+        fileserver = self._builder.build(user, shell=shell)
         self._logger.info("Creating new file server", user=user.username)
         await self._storage.create(self._config.namespace, fileserver, timeout)
 
+    async def _add_shell(self) -> None:
+        """Create a new warm pool shell and add it to the pool.
+
+        Failures are logged and reported but not raised.
+        """
+        shell = self._builder.build_shell()
+        self._pool_pending.add(shell.name)
+        timeout = Timeout(
+            "File server shell creation", self._config.creation_timeout
+        )
+        try:
+            async with timeout.enforce():
+                await self._storage.create_shell(
+                    self._config.namespace, shell, timeout
+                )
+        except Exception as e:
+            msg = "Error creating file server shell"
+            self._logger.exception(msg, name=shell.name)
+            await self._maybe_post_exception(e)
+            with contextlib.suppress(Exception):
+                await self._delete_shell(shell.name)
+        else:
+            self._logger.debug("Created file server shell", name=shell.name)
+            self._pool.append(shell.name)
+        finally:
+            self._pool_pending.discard(shell.name)
+
     async def _delete_file_server(self, username: str) -> None:
         """Delete any file server objects for the given user.
 
@@ -421,12 +650,18 @@ class FileserverManager:
         """
         name = self._builder.build_name(username)
         namespace = self._config.namespace
+        state = self._servers.get(username)
+        shell = state.shell if state else None
         timeout = Timeout(
             "File server deletion", self._config.delete_timeout, username
         )
         try:
             async with timeout.enforce():
-                await self._storage.delete(name, namespace, username, timeout)
+                await self._storage.delete(
+                    name, namespace, username, timeout, shell=shell
+                )
+            if state:
+                state.shell = None
         except Exception as e:
             msg = "Error deleting file server"
             self._logger.exception(msg, user=username)
@@ -0,0 +1,108 @@
+"""Histograms of lab spawn timing."""
+
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from datetime import timedelta
+
+from ..constants import SPAWN_HISTOGRAM_BUCKETS
+from ..models.v1.metrics import (
+    Histogram,
+    HistogramBucket,
+    SpawnMetrics,
+    SpawnPhase,
+)
+
+__all__ = ["SpawnHistogram"]
+
+
+class _Counts:
+    """Observation counts for a single histogram.
+
+    Parameters
+    ----------
+    bounds
+        Upper bounds of the buckets in seconds, in increasing order.
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, elapsed: timedelta) -> None:
+        """Record an observation.
+
+        Parameters
+        ----------
+        elapsed
+            Observed duration.
+        """
+        seconds = elapsed.total_seconds()
+        self._counts[bisect_left(self._bounds, seconds)] += 1
+        self._sum += seconds
+
+    def to_histogram(self) -> Histogram:
+        """Convert to the API model with cumulative buckets.
+
+        Returns
+        -------
+        Histogram
+            Current contents of the histogram.
+        """
+        buckets = []
+        total = 0
+        for bound, count in zip(
+            [*self._bounds, None], self._counts, strict=True
+        ):
+            total += count
+            buckets.append(HistogramBucket(le=bound, count=total))
+        return Histogram(buckets=buckets, count=total, sum=self._sum)
+
+
+class SpawnHistogram:
+    """Histograms of the total and per-phase durations of lab spawns.
+
+    Only successful spawns are recorded. The histograms are kept in memory
+    and therefore cover the time since the controller last started.
+
+    Parameters
+    ----------
+    bounds
+        Upper bounds of the buckets in seconds, in increasing order.
+    """
+
+    def __init__(
+        self, bounds: Sequence[float] = SPAWN_HISTOGRAM_BUCKETS
+    ) -> None:
+        self._bounds = sorted(bounds)
+        self._total = _Counts(self._bounds)
+        self._phases = {p: _Counts(self._bounds) for p in SpawnPhase}
+
+    def record(
+        self, elapsed: timedelta, phases: Mapping[SpawnPhase, timedelta]
+    ) -> None:
+        """Record the timing of a successful spawn.
+
+        Parameters
+        ----------
+        elapsed
+            Total duration of the spawn.
+        phases
+            Duration of each phase the spawn went through.
+        """
+        self._total.observe(elapsed)
+        for phase, phase_elapsed in phases.items():
+            self._phases[phase].observe(phase_elapsed)
+
+    def to_metrics(self) -> SpawnMetrics:
+        """Return the current contents of the histograms.
+
+        Returns
+        -------
+        SpawnMetrics
+            Histograms of total and per-phase spawn durations.
+        """
+        return SpawnMetrics(
+            total=self._total.to_histogram(),
+            phases={p: c.to_histogram() for p, c in self._phases.items()},
+        )
@@ -2,10 +2,11 @@
 
 import asyncio
 import contextlib
+import secrets
 from base64 import b64encode
-from collections.abc import AsyncIterator, Coroutine
+from collections.abc import AsyncIterator, Coroutine, Iterator
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Self
 
@@ -17,7 +18,11 @@ from structlog.stdlib import BoundLogger
 
 from ...models.images import RSPImage
 from ..config import LabConfig
-from ..constants import KUBERNETES_REQUEST_TIMEOUT
+from ..constants import (
+    KUBERNETES_REQUEST_TIMEOUT,
+    LAB_DIGEST_ANNOTATION,
+    LAB_REATTACH_INTERVAL,
+)
 from ..events import (
     ActiveLabsEvent,
     LabEvents,
@@ -39,24 +44,113 @@ from ..exceptions import (
 )
 from ..models.domain.docker import DockerReference
 from ..models.domain.gafaelfawr import GafaelfawrUser
-from ..models.domain.lab import Event, EventType, LabObjectNames
+from ..models.domain.lab import (
+    Event,
+    EventType,
+    LabJournalEntry,
+    LabObjectNames,
+    LabObjects,
+    LabSuspension,
+)
 from ..models.v1.lab import (
     LabRequestOptions,
+    LabSecretStatus,
     LabSpecification,
     LabState,
     LabStatus,
     UserGroup,
     UserInfo,
 )
+from ..models.v1.metrics import SpawnMetrics, SpawnPhase
+from ..storage.journal import LabJournal
 from ..storage.kubernetes.lab import LabStorage
 from ..storage.metadata import MetadataStorage
+from ..storage.probe import LabProbe
 from ..timeout import Timeout
+from .admission import SpawnAdmission
 from .builder.lab import LabBuilder
+from .histogram import SpawnHistogram
 from .image import ImageService
+from .secret import SecretCache
 
 __all__ = ["LabManager"]
 
 
+class _EventQueue:
+    """Queue of encoded server-sent events for a user's lab operations.
+
+    Each event is encoded into a server-sent event frame once, when it is
+    added to the queue, and every reader of the queue is sent the same
+    immutable bytes. Each frame carries an ID of the form
+    ``<generation>-<position>`` so that a reconnecting client that sends the
+    last ID it saw in the ``Last-Event-ID`` header receives only the events
+    it missed. The generation changes whenever the queue is cleared for a new
+    operation, so an ID from an earlier operation replays the current
+    operation from the start.
+    """
+
+    def __init__(self) -> None:
+        self._queue = AsyncMultiQueue[bytes]()
+        self._generation = secrets.token_hex(4)
+        self._history: list[Event] = []
+        self._serial = 0
+
+    @property
+    def history(self) -> list[Event]:
+        """Events added since the queue was last cleared."""
+        return list(self._history)
+
+    @property
+    def serial(self) -> int:
+        """Counter incremented whenever the contents of the queue change."""
+        return self._serial
+
+    def aiter_from_id(self, last_event_id: str | None) -> AsyncIterator[bytes]:
+        """Iterate over the encoded events after the given event ID.
+
+        Parameters
+        ----------
+        last_event_id
+            ID of the last event seen by the client, or `None` to start from
+            the beginning of the queue.
+
+        Returns
+        -------
+        AsyncIterator of bytes
+            Iterator over the encoded server-sent events.
+        """
+        start = 0
+        if last_event_id:
+            generation, _, position = last_event_id.partition("-")
+            if generation == self._generation and position.isdigit():
+                start = int(position) + 1
+        return self._queue.aiter_from(start)
+
+    def clear(self) -> None:
+        """Remove all events and start a new generation of event IDs."""
+        self._queue.clear()
+        self._generation = secrets.token_hex(4)
+        self._history = []
+        self._serial += 1
+
+    def close(self) -> None:
+        """Mark the end of the events for the current operation."""
+        self._queue.close()
+
+    def put(self, event: Event) -> None:
+        """Encode an event and add it to the queue.
+
+        Parameters
+        ----------
+        event
+            Event to add.
+        """
+        event_id = f"{self._generation}-{self._queue.qsize()}"
+        self._queue.put(event.to_sse(event_id).encode())
+        self._history.append(event)
+        self._serial += 1
+
+
 @dataclass
 class _State:
     """Collects all internal state for a user's lab."""
@@ -67,9 +161,18 @@ class _State:
     state: LabState | None = None
     """Current state of the lab, in the form returned by status routes."""
 
-    events: AsyncMultiQueue[Event] = field(default_factory=AsyncMultiQueue)
+    events: _EventQueue = field(default_factory=_EventQueue)
     """Events from the current or most recent lab operation."""
 
+    operation: _LabOperation | None = None
+    """Current or most recent lab operation, recorded in the journal."""
+
+    operation_started: datetime | None = None
+    """When the current or most recent lab operation started."""
+
+    journal_serial: int = 0
+    """Serial number of the event queue when it was last journaled."""
+
     last_modified: datetime = field(
         default_factory=lambda: datetime.now(tz=UTC)
     )
@@ -110,6 +213,192 @@ class _State:
         return bool(self.monitor.in_progress or self.last_modified > date)
 
 
+class _LabStore:
+    """Internal state for all user labs, indexed by lab status.
+
+    In addition to the per-user state, the store keeps a secondary index of
+    users by the status of their lab and a queue of users whose operations
+    have completed and need to be reaped, so that neither counting labs by
+    status nor reaping completed operations requires scanning every user.
+
+    To keep the index current, lab state must be replaced with `set_state`
+    and lab status must be changed with `set_status` rather than by
+    assigning to the underlying attributes.
+    """
+
+    def __init__(self) -> None:
+        self._labs: dict[str, _State] = {}
+        self._indexed: dict[str, LabStatus] = {}
+        self._by_status: dict[LabStatus, dict[str, None]] = {
+            s: {} for s in LabStatus
+        }
+        self._completed: dict[str, None] = {}
+        self._completed_event = asyncio.Event()
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._labs
+
+    def __getitem__(self, username: str) -> _State:
+        return self._labs[username]
+
+    def add(self, username: str, lab: _State) -> None:
+        """Add the state for a user who was not previously known.
+
+        Parameters
+        ----------
+        username
+            Username of the user.
+        lab
+            Internal state for that user's lab.
+        """
+        self._labs[username] = lab
+        self._reindex(username)
+
+    def clear(self) -> list[_State]:
+        """Remove all users from the store.
+
+        Returns
+        -------
+        list of _State
+            Internal state of all users that were removed.
+        """
+        labs = list(self._labs.values())
+        self._labs = {}
+        self._indexed = {}
+        self._by_status = {s: {} for s in LabStatus}
+        self._completed = {}
+        return labs
+
+    def count(self, status: LabStatus) -> int:
+        """Count the labs with a given status.
+
+        Parameters
+        ----------
+        status
+            Status of labs to count.
+
+        Returns
+        -------
+        int
+            Number of labs with that status.
+        """
+        return len(self._by_status[status])
+
+    def get(self, username: str) -> _State | None:
+        """Get the state for a user, if any.
+
+        Parameters
+        ----------
+        username
+            Username of the user.
+
+        Returns
+        -------
+        _State or None
+            Internal state for that user, or `None` if the user is not known.
+        """
+        return self._labs.get(username)
+
+    def items(self) -> list[tuple[str, _State]]:
+        """Return a snapshot of all users and their state."""
+        return list(self._labs.items())
+
+    def list_users(self, status: LabStatus | None = None) -> list[str]:
+        """List users with labs.
+
+        Parameters
+        ----------
+        status
+            If given, only list users whose labs have this status.
+
+        Returns
+        -------
+        list of str
+            Usernames of users with labs.
+        """
+        if status:
+            return list(self._by_status[status])
+        return list(self._indexed)
+
+    def mark_completed(self, username: str) -> None:
+        """Record that an operation for a user is ready to be reaped.
+
+        Parameters
+        ----------
+        username
+            Username of the user whose operation completed.
+        """
+        self._completed[username] = None
+        self._completed_event.set()
+
+    def set_state(self, username: str, state: LabState | None) -> None:
+        """Replace the lab state for a user.
+
+        Parameters
+        ----------
+        username
+            Username of the user, who must already be known.
+        state
+            New lab state, or `None` if the user no longer has a lab.
+        """
+        self._labs[username].state = state
+        self._reindex(username)
+
+    def set_status(self, state: LabState, status: LabStatus) -> None:
+        """Change the status of a lab.
+
+        Parameters
+        ----------
+        state
+            Lab state to change. This may be state that is no longer the
+            current state for that user, such as the state of a cancelled
+            spawn, in which case the index is unaffected.
+        status
+            New status.
+        """
+        state.status = status
+        self._reindex(state.user.username)
+
+    def usernames(self) -> set[str]:
+        """Return the usernames of all known users."""
+        return set(self._labs.keys())
+
+    async def wait_for_completed(self) -> list[str]:
+        """Wait for at least one operation to be ready to reap.
+
+        Returns
+        -------
+        list of str
+            Usernames of users with completed operations, in the order in
+            which the operations completed.
+        """
+        await self._completed_event.wait()
+        self._completed_event.clear()
+        completed = list(self._completed)
+        self._completed = {}
+        return completed
+
+    def _reindex(self, username: str) -> None:
+        """Update the status index for a user from their current state.
+
+        Parameters
+        ----------
+        username
+            Username of the user.
+        """
+        lab = self._labs.get(username)
+        status = lab.state.status if lab and lab.state else None
+        old_status = self._indexed.get(username)
+        if status == old_status:
+            return
+        if old_status:
+            del self._by_status[old_status][username]
+            del self._indexed[username]
+        if status:
+            self._by_status[status][username] = None
+            self._indexed[username] = status
+
+
 class _LabOperation(Enum):
     """Possible operations on a lab that could be in progress."""
 
@@ -117,6 +406,30 @@ class _LabOperation(Enum):
     DELETE = "delete"
 
 
+@dataclass
+class _SpawnMetrics:
+    """Measurements of a lab spawn reported in the spawn metrics events."""
+
+    phases: dict[SpawnPhase, timedelta] = field(default_factory=dict)
+    """Duration of each phase of the spawn that has completed."""
+
+    @contextlib.contextmanager
+    def measure(self, phase: SpawnPhase) -> Iterator[None]:
+        """Measure the duration of a phase of the spawn.
+
+        The duration is only recorded if the phase completes without an
+        exception.
+
+        Parameters
+        ----------
+        phase
+            Phase of the spawn being measured.
+        """
+        start = datetime.now(tz=UTC)
+        yield
+        self.phases[phase] = datetime.now(tz=UTC) - start
+
+
 @dataclass
 class _Operation:
     """A requested operation on a user lab."""
@@ -130,12 +443,15 @@ class _Operation:
     state: LabState
     """Lab state associated with the operation."""
 
-    events: AsyncMultiQueue[Event]
+    events: _EventQueue
     """Event queue associated with the operation."""
 
     started: datetime
     """When the operation was started."""
 
+    metrics: _SpawnMetrics = field(default_factory=_SpawnMetrics, kw_only=True)
+    """Measurements of the operation, if it is a spawn."""
+
 
 @dataclass
 class _RunningOperation(_Operation):
@@ -178,6 +494,7 @@ class _RunningOperation(_Operation):
             state=operation.state,
             events=operation.events,
             started=operation.started,
+            metrics=operation.metrics,
         )
 
 
@@ -200,6 +517,10 @@ class LabManager:
         Storage for metadata about the running controller.
     lab_storage
         Kubernetes storage layer for user labs.
+    lab_probe
+        Probe for whether a lab is responding to HTTP requests.
+    journal
+        Durable journal of lab operations, if configured.
     events
         Metrics events publishers.
     slack_client
@@ -216,6 +537,8 @@ class LabManager:
         lab_builder: LabBuilder,
         metadata_storage: MetadataStorage,
         lab_storage: LabStorage,
+        lab_probe: LabProbe,
+        journal: LabJournal | None,
         events: LabEvents,
         slack_client: SlackWebhookClient | None,
         logger: BoundLogger,
@@ -225,19 +548,33 @@ class LabManager:
         self._builder = lab_builder
         self._metadata = metadata_storage
         self._storage = lab_storage
+        self._probe = lab_probe
+        self._journal = journal
         self._events = events
         self._slack = slack_client
         self._logger = logger
 
-        # Mapping of usernames to internal lab state.
-        self._labs: dict[str, _State] = {}
-
-        # Triggered when any background thread monitoring spawn progress
-        # completes. This has to be triggered manually, so there must be a
-        # top-level exception handler for each spawner task that ensures it is
-        # set when the spawner task exits for any reason. Otherwise, the
+        # Internal lab state for each user, indexed by lab status. Spawner
+        # tasks add the user to the store's queue of completed operations
+        # when they finish. This has to be done manually, so there must be a
+        # top-level exception handler for each spawner task that ensures it
+        # is done when the spawner task exits for any reason. Otherwise, the
         # reaper task may never realize a spawner has finished and wake up.
-        self._spawner_done = asyncio.Event()
+        self._labs = _LabStore()
+
+        # Timing of successful spawns, updated by the lab monitors.
+        self._histogram = SpawnHistogram()
+
+        # Limits the number of spawns that are creating objects at once.
+        self._admission = SpawnAdmission(config.spawn_concurrency, logger)
+
+        # Secrets from which user lab secrets are built.
+        self._secrets = SecretCache(
+            config=config,
+            metadata_storage=metadata_storage,
+            lab_storage=lab_storage,
+            logger=logger,
+        )
 
     async def create_lab(
         self, user: GafaelfawrUser, spec: LabSpecification
@@ -280,11 +617,13 @@ class LabManager:
         if username not in self._labs:
             monitor = _LabMonitor(
                 username=username,
+                labs=self._labs,
                 events=self._events,
+                histogram=self._histogram,
                 slack_client=self._slack,
                 logger=self._logger,
             )
-            self._labs[username] = _State(monitor=monitor)
+            self._labs.add(username, _State(monitor=monitor))
 
         # Determine the image to use for the lab.
         image = await self._select_image(spec.options)
@@ -358,25 +697,31 @@ class LabManager:
             image=image,
             resources=resources,
         )
-        timeout = Timeout("Lab spawn", self._config.spawn_timeout, username)
-        spawner = self._spawn_lab(
+        metrics = _SpawnMetrics()
+        spawn = self._spawn_lab(
             user=user,
             state=state,
             spec=spec,
             image=image,
             events=lab.events,
-            timeout=timeout,
+            metrics=metrics,
             delete_first=delete_first,
         )
         operation = _Operation(
             operation=_LabOperation.SPAWN,
-            coro=spawner,
+            coro=spawn,
             state=state,
             events=lab.events,
             started=datetime.now(tz=UTC),
+            metrics=metrics,
         )
-        await lab.monitor.monitor(operation, timeout, self._spawner_done)
-        lab.state = state
+
+        # The spawn timeout is enforced by the spawn itself, since it starts
+        # only once the spawn has been admitted.
+        await lab.monitor.monitor(operation, None, reap=True)
+        self._labs.set_state(username, state)
+        lab.operation = _LabOperation.SPAWN
+        lab.operation_started = operation.started
 
     async def delete_lab(self, username: str) -> None:
         """Delete the lab environment for the given user.
@@ -417,9 +762,22 @@ class LabManager:
         # Also handle the currently-impossible fourth case of some other
         # operation in progress. There currently is no other operation, but
         # do something safe in case one appears in the future.
+        #
+        # If suspension is enabled, labs that were running or that exited
+        # normally are suspended rather than deleted. Failed labs and labs
+        # whose spawn was aborted are always deleted, since their objects
+        # may be incomplete. A spawn that has finished but has not yet been
+        # reaped by the background task still counts as in progress, so
+        # decide based on whether it is done rather than whether it exists.
         if lab.monitor.in_progress == _LabOperation.DELETE:
             await lab.monitor.wait()
         elif lab.monitor.in_progress in (_LabOperation.SPAWN, None):
+            suspend = (
+                self._config.suspend_timeout is not None
+                and (not lab.monitor.in_progress or lab.monitor.is_done())
+                and lab.state.status
+                in (LabStatus.RUNNING, LabStatus.TERMINATED)
+            )
             if lab.monitor.in_progress == _LabOperation.SPAWN:
                 await lab.monitor.cancel()
             lab.events.clear()
@@ -432,12 +790,19 @@ class LabManager:
 
             # Move forward with a delete operation.
             self._builder.build_object_names(username)
-            lab.state.status = LabStatus.TERMINATING
+            self._labs.set_status(lab.state, LabStatus.TERMINATING)
             lab.state.internal_url = None
             timeout = Timeout(
                 "Delete lab", self._config.delete_timeout, username
             )
-            action = self._delete_lab(username, lab.state, lab.events, timeout)
+            if suspend:
+                action = self._suspend_lab(
+                    username, lab.state, lab.events, timeout
+                )
+            else:
+                action = self._delete_lab(
+                    username, lab.state, lab.events, timeout
+                )
             operation = _Operation(
                 operation=_LabOperation.DELETE,
                 coro=action,
@@ -446,23 +811,34 @@ class LabManager:
                 started=datetime.now(tz=UTC),
             )
             await lab.monitor.monitor(operation, timeout)
+            lab.operation = _LabOperation.DELETE
+            lab.operation_started = operation.started
             await lab.monitor.wait()
             lab.last_modified = datetime.now(tz=UTC)
             if lab.state.status == LabStatus.TERMINATED:
-                lab.state = None
+                self._labs.set_state(username, None)
         else:
             raise OperationConflictError(username)
         if lab.state and lab.state.status != LabStatus.TERMINATED:
             msg = f"Deleting lab for {username} failed"
             raise LabDeletionError(msg, username)
 
-    def events_for_user(self, username: str) -> AsyncIterator[bytes]:
+    def events_for_user(
+        self, username: str, last_event_id: str | None = None
+    ) -> AsyncIterator[bytes]:
         """Construct an iterator over the events for a user.
 
+        Events are encoded when they are generated, so this only passes
+        along the stored bytes.
+
         Parameters
         ----------
         username
             Username for which to retrieve events.
+        last_event_id
+            ID of the last event the client received, from the
+            ``Last-Event-ID`` header of a reconnecting client. If given, only
+            events after that one are returned.
 
         Yields
         ------
@@ -477,11 +853,65 @@ class LabManager:
         if username not in self._labs:
             raise UnknownUserError(f"Unknown user {username}")
 
-        async def iterator() -> AsyncIterator[bytes]:
-            async for event in self._labs[username].events:
-                yield event.to_sse().encode()
+        return self._labs[username].events.aiter_from_id(last_event_id)
+
+    async def flush_journal(self) -> None:
+        """Write changed lab operation history to the journal.
+
+        Called periodically from a background task, and once more during
+        shutdown, if a journal is configured. Labs whose events have not
+        changed since the last call are skipped, and journal entries for labs
+        that no longer exist are removed.
+        """
+        if not self._journal:
+            return
+        for username, lab in list(self._labs.items()):
+            serial = lab.events.serial
+            if serial == lab.journal_serial:
+                continue
+            if lab.state and lab.operation and lab.operation_started:
+                entry = LabJournalEntry(
+                    operation=lab.operation.value,
+                    started=lab.operation_started,
+                    events=lab.events.history,
+                )
+                await self._journal.write(username, entry)
+            else:
+                await self._journal.delete(username)
+            lab.journal_serial = serial
+
+    async def refresh_secrets(self) -> None:
+        """Refresh the cached secrets used to build user lab secrets.
+
+        Called at startup and then periodically from a background task.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        await self._secrets.refresh()
+
+    def get_spawn_metrics(self) -> SpawnMetrics:
+        """Get histograms of the timing of successful lab spawns.
+
+        Returns
+        -------
+        SpawnMetrics
+            Histograms of the total and per-phase durations of all successful
+            lab spawns since the controller started.
+        """
+        return self._histogram.to_metrics()
+
+    def get_secret_status(self) -> LabSecretStatus:
+        """Get the status of the secrets used to construct lab secrets.
 
-        return iterator()
+        Returns
+        -------
+        LabSecretStatus
+            Problems with the configured secrets found by the last refresh.
+        """
+        return LabSecretStatus(problems=self._secrets.problems)
 
     async def get_lab_state(self, username: str) -> LabState | None:
         """Get lab state for a user.
@@ -528,13 +958,9 @@ class LabManager:
             Users with labs.
         """
         if only_running:
-            return [
-                u
-                for u, s in self._labs.items()
-                if s.state and s.state.status == LabStatus.RUNNING
-            ]
+            return self._labs.list_users(LabStatus.RUNNING)
         else:
-            return [u for u, s in self._labs.items() if s.state]
+            return self._labs.list_users()
 
     async def reap_spawners(self) -> None:
         """Wait for spawner tasks to complete and record their status.
@@ -553,15 +979,16 @@ class LabManager:
         Doing this properly is a bit tricky, since we have to avoid both
         busy-waiting when no operations are in progress and not reaping
         anything if one operation keeps running forever. The approach used
-        here is to have every spawn set the ``_spawner_done`` `asyncio.Event`
-        when it is complete, and use that as a trigger for doing a reaper
-        pass. Deletes do not do this since they're normally awaited by the
-        caller and thus don't need to be reaped separately.
+        here is to have every spawn add its user to the lab store's queue of
+        completed operations when it is complete, and reap only those users
+        when woken. Deletes do not do this since they're normally awaited by
+        the caller and thus don't need to be reaped separately.
         """
         while True:
-            await self._spawner_done.wait()
-            self._spawner_done.clear()
-            for username, lab in self._labs.items():
+            for username in await self._labs.wait_for_completed():
+                lab = self._labs.get(username)
+                if not lab:
+                    continue
                 if lab.monitor.in_progress and lab.monitor.is_done():
                     try:
                         await lab.monitor.wait()
@@ -581,7 +1008,8 @@ class LabManager:
                         self._logger.exception(msg, user=username)
                         await self._maybe_post_exception(e, username)
                         if lab.state:
-                            lab.state.status = LabStatus.FAILED
+                            status = LabStatus.FAILED
+                            self._labs.set_status(lab.state, status)
 
     async def reconcile(self) -> None:
         """Reconcile user lab state with Kubernetes.
@@ -612,28 +1040,42 @@ class LabManager:
 
         # Second pass: take observed state and create any missing internal
         # state. This is the normal case after a restart of the lab
-        # controller.
-        for username in set(observed.keys()) - set(self._labs.keys()):
+        # controller, in which case the journal, if configured, has the
+        # history of any spawns that were in progress.
+        missing = set(observed.keys()) - self._labs.usernames()
+        journal: dict[str, LabJournalEntry] = {}
+        if missing and self._journal:
+            journal = await self._journal.read_all()
+        history: dict[str, LabJournalEntry] = {}
+        for username in missing:
             msg = f"Creating record for user {username} from Kubernetes"
             self._logger.info(msg, user=username)
-            self._labs[username] = _State(
-                state=observed[username],
-                monitor=_LabMonitor(
-                    username=username,
-                    events=self._events,
-                    slack_client=self._slack,
-                    logger=self._logger,
-                ),
+            monitor = _LabMonitor(
+                username=username,
+                labs=self._labs,
+                events=self._events,
+                histogram=self._histogram,
+                slack_client=self._slack,
+                logger=self._logger,
             )
+            lab = _State(state=observed[username], monitor=monitor)
+            self._labs.add(username, lab)
             if observed[username].status == LabStatus.PENDING:
                 to_monitor.add(username)
+                entry = journal.get(username)
+                if entry and entry.operation == _LabOperation.SPAWN.value:
+                    history[username] = entry
 
         # If we discovered any pods unexpectedly in the pending state, kick
         # off monitoring jobs to wait for them to become ready and handle
         # timeouts if they never do. We've now fixed internal state, so it's
-        # safe to do asyncio operations again.
-        for username in sorted(to_monitor):
-            await self._monitor_pending_spawn(username)
+        # safe to do asyncio operations again. Stagger the start of the
+        # watches so that a restart with many pending spawns doesn't open all
+        # of them at once.
+        for i, username in enumerate(sorted(to_monitor)):
+            delay = LAB_REATTACH_INTERVAL * i
+            entry = history.get(username)
+            await self._monitor_pending_spawn(username, entry, delay)
 
         # For all labs in failed or terminated state (spawn failed, killed by
         # the idle culler, killed by the OOM killer, etc.), clean up the lab
@@ -642,18 +1084,13 @@ class LabManager:
         await self._delete_completed_labs()
 
         # Finally, count the active labs and log a metric.
-        count = 0
-        for state in self._labs.values():
-            if state.state and state.state.status == LabStatus.RUNNING:
-                count += 1
+        count = self._labs.count(LabStatus.RUNNING)
         await self._events.active.publish(ActiveLabsEvent(count=count))
 
     async def stop_monitor_tasks(self) -> None:
         """Stop any tasks that are waiting for labs to spawn."""
         self._logger.info("Stopping spawning monitor tasks")
-        labs = self._labs
-        self._labs = {}
-        for state in labs.values():
+        for state in self._labs.clear():
             await state.monitor.cancel()
 
     def _check_quota(self, user: GafaelfawrUser) -> None:
@@ -678,7 +1115,7 @@ class LabManager:
         self,
         username: str,
         state: LabState,
-        events: AsyncMultiQueue[Event],
+        events: _EventQueue,
         timeout: Timeout,
         *,
         start_progress: int = 25,
@@ -725,7 +1162,7 @@ class LabManager:
         progress = end_progress
         msg = f"Lab for {username} deleted"
         events.put(Event(type=EventType.INFO, message=msg, progress=progress))
-        state.status = LabStatus.TERMINATED
+        self._labs.set_status(state, LabStatus.TERMINATED)
 
     async def _delete_completed_labs(self) -> None:
         """Delete all labs that have stopped running.
@@ -735,8 +1172,10 @@ class LabManager:
         state are no longer running and should be garbage-collected, as long
         as the user hasn't already started a new operation on that lab.
         """
-        all_labs = list(self._labs.items())
-        for username, lab in all_labs:
+        failed = self._labs.list_users(LabStatus.FAILED)
+        terminated = self._labs.list_users(LabStatus.TERMINATED)
+        for username in failed + terminated:
+            lab = self._labs[username]
             if lab.state and not lab.state.is_running:
                 if not lab.monitor.in_progress:
                     with contextlib.suppress(UnknownUserError):
@@ -784,7 +1223,16 @@ class LabManager:
             if state:
                 observed[username] = state
             elif not lab or not lab.modified_since(cutoff):
-                msg = "Deleting incomplete namespace"
+                # Suspended labs have no pod but are left alone until they
+                # expire.
+                lifetime = self._config.suspend_timeout
+                suspension = await self._read_suspension(names)
+                if suspension and lifetime:
+                    if suspension.suspended + lifetime > cutoff:
+                        continue
+                    msg = "Deleting expired suspended lab"
+                else:
+                    msg = "Deleting incomplete namespace"
                 self._logger.warning(msg, user=username, namespace=namespace)
                 timeout = Timeout(msg, self._config.delete_timeout)
                 await self._storage.delete_namespace(namespace, timeout)
@@ -819,19 +1267,25 @@ class LabManager:
             Raised if a secret does not exist.
         """
         secret_names = {s.secret_name for s in self._config.secrets}
-        namespace = self._metadata.namespace
         secrets = {
-            n: await self._storage.read_secret(n, namespace, timeout)
+            n: await self._secrets.get(n, timeout)
             for n in sorted(secret_names)
         }
 
-        # Now, construct the data for the user's lab secret.
+        # Now, construct the data for the user's lab secret. If a key is
+        # missing, the cached secret may predate the addition of that key, so
+        # read the secret again before giving up.
         data = {}
+        reloaded = set()
         for spec in self._config.secrets:
+            name = spec.secret_name
             key = spec.secret_key
-            if key not in secrets[spec.secret_name].data:
+            if key not in (secrets[name].data or {}) and name not in reloaded:
+                secrets[name] = await self._secrets.reload(name, timeout)
+                reloaded.add(name)
+            if key not in (secrets[name].data or {}):
                 namespace = self._metadata.namespace
-                raise MissingSecretError(spec.secret_name, namespace, key)
+                raise MissingSecretError(name, namespace, key)
             if key in data:
                 # Conflict with another secret. Should be impossible since the
                 # validator on our configuration enforces no conflicts.
@@ -915,9 +1369,9 @@ class LabManager:
         # to terminated or failed if we thought the pod was running but it's
         # in some other state. Otherwise, go with our current state.
         if phase is None:
-            state.status = LabStatus.FAILED
+            self._labs.set_status(state, LabStatus.FAILED)
         elif state.status == LabStatus.RUNNING:
-            state.status = LabStatus.from_phase(phase)
+            self._labs.set_status(state, LabStatus.from_phase(phase))
         return state
 
     async def _maybe_post_exception(
@@ -939,7 +1393,12 @@ class LabManager:
             exc.user = username
         await report_exception(exc, self._slack)
 
-    async def _monitor_pending_spawn(self, username: str) -> None:
+    async def _monitor_pending_spawn(
+        self,
+        username: str,
+        entry: LabJournalEntry | None = None,
+        delay: timedelta = timedelta(0),
+    ) -> None:
         """Watch pending spawns of labs for the provided users.
 
         This is called by the reconciliation task to monitor in-progress lab
@@ -953,6 +1412,11 @@ class LabManager:
             Username whose lab spawn should be monitored. If we're already
             monitoring them or if the lab state does not exist, silently do
             nothing.
+        entry
+            Journal entry for the spawn, if one was found. Its events are
+            restored to the event stream before monitoring resumes.
+        delay
+            How long to wait before starting to watch the spawn.
         """
         lab = self._labs[username]
         if lab.monitor.in_progress:
@@ -960,26 +1424,76 @@ class LabManager:
         if not lab.state:
             return
         lab.events.clear()
-        msg = f"Monitoring in-progress lab creation for {username}"
-        lab.events.put(Event(type=EventType.INFO, message=msg, progress=1))
+        progress = 1
+        if entry:
+            for event in entry.events:
+                lab.events.put(event)
+                progress = event.progress or progress
+            msg = f"Resuming monitoring of lab creation for {username}"
+        else:
+            msg = f"Monitoring in-progress lab creation for {username}"
+        event = Event(type=EventType.INFO, message=msg, progress=progress)
+        lab.events.put(event)
         self._logger.info(msg, user=username)
-        timeout = Timeout(
-            "In-progress lab spawn", self._config.spawn_timeout, username
+
+        # The timeout starts now, but the watch doesn't start until after the
+        # delay, so extend the timeout by the delay so that staggered watches
+        # get the full spawn timeout.
+        spawn_timeout = self._config.spawn_timeout + delay
+        timeout = Timeout("In-progress lab spawn", spawn_timeout, username)
+        metrics = _SpawnMetrics()
+        watcher = self._watch_lab_spawn(
+            lab.state, lab.events, metrics, timeout, delay=delay
         )
-        watcher = self._watch_lab_spawn(lab.state, lab.events, timeout)
         operation = _Operation(
             operation=_LabOperation.SPAWN,
             coro=watcher,
             state=lab.state,
             events=lab.events,
             started=datetime.now(tz=UTC),
+            metrics=metrics,
         )
 
         # If we raced with some other operation that got there first, they
         # will probably be a delete or spawn with richer context, so we should
         # silently let them win.
         with contextlib.suppress(OperationConflictError):
-            await lab.monitor.monitor(operation, timeout, self._spawner_done)
+            await lab.monitor.monitor(operation, timeout, reap=True)
+            lab.operation = _LabOperation.SPAWN
+            if entry:
+                lab.operation_started = entry.started
+            else:
+                lab.operation_started = operation.started
+
+    async def _read_suspension(
+        self, names: LabObjectNames
+    ) -> LabSuspension | None:
+        """Read the record of a suspended lab, if any.
+
+        Parameters
+        ----------
+        names
+            Names of the user's lab objects.
+
+        Returns
+        -------
+        LabSuspension or None
+            Record of the suspended lab, or `None` if suspension is disabled
+            or the lab is not suspended.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        if not self._config.suspend_timeout:
+            return None
+        username = names.username
+        timeout = Timeout("Read suspension", KUBERNETES_REQUEST_TIMEOUT)
+        config_map = await self._storage.read_suspension(names, timeout)
+        if not config_map:
+            return None
+        return self._builder.recreate_suspension(username, config_map)
 
     def _reconcile_known_users(
         self, observed: dict[str, LabState], cutoff: datetime
@@ -1023,7 +1537,7 @@ class LabManager:
             if username not in observed:
                 msg = f"Expected user {username} not found in Kubernetes"
                 self._logger.warning(msg, user=username)
-                lab.state.status = LabStatus.FAILED
+                self._labs.set_status(lab.state, LabStatus.FAILED)
             else:
                 observed_state = observed[username]
                 if observed_state.status == lab.state.status:
@@ -1036,7 +1550,7 @@ class LabManager:
                     f" status is {observed_state.status}"
                 )
                 self._logger.warning(msg, user=username)
-                lab.state.status = observed_state.status
+                self._labs.set_status(lab.state, observed_state.status)
 
                 # If we discovered the pod was actually in pending state,
                 # kick off a monitoring job to wait for it to become ready
@@ -1045,6 +1559,51 @@ class LabManager:
                     to_monitor.add(username)
         return to_monitor
 
+    async def _resume_lab(
+        self, username: str, objects: LabObjects, timeout: Timeout
+    ) -> bool:
+        """Resume a suspended lab if possible.
+
+        If the user has a suspended lab and its objects match the ones that
+        would be created for the new spawn, create only the objects that were
+        deleted on suspend. If the user has a suspended lab that doesn't
+        match, delete it so that the lab can be created from scratch.
+
+        Parameters
+        ----------
+        username
+            User whose lab is being spawned.
+        objects
+            Kubernetes objects for the new lab.
+        timeout
+            Timeout for the lab spawn.
+
+        Returns
+        -------
+        bool
+            `True` if a suspended lab was resumed, `False` if the lab must be
+            created from scratch.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        logger = self._logger.bind(user=username)
+        names = self._builder.build_object_names(username)
+        config_map = await self._storage.read_suspension(names, timeout)
+        if not config_map:
+            return False
+        suspension = self._builder.recreate_suspension(username, config_map)
+        digest = objects.namespace.metadata.annotations[LAB_DIGEST_ANNOTATION]
+        if suspension and suspension.digest == digest:
+            logger.info("Resuming suspended lab")
+            await self._storage.resume(names, objects, timeout)
+            return True
+        logger.info("Deleting incompatible suspended lab")
+        await self._storage.delete_namespace(names.namespace, timeout)
+        return False
+
     async def _select_image(self, options: LabRequestOptions) -> RSPImage:
         """Determine the image to spawn.
 
@@ -1077,16 +1636,96 @@ class LabManager:
         state: LabState,
         spec: LabSpecification,
         image: RSPImage,
-        events: AsyncMultiQueue[Event],
-        timeout: Timeout,
+        events: _EventQueue,
+        metrics: _SpawnMetrics,
         delete_first: bool = False,
     ) -> None:
         """Do the actual work of spawning a user's lab.
 
-        Runs as a background task and is monitored by a `_LabMonitor`.
+        Runs as a background task and is monitored by a `_LabMonitor`. If the
+        number of concurrent spawns is limited, the spawn first waits in a
+        queue until it is admitted, reporting its position in the queue via
+        the event stream. The admission slot is held only while the
+        Kubernetes objects for the lab are being created, and the spawn
+        timeout starts when the spawn is admitted.
+
+        Parameters
+        ----------
+        user
+            User for whom the lab is being spawned.
+        state
+            Initial state of the lab, which includes the user and the lab
+            request.
+        spec
+            Specification for lab to spawn.
+        image
+            Image to use for the lab.
+        events
+            Event queue to which to post spawn events.
+        metrics
+            Measurements of the spawn, updated as it progresses.
+        delete_first
+            Whether to delete any existing lab first.
+
+        Raises
+        ------
+        ControllerTimeoutError
+            Raised if the spawn did not complete within the spawn timeout.
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        MissingSecretError
+            Raised if one of the secrets required for spawning the lab is
+            missing.
+        """
+        username = state.user.username
+
+        def report_position(position: int) -> None:
+            msg = f"Waiting for other labs to start (#{position} in line)"
+            events.put(Event(type=EventType.INFO, message=msg, progress=1))
+
+        start = datetime.now(tz=UTC)
+        async with self._admission.admit(report_position):
+            if self._config.spawn_concurrency:
+                queued = datetime.now(tz=UTC) - start
+                metrics.phases[SpawnPhase.QUEUE] = queued
+            spawn_timeout = self._config.spawn_timeout
+            timeout = Timeout("Lab spawn", spawn_timeout, username)
+            async with timeout.enforce():
+                await self._create_lab_objects(
+                    user=user,
+                    state=state,
+                    spec=spec,
+                    image=image,
+                    events=events,
+                    metrics=metrics,
+                    timeout=timeout,
+                    delete_first=delete_first,
+                )
+
+        # Monitor for lab events while waiting for the pod to start. This does
+        # not put load on the Kubernetes API server, so other spawns may be
+        # admitted while it runs.
+        async with timeout.enforce():
+            await self._watch_lab_spawn(state, events, metrics, timeout)
+
+    async def _create_lab_objects(
+        self,
+        *,
+        user: GafaelfawrUser,
+        state: LabState,
+        spec: LabSpecification,
+        image: RSPImage,
+        events: _EventQueue,
+        metrics: _SpawnMetrics,
+        timeout: Timeout,
+        delete_first: bool,
+    ) -> None:
+        """Create or resume the Kubernetes objects for a user's lab.
 
         Parameters
         ----------
+        user
+            User for whom the lab is being spawned.
         state
             Initial state of the lab, which includes the user and the lab
             request.
@@ -1096,6 +1735,8 @@ class LabManager:
             Image to use for the lab.
         events
             Event queue to which to post spawn events.
+        metrics
+            Measurements of the spawn, updated as it progresses.
         timeout
             Timeout for the lab spawn.
         delete_first
@@ -1119,58 +1760,120 @@ class LabManager:
             self._logger.info("Deleting existing failed lab")
             msg = f"Deleting existing failed lab for {username}"
             events.put(Event(type=EventType.INFO, message=msg, progress=2))
-            await self._delete_lab(
-                username,
-                state,
-                events,
-                timeout,
-                start_progress=5,
-                end_progress=20,
-            )
+            with metrics.measure(SpawnPhase.DELETE):
+                await self._delete_lab(
+                    username,
+                    state,
+                    events,
+                    timeout,
+                    start_progress=5,
+                    end_progress=20,
+                )
             logger.info("Lab deleted")
 
         # Retrieve the secrets that will be used to construct the lab secret.
         logger.info("Retrieving secret data for lab")
         pull_secret = None
         try:
-            secret_data = await self._gather_secret_data(user, timeout)
-            if self._config.pull_secret:
-                name = self._config.pull_secret
-                namespace = self._metadata.namespace
-                pull_secret = await self._storage.read_secret(
-                    name, namespace, timeout
-                )
+            with metrics.measure(SpawnPhase.SECRETS):
+                secret_data = await self._gather_secret_data(user, timeout)
+                if self._config.pull_secret:
+                    name = self._config.pull_secret
+                    pull_secret = await self._secrets.get(name, timeout)
         except MissingSecretError as e:
             e.user = username
             raise
 
         # Build the objects that make up the user's lab.
-        state.status = LabStatus.PENDING
-        objects = await self._builder.build_lab(
-            user=user,
-            lab=spec,
-            image=image,
-            secrets=secret_data,
-            pull_secret=pull_secret,
-        )
-        internal_url = self._builder.build_internal_url(username, spec.env)
-        logger.info("Creating new lab")
-        await self._storage.create(objects, timeout)
+        self._labs.set_status(state, LabStatus.PENDING)
+        with metrics.measure(SpawnPhase.CREATE):
+            objects = await self._builder.build_lab(
+                user=user,
+                lab=spec,
+                image=image,
+                secrets=secret_data,
+                pull_secret=pull_secret,
+            )
+            internal_url = self._builder.build_internal_url(username, spec.env)
+            resumed = False
+            if self._config.suspend_timeout and not delete_first:
+                resumed = await self._resume_lab(username, objects, timeout)
+            if not resumed:
+                logger.info("Creating new lab")
+                start = datetime.now(tz=UTC)
+                await self._storage.create(objects, timeout)
+                self._admission.record_latency(datetime.now(tz=UTC) - start)
         msg = "Created Kubernetes objects for user lab"
         events.put(Event(type=EventType.INFO, message=msg, progress=30))
         state.internal_url = internal_url
 
-        # Monitor for lab events while waiting for the pod to start.
-        await self._watch_lab_spawn(state, events, timeout)
+    async def _suspend_lab(
+        self,
+        username: str,
+        state: LabState,
+        events: _EventQueue,
+        timeout: Timeout,
+    ) -> None:
+        """Suspend the user's lab, keeping its namespace for reuse.
+
+        Falls back on deleting the lab if it was created before suspension
+        was enabled and therefore cannot be resumed.
+
+        Parameters
+        ----------
+        username
+            Username of user whose lab should be suspended.
+        state
+            Lab state.
+        events
+            Event queue to update with progress.
+        timeout
+            Timeout on operation.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        names = self._builder.build_object_names(username)
+        namespace = await self._storage.read_namespace(
+            names.namespace, timeout
+        )
+        marker = None
+        if namespace:
+            marker = self._builder.build_suspension(username, namespace)
+        if not marker:
+            await self._delete_lab(username, state, events, timeout)
+            return
+
+        msg = "Shutting down Kubernetes pod"
+        events.put(Event(type=EventType.INFO, message=msg, progress=25))
+        await self._storage.suspend(names, marker, timeout)
+
+        self._logger.info("Lab suspended", user=username)
+        msg = f"Lab for {username} suspended"
+        events.put(Event(type=EventType.INFO, message=msg, progress=100))
+        self._labs.set_status(state, LabStatus.TERMINATED)
 
     async def _watch_lab_spawn(
-        self, state: LabState, events: AsyncMultiQueue[Event], timeout: Timeout
+        self,
+        state: LabState,
+        events: _EventQueue,
+        metrics: _SpawnMetrics,
+        timeout: Timeout,
+        *,
+        delay: timedelta = timedelta(0),
     ) -> None:
         """Wait for a lab spawn to complete, reflecting Kubernetes events.
 
         This is normally run as the last action of `_spawn_lab`, but may be
         run as a separate operation after state reconciliation when finding a
-        lab that is fully created and waiting for the pod to start.
+        lab that is fully created and waiting for the pod to start. If
+        readiness probing is enabled, the spawn is not complete until the lab
+        responds to HTTP requests.
+
+        The time until the pod starts is divided between scheduling, image
+        pulls, and pod startup using the Kubernetes events for the pod.
 
         Parameters
         ----------
@@ -1179,27 +1882,53 @@ class LabManager:
             request.
         events
             Event queue to which to post spawn events.
+        metrics
+            Measurements of the spawn, updated as it progresses.
         timeout
             Timeout for the lab spawn.
+        delay
+            How long to wait before starting to watch, used to stagger
+            resumed monitoring of many spawns after a restart.
 
         Raises
         ------
         KubernetesError
             Raised if there is some failure in a Kubernetes API call.
         """
+        if delay:
+            await asyncio.sleep(delay.total_seconds())
         username = state.user.username
         names = self._builder.build_object_names(username)
         name = names.pod
         namespace = names.namespace
+        start = datetime.now(tz=UTC)
         try:
-            watcher = self._watch_spawn_events(names, events, timeout)
+            watcher = self._watch_spawn_events(names, events, metrics, timeout)
             watch_task = asyncio.create_task(watcher)
             await self._storage.wait_for_pod_start(name, namespace, timeout)
         finally:
             watch_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await watch_task
-        state.status = LabStatus.RUNNING
+
+        # Whatever time was not spent scheduling or pulling images was spent
+        # starting the pod.
+        elapsed = datetime.now(tz=UTC) - start
+        for phase in (SpawnPhase.SCHEDULE, SpawnPhase.PULL):
+            elapsed -= metrics.phases.get(phase, timedelta(0))
+        metrics.phases[SpawnPhase.START] = max(elapsed, timedelta(0))
+
+        if self._config.readiness_probe and state.internal_url:
+            msg = f"Lab Kubernetes pod started for {username}, waiting for lab"
+            events.put(Event(type=EventType.INFO, message=msg, progress=80))
+            with metrics.measure(SpawnPhase.READY):
+                await self._probe.wait_for_ready(state.internal_url, timeout)
+            self._logger.info(
+                "Lab responding",
+                user=username,
+                elapsed=metrics.phases[SpawnPhase.READY].total_seconds(),
+            )
+        self._labs.set_status(state, LabStatus.RUNNING)
         self._logger.info("Lab created", user=username)
         msg = f"Lab Kubernetes pod started for {username}"
         events.put(Event(type=EventType.COMPLETE, message=msg))
@@ -1207,7 +1936,8 @@ class LabManager:
     async def _watch_spawn_events(
         self,
         names: LabObjectNames,
-        events: AsyncMultiQueue[Event],
+        events: _EventQueue,
+        metrics: _SpawnMetrics,
         timeout: Timeout,
     ) -> None:
         """Monitor Kubernetes events for a pod.
@@ -1218,6 +1948,9 @@ class LabManager:
         between 35% and 75%. The last 25% is reserved for waiting for the lab
         to respond, which is done internally by JupyterHub.
 
+        The reasons attached to the events are used to measure how long the
+        pod took to be scheduled and how long image pulls took.
+
         Watching spawn events is not critical to spawning a lab, so if the
         event watcher fails for any reason, report that error but then swallow
         it and allow the lab to still successfully spawn.
@@ -1228,6 +1961,9 @@ class LabManager:
             Names of the lab objects.
         events
             Event queue to which to report events.
+        metrics
+            Measurements of the spawn, updated with the scheduling and image
+            pull times.
         timeout
             Timeout for the lab spawn.
         """
@@ -1236,13 +1972,28 @@ class LabManager:
         logger = self._logger.bind(user=names.username)
         iterator = self._storage.watch_pod_events(name, namespace, timeout)
         progress = 35
+        start = datetime.now(tz=UTC)
+        pull_start = None
         try:
-            async for msg in iterator:
+            async for event in iterator:
+                msg = event.message
                 events.put(
                     Event(type=EventType.INFO, message=msg, progress=progress)
                 )
                 logger.debug(f"Spawning event: {msg}", progress=progress)
 
+                # Kubernetes pulls images one at a time, so the image pull
+                # phase runs from the first pull starting to the last one
+                # finishing.
+                now = datetime.now(tz=UTC)
+                match event.reason:
+                    case "Scheduled":
+                        metrics.phases[SpawnPhase.SCHEDULE] = now - start
+                    case "Pulling" if not pull_start:
+                        pull_start = now
+                    case "Pulled" if pull_start:
+                        metrics.phases[SpawnPhase.PULL] = now - pull_start
+
                 # We don't know how many startup events we'll see, so we will
                 # do the same thing Kubespawner does and move one-third closer
                 # to 75% each time.
@@ -1274,8 +2025,13 @@ class _LabMonitor:
     ----------
     username
         Username for whom we're monitoring actions.
+    labs
+        Store of internal lab state, used to update lab status and to queue
+        completed operations for reaping.
     events
         Metrics events publishers.
+    histogram
+        Histograms of spawn timing, updated after each successful spawn.
     slack_client
         Optional Slack webhook client for alerts.
     logger
@@ -1286,12 +2042,16 @@ class _LabMonitor:
         self,
         *,
         username: str,
+        labs: _LabStore,
         events: LabEvents,
+        histogram: SpawnHistogram,
         slack_client: SlackWebhookClient | None,
         logger: BoundLogger,
     ) -> None:
         self._username = username
+        self._labs = labs
         self._events = events
+        self._histogram = histogram
         self._slack = slack_client
         self._logger = logger.bind(user=username)
 
@@ -1358,8 +2118,9 @@ class _LabMonitor:
     async def monitor(
         self,
         operation: _Operation,
-        timeout: Timeout,
-        done_event: asyncio.Event | None = None,
+        timeout: Timeout | None,
+        *,
+        reap: bool = False,
     ) -> None:
         """Monitor a lab operation until it completes, fails, or times out.
 
@@ -1368,10 +2129,11 @@ class _LabMonitor:
         operation
             Operation to monitor.
         timeout
-            Timeout for operation.
-        done_event
-            If provided, additional event to notify when the operation is
-            complete.
+            Timeout for operation, or `None` if the operation enforces its
+            own timeout.
+        reap
+            If `True`, queue the operation to be reaped by the lab manager
+            when it is complete.
 
         Raises
         ------
@@ -1388,7 +2150,7 @@ class _LabMonitor:
                 operation.coro.close()
                 raise OperationConflictError(self._username)
             operation.started = datetime.now(tz=UTC)
-            monitor = self._monitor_operation(operation, timeout, done_event)
+            monitor = self._monitor_operation(operation, timeout, reap=reap)
             self._operation = _RunningOperation.start(operation, monitor)
 
     async def wait(self) -> None:
@@ -1449,10 +2211,7 @@ class _LabMonitor:
         await report_exception(exc, self._slack)
 
     async def _monitor_operation(
-        self,
-        operation: _Operation,
-        timeout: Timeout,
-        done_event: asyncio.Event | None,
+        self, operation: _Operation, timeout: Timeout | None, *, reap: bool
     ) -> None:
         """Monitor an operation on a lab.
 
@@ -1461,12 +2220,14 @@ class _LabMonitor:
         operation
             Operation to monitor.
         timeout
-            Timeout for operation.
-        done_event
-            If provided, event to notify when the spawn is complete.
+            Timeout for operation, or `None` if the operation enforces its
+            own timeout.
+        reap
+            Whether to queue the operation to be reaped when it is complete.
         """
+        enforce = timeout.enforce() if timeout else contextlib.nullcontext()
         try:
-            async with timeout.enforce():
+            async with enforce:
                 await operation.coro
         except Exception as e:
             msg = f"Lab {operation.operation.value} failed"
@@ -1474,7 +2235,7 @@ class _LabMonitor:
             await self._maybe_post_exception(e)
             operation.events.put(Event(type=EventType.ERROR, message=str(e)))
             operation.events.put(Event(type=EventType.FAILED, message=msg))
-            operation.state.status = LabStatus.FAILED
+            self._labs.set_status(operation.state, LabStatus.FAILED)
             if operation.operation == _LabOperation.SPAWN:
                 elapsed = datetime.now(tz=UTC) - operation.started
                 failure_event = SpawnFailureEvent(
@@ -1490,6 +2251,8 @@ class _LabMonitor:
         else:
             if operation.operation == _LabOperation.SPAWN:
                 elapsed = datetime.now(tz=UTC) - operation.started
+                phases = operation.metrics.phases
+                self._histogram.record(elapsed, phases)
                 success_event = SpawnSuccessEvent(
                     username=self._username,
                     image=operation.state.options.image,
@@ -1498,11 +2261,19 @@ class _LabMonitor:
                     memory_limit=operation.state.resources.limits.memory,
                     memory_request=operation.state.resources.requests.memory,
                     elapsed=elapsed,
+                    queue_elapsed=phases.get(SpawnPhase.QUEUE),
+                    delete_elapsed=phases.get(SpawnPhase.DELETE),
+                    secrets_elapsed=phases.get(SpawnPhase.SECRETS),
+                    create_elapsed=phases.get(SpawnPhase.CREATE),
+                    schedule_elapsed=phases.get(SpawnPhase.SCHEDULE),
+                    pull_elapsed=phases.get(SpawnPhase.PULL),
+                    start_elapsed=phases.get(SpawnPhase.START),
+                    ready_elapsed=phases.get(SpawnPhase.READY),
                 )
                 await self._events.spawn_success.publish(success_event)
         finally:
             operation.events.close()
             if self._operation:
                 self._operation.complete.set()
-            if done_event:
-                done_event.set()
+            if reap:
+                self._labs.mark_completed(self._username)
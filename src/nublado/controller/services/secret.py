@@ -0,0 +1,160 @@
+"""Cache of the secrets used to construct user lab secrets."""
+
+from kubernetes_asyncio.client import V1Secret
+from structlog.stdlib import BoundLogger
+
+from ..config import LabConfig
+from ..constants import KUBERNETES_REQUEST_TIMEOUT
+from ..exceptions import MissingSecretError
+from ..storage.kubernetes.lab import LabStorage
+from ..storage.metadata import MetadataStorage
+from ..timeout import Timeout
+
+__all__ = ["SecretCache"]
+
+
+class SecretCache:
+    """Cache of the secrets used to construct user lab secrets.
+
+    Every lab spawn needs the secrets listed in the lab configuration, plus
+    the pull secret if one is configured, all of which live in the namespace
+    of the lab controller and change rarely. Rather than reading them from
+    Kubernetes for every spawn, they are read once at startup and then
+    periodically refreshed in the background.
+
+    Each refresh also checks the secrets against the lab configuration and
+    records and logs an error for any that are missing or lack a configured
+    key, so that configuration problems are visible, both in the logs and
+    through the ``problems`` property, before a user tries to spawn a lab.
+
+    Parameters
+    ----------
+    config
+        Lab configuration.
+    metadata_storage
+        Storage for metadata about the running controller.
+    lab_storage
+        Kubernetes storage layer for user labs.
+    logger
+        Logger to use.
+    """
+
+    def __init__(
+        self,
+        *,
+        config: LabConfig,
+        metadata_storage: MetadataStorage,
+        lab_storage: LabStorage,
+        logger: BoundLogger,
+    ) -> None:
+        self._config = config
+        self._metadata = metadata_storage
+        self._storage = lab_storage
+        self._logger = logger
+
+        self._secrets: dict[str, V1Secret] = {}
+        self._problems: list[str] = []
+
+    @property
+    def problems(self) -> list[str]:
+        """Problems with the configured secrets found by the last refresh."""
+        return list(self._problems)
+
+    async def get(self, name: str, timeout: Timeout) -> V1Secret:
+        """Get a secret from the namespace of the lab controller.
+
+        If the secret is not cached, such as when it was created since the
+        last refresh, it is read from Kubernetes and added to the cache.
+
+        Parameters
+        ----------
+        name
+            Name of the secret.
+        timeout
+            Timeout on operation if the secret has to be read.
+
+        Returns
+        -------
+        kubernetes_asyncio.client.models.V1Secret
+            Secret object.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        MissingSecretError
+            Raised if the secret does not exist.
+        """
+        secret = self._secrets.get(name)
+        if not secret:
+            secret = await self.reload(name, timeout)
+        return secret
+
+    async def reload(self, name: str, timeout: Timeout) -> V1Secret:
+        """Read a secret from Kubernetes again, replacing the cached copy.
+
+        Used when a cached secret is missing a key that the caller needs,
+        since the key may have been added since the last refresh.
+
+        Parameters
+        ----------
+        name
+            Name of the secret.
+        timeout
+            Timeout on operation.
+
+        Returns
+        -------
+        kubernetes_asyncio.client.models.V1Secret
+            Secret object.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        MissingSecretError
+            Raised if the secret does not exist.
+        """
+        namespace = self._metadata.namespace
+        secret = await self._storage.read_secret(name, namespace, timeout)
+        self._secrets[name] = secret
+        return secret
+
+    async def refresh(self) -> None:
+        """Read all configured secrets and check them against the config.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        names = {s.secret_name for s in self._config.secrets}
+        if self._config.pull_secret:
+            names.add(self._config.pull_secret)
+        namespace = self._metadata.namespace
+        timeout = Timeout("Read lab secrets", KUBERNETES_REQUEST_TIMEOUT)
+        secrets = {}
+        problems = []
+        for name in sorted(names):
+            try:
+                secret = await self._storage.read_secret(
+                    name, namespace, timeout
+                )
+            except MissingSecretError as e:
+                problems.append(str(e))
+                continue
+            secrets[name] = secret
+        for spec in self._config.secrets:
+            found = secrets.get(spec.secret_name)
+            if found and spec.secret_key not in (found.data or {}):
+                name = spec.secret_name
+                error = MissingSecretError(name, namespace, spec.secret_key)
+                problems.append(str(error))
+
+        self._secrets = secrets
+        self._problems = problems
+        for problem in problems:
+            self._logger.error(
+                "Invalid lab secret configuration", error=problem
+            )
+        self._logger.debug("Refreshed lab secrets", count=len(secrets))
@@ -0,0 +1,100 @@
+"""Storage layer for the durable journal of lab operations."""
+
+import asyncio
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from ..models.domain.lab import LabJournalEntry
+
+__all__ = ["LabJournal"]
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS lab_journal (
+        username TEXT PRIMARY KEY,
+        entry TEXT NOT NULL
+    )
+"""
+
+
+class LabJournal:
+    """Durable journal of the most recent operation on each user's lab.
+
+    The lab controller otherwise keeps all lab state in memory and recreates
+    it from Kubernetes on restart, which loses the event history of any
+    operation that was in progress. This storage layer records that history
+    in a SQLite database, normally on a persistent volume, so that it can be
+    restored after a restart.
+
+    SQLite calls are blocking, so each call is run in a separate thread.
+    Entries are small and written infrequently, so a new connection is opened
+    for each call rather than managing a long-lived connection.
+
+    Parameters
+    ----------
+    path
+        Path to the SQLite database, which is created if it does not exist.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    async def delete(self, username: str) -> None:
+        """Delete the journal entry for a user.
+
+        Parameters
+        ----------
+        username
+            Username whose entry should be deleted. Does nothing if there is
+            no entry for that user.
+        """
+        sql = "DELETE FROM lab_journal WHERE username = ?"
+        await asyncio.to_thread(self._execute, sql, (username,))
+
+    async def read_all(self) -> dict[str, LabJournalEntry]:
+        """Read all journal entries.
+
+        Returns
+        -------
+        dict of LabJournalEntry
+            Journal entries by username.
+        """
+        sql = "SELECT username, entry FROM lab_journal"
+        rows = await asyncio.to_thread(self._execute, sql, ())
+        return {u: LabJournalEntry.model_validate_json(e) for u, e in rows}
+
+    async def write(self, username: str, entry: LabJournalEntry) -> None:
+        """Store the journal entry for a user, replacing any existing entry.
+
+        Parameters
+        ----------
+        username
+            Username the entry is for.
+        entry
+            Journal entry to store.
+        """
+        sql = "INSERT OR REPLACE INTO lab_journal VALUES (?, ?)"
+        args = (username, entry.model_dump_json())
+        await asyncio.to_thread(self._execute, sql, args)
+
+    def _execute(
+        self, sql: str, args: tuple[str, ...]
+    ) -> list[tuple[str, str]]:
+        """Run a single SQL statement in a transaction.
+
+        Parameters
+        ----------
+        sql
+            SQL statement to run.
+        args
+            Parameters for the statement.
+
+        Returns
+        -------
+        list of tuple
+            Rows returned by the statement.
+        """
+        with closing(sqlite3.connect(self._path)) as connection:
+            with connection:
+                connection.execute(_SCHEMA)
+                return connection.execute(sql, args).fetchall()
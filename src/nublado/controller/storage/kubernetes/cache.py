@@ -0,0 +1,270 @@
+"""In-memory cache of Kubernetes objects maintained by a watch."""
+
+import builtins
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any
+
+from kubernetes_asyncio.client import ApiException
+from structlog.stdlib import BoundLogger
+
+from ...constants import KUBERNETES_REQUEST_TIMEOUT
+from ...exceptions import KubernetesError
+from ...models.domain.kubernetes import WatchEventType
+from ...timeout import Timeout
+from .watcher import KubernetesWatcher, WatchEvent
+
+__all__ = ["KubernetesObjectCache"]
+
+
+class KubernetesObjectCache[T]:
+    """In-memory cache of the Kubernetes objects of one kind in a namespace.
+
+    The cache is populated with a list call and then kept current by a watch
+    started at the resource version returned by that list. Callers can then
+    read the objects from memory rather than making a Kubernetes API call for
+    each object. If the watch expires, the cache is repopulated by a fresh
+    list call so that objects deleted while the watch was down are dropped.
+    The cache is only usable while its watch is running; if the watch fails
+    or is cancelled, the cache is marked as not ready and will be
+    repopulated by a fresh list call the next time the watch is started.
+
+    This class is not meant to be used directly by code outside of the
+    Kubernetes storage layer. Use the ``build_cache`` method of one of the
+    kind-specific storage classes to create one.
+
+    Parameters
+    ----------
+    method
+        API list method that supports the watch API.
+    object_type
+        Type of object being cached. For custom objects, this should be a
+        `dict` type.
+    kind
+        Kubernetes kind of object being cached, for error reporting.
+    namespace
+        Namespace to cache.
+    group
+        Group of custom object.
+    version
+        Version of custom object.
+    plural
+        Plural of custom object.
+    label_selector
+        Only cache objects matching this label selector.
+    reconnect_timeout
+        How long to wait before explictly restarting Kubernetes watches. This
+        can prevent the connection from getting unexpectedly getting closed,
+        resulting in 400 errors, or worse, events silently stopping.
+    logger
+        Logger to use.
+    """
+
+    def __init__(
+        self,
+        *,
+        method: Callable[..., Awaitable[Any]],
+        object_type: type[T],
+        kind: str,
+        namespace: str,
+        group: str | None = None,
+        version: str | None = None,
+        plural: str | None = None,
+        label_selector: str | None = None,
+        reconnect_timeout: timedelta,
+        logger: BoundLogger,
+    ) -> None:
+        self._method = method
+        self._type = object_type
+        self._kind = kind
+        self._namespace = namespace
+        self._group = group
+        self._version = version
+        self._plural = plural
+        self._label_selector = label_selector
+        self._reconnect_timeout = reconnect_timeout
+        self._logger = logger.bind(
+            kind=kind, namespace=namespace, label_selector=label_selector
+        )
+
+        self._objects: dict[str, T] = {}
+        self._resource_version: str | None = None
+        self._ready = False
+
+    @property
+    def namespace(self) -> str:
+        """Namespace whose objects are cached."""
+        return self._namespace
+
+    @property
+    def ready(self) -> bool:
+        """Whether the cache is populated and being kept current."""
+        return self._ready
+
+    def get(self, name: str) -> T | None:
+        """Get an object from the cache.
+
+        Parameters
+        ----------
+        name
+            Name of the object.
+
+        Returns
+        -------
+        object or None
+            Cached object, or `None` if no object by that name is cached.
+        """
+        return self._objects.get(name)
+
+    def list(self) -> builtins.list[T]:
+        """List all cached objects.
+
+        Returns
+        -------
+        list
+            All cached objects, in no particular order.
+        """
+        return list(self._objects.values())
+
+    async def refresh(self, timeout: Timeout) -> None:
+        """Replace the contents of the cache with a fresh list call.
+
+        The cache is not marked as ready by this call, since it is only kept
+        current while `watch` is running.
+
+        Parameters
+        ----------
+        timeout
+            Timeout on operation.
+
+        Raises
+        ------
+        KubernetesError
+            Raised for exceptions from the Kubernetes API server.
+        TimeoutError
+            Raised if the timeout expired.
+        """
+        args: dict[str, str | float] = {
+            k: v
+            for k, v in (
+                ("group", self._group),
+                ("version", self._version),
+                ("namespace", self._namespace),
+                ("plural", self._plural),
+                ("label_selector", self._label_selector),
+            )
+            if v is not None
+        }
+        args["_request_timeout"] = timeout.left()
+        try:
+            async with timeout.enforce():
+                result = await self._method(**args)
+        except ApiException as e:
+            raise KubernetesError.from_exception(
+                "Error listing objects",
+                e,
+                kind=self._kind,
+                namespace=self._namespace,
+            ) from e
+
+        # The real custom object API returns a raw dict, but the mock returns
+        # a list model containing dicts, so handle both.
+        if isinstance(result, dict):
+            objects = result["items"]
+            self._resource_version = result["metadata"].get("resourceVersion")
+        else:
+            objects = result.items
+            metadata = result.metadata
+            if metadata:
+                self._resource_version = metadata.resource_version
+            else:
+                self._resource_version = None
+        self._objects = {self._get_name(o): o for o in objects}
+        self._logger.debug("Refreshed object cache", count=len(self._objects))
+
+    async def watch(self) -> None:
+        """Keep the cache current until cancelled.
+
+        Populates the cache with a list call, marks it as ready, and then
+        applies each change from a watch started at the resource version of
+        that list. If the watch expires, the cache is replaced with a fresh
+        list call and the watch resumes from its resource version. This is
+        meant to be run as a background task.
+
+        Raises
+        ------
+        KubernetesError
+            Raised for exceptions from the Kubernetes API server. The cache
+            will be marked as not ready.
+        TimeoutError
+            Raised if the initial list call timed out.
+        """
+        await self._relist()
+        watcher = KubernetesWatcher(
+            method=self._method,
+            object_type=self._type,
+            kind=self._kind,
+            namespace=self._namespace,
+            group=self._group,
+            version=self._version,
+            plural=self._plural,
+            label_selector=self._label_selector,
+            resource_version=self._resource_version,
+            relist=self._relist,
+            timeout=None,
+            reconnect_timeout=self._reconnect_timeout,
+            logger=self._logger,
+        )
+        self._ready = True
+        try:
+            async for event in watcher.watch():
+                self._apply(event)
+        finally:
+            self._ready = False
+            await watcher.close()
+
+    def _apply(self, event: WatchEvent[T]) -> None:
+        """Apply a watch event to the cache.
+
+        Parameters
+        ----------
+        event
+            Event to apply.
+        """
+        name = self._get_name(event.object)
+        match event.action:
+            case WatchEventType.ADDED | WatchEventType.MODIFIED:
+                self._objects[name] = event.object
+            case WatchEventType.DELETED:
+                self._objects.pop(name, None)
+
+    async def _relist(self) -> str | None:
+        """Replace the contents of the cache with a fresh list call.
+
+        Returns
+        -------
+        str or None
+            Resource version of the list, at which to resume watching.
+        """
+        timeout = Timeout(
+            f"Listing {self._kind} objects", KUBERNETES_REQUEST_TIMEOUT
+        )
+        await self.refresh(timeout)
+        return self._resource_version
+
+    def _get_name(self, obj: T) -> str:
+        """Get the name of a cached object.
+
+        Parameters
+        ----------
+        obj
+            Kubernetes object, either a model or a `dict` for custom objects.
+
+        Returns
+        -------
+        str
+            Name of the object.
+        """
+        if isinstance(obj, dict):
+            return obj["metadata"]["name"]
+        return obj.metadata.name  # type: ignore[attr-defined]
@@ -19,7 +19,6 @@ from kubernetes_asyncio import client
 from kubernetes_asyncio.client import (
     ApiClient,
     ApiException,
-    V1ConfigMap,
     V1NetworkPolicy,
     V1ResourceQuota,
     V1Secret,
@@ -31,7 +30,6 @@ from ...models.domain.kubernetes import KubernetesModel
 from ...timeout import Timeout
 
 __all__ = [
-    "ConfigMapStorage",
     "KubernetesObjectCreator",
     "NetworkPolicyStorage",
     "ResourceQuotaStorage",
@@ -153,28 +151,6 @@ class KubernetesObjectCreator[T: KubernetesModel]:
             ) from e
 
 
-class ConfigMapStorage(KubernetesObjectCreator[V1ConfigMap]):
-    """Storage layer for ``ConfigMap`` objects.
-
-    Parameters
-    ----------
-    api_client
-        Kubernetes API client.
-    logger
-        Logger to use.
-    """
-
-    def __init__(self, api_client: ApiClient, logger: BoundLogger) -> None:
-        api = client.CoreV1Api(api_client)
-        super().__init__(
-            create_method=api.create_namespaced_config_map,
-            read_method=api.read_namespaced_config_map,
-            object_type=V1ConfigMap,
-            kind="ConfigMap",
-            logger=logger,
-        )
-
-
 class NetworkPolicyStorage(KubernetesObjectCreator[V1NetworkPolicy]):
     """Storage layer for ``NetworkPolicy`` objects.
 
@@ -260,6 +260,70 @@ class CustomStorage:
                 name=name,
             ) from e
 
+    async def replace(
+        self, namespace: str, body: dict[str, Any], timeout: Timeout
+    ) -> None:
+        """Replace an existing custom object in place.
+
+        Unlike creating the object with ``replace`` set, the object is never
+        deleted, so anything generated from it by its controller is updated
+        rather than recreated. The current object is read first so that the
+        replacement carries its ``resourceVersion``, which Kubernetes
+        requires for updates to custom objects.
+
+        Parameters
+        ----------
+        namespace
+            Namespace of the object.
+        body
+            New contents of the custom object.
+        timeout
+            Timeout on operation.
+
+        Raises
+        ------
+        KubernetesError
+            Raised for exceptions from the Kubernetes API server, including
+            if the object does not exist.
+        TimeoutError
+            Raised if the timeout expired.
+        """
+        name = body["metadata"]["name"]
+        metadata = {**body["metadata"], "namespace": namespace}
+        body = {**body, "metadata": metadata}
+        msg = f"Replacing {self._kind}"
+        self._logger.debug(msg, name=name, namespace=namespace)
+        try:
+            async with timeout.enforce():
+                current = await self._api.get_namespaced_custom_object(
+                    self._group,
+                    self._version,
+                    namespace,
+                    self._plural,
+                    name,
+                    _request_timeout=timeout.left(),
+                )
+                version = current["metadata"].get("resourceVersion")
+                if version:
+                    metadata["resourceVersion"] = version
+                await self._api.replace_namespaced_custom_object(
+                    self._group,
+                    self._version,
+                    namespace,
+                    self._plural,
+                    name,
+                    body,
+                    _request_timeout=timeout.left(),
+                )
+        except ApiException as e:
+            raise KubernetesError.from_exception(
+                "Error replacing object",
+                e,
+                kind=self._kind,
+                namespace=namespace,
+                name=name,
+            ) from e
+
     async def wait_for_deletion(
         self, name: str, namespace: str, timeout: Timeout
     ) -> None:
@@ -16,6 +16,7 @@ from kubernetes_asyncio import client
 from kubernetes_asyncio.client import (
     ApiClient,
     ApiException,
+    V1ConfigMap,
     V1DeleteOptions,
     V1Job,
     V1PersistentVolumeClaim,
@@ -31,10 +32,12 @@ from ...models.domain.kubernetes import (
     WatchEventType,
 )
 from ...timeout import Timeout
+from .cache import KubernetesObjectCache
 from .creator import KubernetesObjectCreator
 from .watcher import KubernetesWatcher
 
 __all__ = [
+    "ConfigMapStorage",
     "JobStorage",
     "KubernetesObjectDeleter",
     "PersistentVolumeClaimStorage",
@@ -103,6 +106,35 @@ class KubernetesObjectDeleter[T: KubernetesModel](KubernetesObjectCreator[T]):
         self._list = list_method
         self._reconnect_timeout = reconnect_timeout
 
+    def build_cache(
+        self, namespace: str, *, label_selector: str | None = None
+    ) -> KubernetesObjectCache[T]:
+        """Build a watch-backed cache of objects of this kind.
+
+        The cache is empty until its ``watch`` method is started.
+
+        Parameters
+        ----------
+        namespace
+            Namespace whose objects should be cached.
+        label_selector
+            Only cache objects matching this label selector.
+
+        Returns
+        -------
+        KubernetesObjectCache
+            New cache for objects of this kind.
+        """
+        return KubernetesObjectCache(
+            method=self._list,
+            object_type=self._type,
+            kind=self._kind,
+            namespace=namespace,
+            label_selector=label_selector,
+            reconnect_timeout=self._reconnect_timeout,
+            logger=self._logger,
+        )
+
     @override
     async def create(
         self,
@@ -313,7 +345,7 @@ class KubernetesObjectDeleter[T: KubernetesModel](KubernetesObjectCreator[T]):
         watch_timeout = timeout.partial(timedelta(seconds=timeout.left() - 2))
         watcher = KubernetesWatcher(
             method=self._list,
-            object_type=self._type,
+            object_type=dict,
             kind=self._kind,
             name=name,
             namespace=namespace,
@@ -372,7 +404,7 @@ class KubernetesObjectDeleter[T: KubernetesModel](KubernetesObjectCreator[T]):
         watch_timeout = timeout.partial(timedelta(seconds=timeout.left() - 2))
         watcher = KubernetesWatcher(
             method=self._list,
-            object_type=self._type,
+            object_type=dict,
             kind=self._kind,
             name=name,
             namespace=namespace,
@@ -403,6 +435,40 @@ class KubernetesObjectDeleter[T: KubernetesModel](KubernetesObjectCreator[T]):
         raise RuntimeError("Wait for object deletion unexpectedly stopped")
 
 
+class ConfigMapStorage(KubernetesObjectDeleter[V1ConfigMap]):
+    """Storage layer for ``ConfigMap`` objects.
+
+    Parameters
+    ----------
+    api_client
+        Kubernetes API client.
+    reconnect_timeout
+        How long to wait before explictly restarting Kubernetes watches. This
+        can prevent the connection from getting unexpectedly getting closed,
+        resulting in 400 errors, or worse, events silently stopping.
+    logger
+        Logger to use.
+    """
+
+    def __init__(
+        self,
+        api_client: ApiClient,
+        reconnect_timeout: timedelta,
+        logger: BoundLogger,
+    ) -> None:
+        api = client.CoreV1Api(api_client)
+        super().__init__(
+            create_method=api.create_namespaced_config_map,
+            delete_method=api.delete_namespaced_config_map,
+            list_method=api.list_namespaced_config_map,
+            read_method=api.read_namespaced_config_map,
+            object_type=V1ConfigMap,
+            kind="ConfigMap",
+            reconnect_timeout=reconnect_timeout,
+            logger=logger,
+        )
+
+
 class JobStorage(KubernetesObjectDeleter[V1Job]):
     """Storage layer for ``Job`` objects.
 
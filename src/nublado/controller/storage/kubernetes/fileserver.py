@@ -1,19 +1,22 @@
 """Kubernetes storage layer for user fileservers."""
 
 import asyncio
-from collections.abc import AsyncIterator
-from datetime import timedelta
+from collections.abc import AsyncIterator, Coroutine
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from kubernetes_asyncio.client import ApiClient, V1Pod
+from kubernetes_asyncio.client import ApiClient, V1Ingress, V1Job, V1Pod
 from structlog.stdlib import BoundLogger
 
 from ...exceptions import DuplicateObjectError
 from ...models.domain.fileserver import (
     FileserverObjects,
+    FileserverShell,
     FileserverStateObjects,
 )
 from ...models.domain.kubernetes import PodChange, PodPhase, PropagationPolicy
 from ...timeout import Timeout
+from .cache import KubernetesObjectCache
 from .custom import GafaelfawrIngressStorage
 from .deleter import JobStorage, PersistentVolumeClaimStorage, ServiceStorage
 from .ingress import IngressStorage
@@ -63,13 +66,22 @@ class FileserverStorage:
         )
         self._service = ServiceStorage(api_client, reconnect_timeout, logger)
 
+        # Watch-backed caches of the objects read during reconciliation,
+        # created by watch_state.
+        self._job_cache: KubernetesObjectCache[V1Job] | None = None
+        self._pod_cache: KubernetesObjectCache[V1Pod] | None = None
+        self._ingress_cache: KubernetesObjectCache[V1Ingress] | None = None
+
     async def create(
         self, namespace: str, objects: FileserverObjects, timeout: Timeout
     ) -> None:
         """Create all of the Kubernetes objects for a fileserver.
 
         Create the objects in Kubernetes and then wait for the fileserver pod
-        to start and for the ingress to be ready.
+        to start and for the ingress to be ready. None of the objects depend
+        on each other at creation time, so they are all created in parallel,
+        and then the waits for the ingress and the pod run in parallel. The
+        time taken by each step is logged.
 
         Parameters
         ----------
@@ -92,39 +104,72 @@ class FileserverStorage:
             Raised if the fileserver takes longer than the provided timeout to
             create or start.
         """
+        start = datetime.now(tz=UTC)
+        timings: dict[str, float] = {}
+        name = objects.ingress["metadata"]["name"]
+        job_name = objects.job.metadata.name
+
+        # Create all of the objects. The pod will not start until its PVCs
+        # exist, but Kubernetes retries, so the job need not wait for them.
+        steps: dict[str, Coroutine[Any, Any, None]] = {}
         for pvc in objects.pvcs:
-            await self._pvc.create(namespace, pvc, timeout, replace=True)
-        await self._gafaelfawr.create(
-            namespace, objects.ingress, timeout, replace=True
-        )
-        await self._service.create(
-            namespace, objects.service, timeout, replace=True
-        )
-        await self._job.create(
+            create = self._pvc.create(namespace, pvc, timeout, replace=True)
+            steps[f"PersistentVolumeClaim {pvc.metadata.name}"] = create
+        if objects.shell:
+            # Replace rather than recreate the ingress of the warm pool shell
+            # so that the generated Ingress keeps its IP address.
+            replace = self._gafaelfawr.replace(
+                namespace, objects.ingress, timeout
+            )
+            steps[f"GafaelfawrIngress {name}"] = replace
+        else:
+            steps[f"GafaelfawrIngress {name}"] = self._gafaelfawr.create(
+                namespace, objects.ingress, timeout, replace=True
+            )
+        if objects.service:
+            steps[f"Service {name}"] = self._service.create(
+                namespace, objects.service, timeout, replace=True
+            )
+        steps[f"Job {job_name}"] = self._job.create(
             namespace,
             objects.job,
             timeout,
             replace=True,
             propagation_policy=PropagationPolicy.FOREGROUND,
         )
+        await self._run_steps(steps, timings)
 
-        # Wait for the ingress to get an IP address assigned. This usually
-        # takes the longest.
-        name = objects.ingress["metadata"]["name"]
-        await self._ingress.wait_for_ip_address(name, namespace, timeout)
+        # Wait for the ingress to get an IP address assigned, which usually
+        # takes the longest, and for the pod to start.
+        wait_for_ip = self._ingress.wait_for_ip_address(
+            name, namespace, timeout
+        )
+        wait_for_pod = self._wait_for_pod_start(job_name, namespace, timeout)
+        await self._run_steps(
+            {
+                f"Ingress {name} IP address": wait_for_ip,
+                f"Pod for {job_name} start": wait_for_pod,
+            },
+            timings,
+        )
 
-        # Wait for the pod to start.
-        job_name = objects.job.metadata.name
-        pod = await self._wait_for_pod_creation(job_name, namespace, timeout)
-        await self._pod.wait_for_phase(
-            pod.metadata.name,
-            namespace,
-            until_not={PodPhase.UNKNOWN, PodPhase.PENDING},
-            timeout=timeout,
+        elapsed = (datetime.now(tz=UTC) - start).total_seconds()
+        self._logger.info(
+            "Created file server objects",
+            name=job_name,
+            namespace=namespace,
+            elapsed=elapsed,
+            timings=timings,
         )
 
     async def delete(
-        self, name: str, namespace: str, username: str, timeout: Timeout
+        self,
+        name: str,
+        namespace: str,
+        username: str,
+        timeout: Timeout,
+        *,
+        shell: str | None = None,
     ) -> None:
         """Delete a file server.
 
@@ -138,6 +183,10 @@ class FileserverStorage:
             Username owning the file server, to find the PVCs to delete.
         timeout
             Timeout on operation.
+        shell
+            Name of the warm pool shell the file server was bound to, if any.
+            The shell's ingress and service are deleted along with the file
+            server.
 
         Raises
         ------
@@ -147,33 +196,133 @@ class FileserverStorage:
             Raised if the deletion of any individual object took longer than
             the Kubernetes delete timeout.
         """
-        await self._gafaelfawr.delete(
-            name,
-            namespace,
-            timeout,
-            wait=True,
-            propagation_policy=PropagationPolicy.FOREGROUND,
-        )
-        await self._ingress.wait_for_deletion(name, namespace, timeout)
-        await self._service.delete(name, namespace, timeout, wait=True)
-        await self._job.delete(
-            name,
-            namespace,
-            timeout,
-            wait=True,
-            propagation_policy=PropagationPolicy.FOREGROUND,
-        )
+        start = datetime.now(tz=UTC)
+        timings: dict[str, float] = {}
+        ingress_name = shell or name
         search = f"nublado.lsst.io/user={username}"
         pvcs = await self._pvc.list(namespace, timeout, label_selector=search)
+
+        # All of the objects can be deleted in parallel. Kubernetes will not
+        # remove the PVCs until the pod using them is gone.
+        steps = {
+            f"GafaelfawrIngress {ingress_name}": self._delete_ingress(
+                ingress_name, namespace, timeout
+            ),
+            f"Service {ingress_name}": self._service.delete(
+                ingress_name, namespace, timeout, wait=True
+            ),
+            f"Job {name}": self._job.delete(
+                name,
+                namespace,
+                timeout,
+                wait=True,
+                propagation_policy=PropagationPolicy.FOREGROUND,
+            ),
+        }
         for pvc in pvcs:
-            await self._pvc.delete(pvc.metadata.name, namespace, timeout)
+            pvc_name = pvc.metadata.name
+            steps[f"PersistentVolumeClaim {pvc_name}"] = self._pvc.delete(
+                pvc_name, namespace, timeout
+            )
+        await self._run_steps(steps, timings)
+
+        elapsed = (datetime.now(tz=UTC) - start).total_seconds()
+        self._logger.info(
+            "Deleted file server objects",
+            name=name,
+            namespace=namespace,
+            elapsed=elapsed,
+            timings=timings,
+        )
+
+    async def create_shell(
+        self, namespace: str, shell: FileserverShell, timeout: Timeout
+    ) -> None:
+        """Create a warm pool shell and wait for its ingress to be ready.
+
+        Parameters
+        ----------
+        namespace
+            Namespace in which file servers run.
+        shell
+            Kubernetes objects making up the shell.
+        timeout
+            How long to wait for the shell to be ready.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        TimeoutError
+            Raised if the ingress doesn't get an IP address in time.
+        """
+        await self._gafaelfawr.create(
+            namespace, shell.ingress, timeout, replace=True
+        )
+        await self._service.create(
+            namespace, shell.service, timeout, replace=True
+        )
+        await self._ingress.wait_for_ip_address(shell.name, namespace, timeout)
+
+    async def delete_shell(
+        self, name: str, namespace: str, timeout: Timeout
+    ) -> None:
+        """Delete a warm pool shell.
+
+        Parameters
+        ----------
+        name
+            Name of the shell.
+        namespace
+            Namespace in which file servers run.
+        timeout
+            Timeout on operation.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        TimeoutError
+            Raised if the deletion of any individual object took longer than
+            the Kubernetes delete timeout.
+        """
+        await self._delete_ingress_and_service(name, namespace, timeout)
+
+    async def list_shells(self, namespace: str, timeout: Timeout) -> list[str]:
+        """List the names of all warm pool shells, bound or not.
+
+        Parameters
+        ----------
+        namespace
+            Namespace in which file servers run.
+        timeout
+            Timeout on operation.
+
+        Returns
+        -------
+        list of str
+            Names of the shells.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        search = "nublado.lsst.io/category=fileserver-pool"
+        services = await self._service.list(
+            namespace, timeout, label_selector=search
+        )
+        return [s.metadata.name for s in services]
 
     async def read_fileserver_state(
         self, namespace: str, timeout: Timeout
     ) -> dict[str, FileserverStateObjects]:
         """Read Kubernetes objects for all running fileservers.
 
-        Assumes that all objects have the same name as the ``Job``.
+        Assumes that all objects have the same name as the ``Job``. If
+        `watch_state` is running for this namespace, the state is built from
+        its in-memory caches without any Kubernetes API calls. Otherwise, it
+        is read directly from Kubernetes.
 
         Parameters
         ----------
@@ -188,6 +337,9 @@ class FileserverStorage:
             Dictionary mapping usernames to the state of their running
             fileservers.
         """
+        if self._is_cache_ready(namespace):
+            return self._build_state_from_cache(namespace)
+
         search = "nublado.lsst.io/category=fileserver"
         jobs = await self._job.list(namespace, timeout, label_selector=search)
         self._logger.debug(
@@ -231,11 +383,12 @@ class FileserverStorage:
             except DuplicateObjectError as e:
                 msg = f"{e!s}, ignoring them all"
                 self._logger.warning(msg, user=username, namespace=namespace)
+                pod = None
 
             # Retrieve the Ingress if it exists, and then put the objects into
             # the state map.
             ingress = await self._ingress.read(
-                job.metadata.name, namespace, timeout
+                self._get_ingress_name(job), namespace, timeout
             )
             objects = FileserverStateObjects(job=job, pod=pod, ingress=ingress)
             state[username] = objects
@@ -243,6 +396,37 @@ class FileserverStorage:
         # Return the state map of everything we found.
         return state
 
+    async def watch_state(self, namespace: str) -> None:
+        """Maintain in-memory caches of file server objects.
+
+        Caches the file server ``Job``, ``Pod``, and ``Ingress`` objects in
+        the given namespace so that `read_fileserver_state` doesn't need to
+        make Kubernetes API calls proportional to the number of file servers.
+        Runs until cancelled or until one of the watches fails, at which
+        point all of the caches stop being used until this method is called
+        again. It is meant to be run from a background task.
+
+        Parameters
+        ----------
+        namespace
+            Namespace in which file servers run.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        search = "nublado.lsst.io/category=fileserver"
+        self._job_cache = self._job.build_cache(
+            namespace, label_selector=search
+        )
+        self._pod_cache = self._pod.build_cache(namespace)
+        self._ingress_cache = self._ingress.build_cache(namespace)
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._job_cache.watch())
+            tg.create_task(self._pod_cache.watch())
+            tg.create_task(self._ingress_cache.watch())
+
     async def watch_pods(self, namespace: str) -> AsyncIterator[PodChange]:
         """Watches the file server namespace for pod phase changes.
 
@@ -279,6 +463,128 @@ class FileserverStorage:
         async for change in self._pod.watch_pod_changes(namespace):
             yield change
 
+    def _build_state_from_cache(
+        self, namespace: str
+    ) -> dict[str, FileserverStateObjects]:
+        """Build the file server state from the in-memory caches.
+
+        Must only be called when `_is_cache_ready` returns `True`.
+
+        Parameters
+        ----------
+        namespace
+            Namespace in which file servers run.
+
+        Returns
+        -------
+        dict of FileserverStateObjects
+            Dictionary mapping usernames to the state of their running
+            fileservers.
+        """
+        job_cache = self._job_cache
+        pod_cache = self._pod_cache
+        ingress_cache = self._ingress_cache
+        if not (job_cache and pod_cache and ingress_cache):
+            raise RuntimeError("File server caches not initialized")
+
+        # Index the pods by the job that created them, so that finding the
+        # pod for each job doesn't require scanning every pod.
+        pods: dict[str, list[V1Pod]] = {}
+        for cached_pod in pod_cache.list():
+            job_name = (cached_pod.metadata.labels or {}).get("job-name")
+            if job_name:
+                pods.setdefault(job_name, []).append(cached_pod)
+
+        state: dict[str, FileserverStateObjects] = {}
+        for job in job_cache.list():
+            name = job.metadata.name
+            username = job.metadata.labels.get("nublado.lsst.io/user")
+            if not username:
+                self._logger.warning(
+                    "File server job has no user set",
+                    namespace=namespace,
+                    name=name,
+                    labels=job.metadata.labels,
+                )
+                continue
+            if username in state:
+                other = state[username].job
+                msg = (
+                    f"Duplicate jobs for user ({name} and"
+                    f" {other.metadata.name}), ignoring the first"
+                )
+                self._logger.warning(msg, user=username, namespace=namespace)
+                continue
+            job_pods = pods.get(name, [])
+            if len(job_pods) > 1:
+                msg = f"Multiple pods match job {name}, ignoring them all"
+                self._logger.warning(msg, user=username, namespace=namespace)
+            pod = job_pods[0] if len(job_pods) == 1 else None
+            ingress = ingress_cache.get(self._get_ingress_name(job))
+            state[username] = FileserverStateObjects(
+                job=job, pod=pod, ingress=ingress
+            )
+        return state
+
+    async def _delete_ingress_and_service(
+        self, name: str, namespace: str, timeout: Timeout
+    ) -> None:
+        """Delete the ingress and service of a file server or shell.
+
+        Parameters
+        ----------
+        name
+            Name of the ``GafaelfawrIngress`` and ``Service``.
+        namespace
+            Namespace in which file servers run.
+        timeout
+            Timeout on operation.
+        """
+        await self._run_steps(
+            {
+                f"GafaelfawrIngress {name}": self._delete_ingress(
+                    name, namespace, timeout
+                ),
+                f"Service {name}": self._service.delete(
+                    name, namespace, timeout, wait=True
+                ),
+            },
+            {},
+        )
+
+    async def _delete_ingress(
+        self, name: str, namespace: str, timeout: Timeout
+    ) -> None:
+        """Delete a ``GafaelfawrIngress`` and wait for its ``Ingress``.
+
+        Parameters
+        ----------
+        name
+            Name of the ``GafaelfawrIngress``.
+        namespace
+            Namespace in which file servers run.
+        timeout
+            Timeout on operation.
+        """
+        await self._gafaelfawr.delete(
+            name,
+            namespace,
+            timeout,
+            wait=True,
+            propagation_policy=PropagationPolicy.FOREGROUND,
+        )
+        await self._ingress.wait_for_deletion(name, namespace, timeout)
+
+    def _get_ingress_name(self, job: V1Job) -> str:
+        """Get the name of the ``Ingress`` for a file server ``Job``.
+
+        This is the name of the warm pool shell if the file server was bound
+        to one, and otherwise the same as the name of the ``Job``.
+        """
+        annotations = job.metadata.annotations or {}
+        shell = annotations.get("nublado.lsst.io/fileserver-shell")
+        return shell or job.metadata.name
+
     async def _get_pod_for_job(
         self, name: str, namespace: str, timeout: Timeout
     ) -> V1Pod | None:
@@ -314,6 +620,90 @@ class FileserverStorage:
             raise DuplicateObjectError(msg, kind="Pod", namespace=namespace)
         return pods[0]
 
+    def _is_cache_ready(self, namespace: str) -> bool:
+        """Whether the in-memory caches can be used for a namespace.
+
+        Parameters
+        ----------
+        namespace
+            Namespace in which file servers run.
+
+        Returns
+        -------
+        bool
+            `True` if all caches are populated, current, and for the given
+            namespace, `False` otherwise.
+        """
+        caches = (self._job_cache, self._pod_cache, self._ingress_cache)
+        return all(c and c.ready and c.namespace == namespace for c in caches)
+
+    async def _run_steps(
+        self,
+        steps: dict[str, Coroutine[Any, Any, Any]],
+        timings: dict[str, float],
+    ) -> None:
+        """Run the steps of a creation or deletion plan in parallel.
+
+        Parameters
+        ----------
+        steps
+            Mapping of descriptions of the steps to the coroutines that
+            perform them.
+        timings
+            Updated with how long each successful step took, in seconds.
+
+        Raises
+        ------
+        Exception
+            The first exception raised by any step. All other steps are
+            cancelled, as with `asyncio.TaskGroup`.
+        """
+
+        async def run(
+            description: str, step: Coroutine[Any, Any, Any]
+        ) -> None:
+            start = datetime.now(tz=UTC)
+            await step
+            elapsed = (datetime.now(tz=UTC) - start).total_seconds()
+            timings[description] = elapsed
+            self._logger.debug(f"{description} done", elapsed=elapsed)
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for description, step in steps.items():
+                    tg.create_task(run(description, step))
+        except ExceptionGroup as e:
+            # Callers expect the same exceptions as a sequential plan would
+            # raise, so unwrap the group and raise the first failure.
+            raise e.exceptions[0] from e
+
+    async def _wait_for_pod_start(
+        self, name: str, namespace: str, timeout: Timeout
+    ) -> None:
+        """Wait for the ``Pod`` of a ``Job`` to be created and start.
+
+        Parameters
+        ----------
+        name
+            Name of the job.
+        namespace
+            Namespace in which to search.
+        timeout
+            How long to wait.
+
+        Raises
+        ------
+        TimeoutError
+            Raised if the ``Pod`` doesn't start in time.
+        """
+        pod = await self._wait_for_pod_creation(name, namespace, timeout)
+        await self._pod.wait_for_phase(
+            pod.metadata.name,
+            namespace,
+            until_not={PodPhase.UNKNOWN, PodPhase.PENDING},
+            timeout=timeout,
+        )
+
     async def _wait_for_pod_creation(
         self, name: str, namespace: str, timeout: Timeout
     ) -> V1Pod:
@@ -3,21 +3,22 @@
 from collections.abc import AsyncIterator
 from datetime import timedelta
 
-from kubernetes_asyncio.client import ApiClient, V1Secret
+from kubernetes_asyncio.client import (
+    ApiClient,
+    V1ConfigMap,
+    V1Namespace,
+    V1Secret,
+)
 from structlog.stdlib import BoundLogger
 
 from ...constants import LAB_STOP_GRACE_PERIOD
 from ...exceptions import MissingSecretError
-from ...models.domain.kubernetes import PodPhase
+from ...models.domain.kubernetes import PodEvent, PodPhase
 from ...models.domain.lab import LabObjectNames, LabObjects, LabStateObjects
 from ...timeout import Timeout
-from .creator import (
-    ConfigMapStorage,
-    NetworkPolicyStorage,
-    ResourceQuotaStorage,
-    SecretStorage,
-)
+from .creator import NetworkPolicyStorage, ResourceQuotaStorage, SecretStorage
 from .deleter import (
+    ConfigMapStorage,
     PersistentVolumeClaimStorage,
     ServiceAccountStorage,
     ServiceStorage,
@@ -57,7 +58,9 @@ class LabStorage:
         logger: BoundLogger,
     ) -> None:
         self._logger = logger
-        self._config_map = ConfigMapStorage(api_client, logger)
+        self._config_map = ConfigMapStorage(
+            api_client, reconnect_timeout, logger
+        )
         self._namespace = NamespaceStorage(
             api_client, reconnect_timeout, logger
         )
@@ -233,6 +236,30 @@ class LabStorage:
         quota = await self._quota.read(names.quota, namespace, timeout)
         return LabStateObjects(env_config_map=env_map, quota=quota, pod=pod)
 
+    async def read_namespace(
+        self, name: str, timeout: Timeout
+    ) -> V1Namespace | None:
+        """Read a namespace.
+
+        Parameters
+        ----------
+        name
+            Name of the namespace.
+        timeout
+            Timeout on operation.
+
+        Returns
+        -------
+        kubernetes_asyncio.client.models.V1Namespace or None
+            Namespace, or `None` if it does not exist.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        return await self._namespace.read(name, timeout)
+
     async def read_pod_phase(
         self, names: LabObjectNames, timeout: Timeout
     ) -> PodPhase | None:
@@ -299,6 +326,92 @@ class LabStorage:
             raise MissingSecretError(name, namespace)
         return secret
 
+    async def read_suspension(
+        self, names: LabObjectNames, timeout: Timeout
+    ) -> V1ConfigMap | None:
+        """Read the config map marking a suspended lab.
+
+        Parameters
+        ----------
+        names
+            Names of the user's lab objects.
+        timeout
+            Timeout on operation.
+
+        Returns
+        -------
+        kubernetes_asyncio.client.models.V1ConfigMap or None
+            Config map marking the suspended lab, or `None` if the lab is not
+            suspended.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        return await self._config_map.read(
+            names.suspension, names.namespace, timeout
+        )
+
+    async def resume(
+        self, names: LabObjectNames, objects: LabObjects, timeout: Timeout
+    ) -> None:
+        """Resume a suspended lab.
+
+        Only the objects deleted when the lab was suspended are created. The
+        caller is responsible for checking that the remaining objects match
+        the ones that would otherwise be created.
+
+        Parameters
+        ----------
+        names
+            Names of the user's lab objects.
+        objects
+            Kubernetes objects making up the user's lab.
+        timeout
+            Timeout on operation.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        namespace = names.namespace
+        await self._config_map.delete(names.suspension, namespace, timeout)
+        await self._config_map.create(
+            namespace, objects.env_config_map, timeout
+        )
+        await self._pod.create(namespace, objects.pod, timeout)
+
+    async def suspend(
+        self, names: LabObjectNames, marker: V1ConfigMap, timeout: Timeout
+    ) -> None:
+        """Suspend a lab, deleting only the objects recreated on each spawn.
+
+        The pod is deleted with a grace period, as when deleting the lab, and
+        the environment config map is deleted since it holds per-spawn
+        credentials. The marker is created first so that a lab whose
+        suspension is interrupted is not treated as malformed.
+
+        Parameters
+        ----------
+        names
+            Names of the user's lab objects.
+        marker
+            Config map marking the suspended lab.
+        timeout
+            Timeout on operation.
+
+        Raises
+        ------
+        KubernetesError
+            Raised if there is some failure in a Kubernetes API call.
+        """
+        namespace = names.namespace
+        await self._config_map.create(namespace, marker, timeout)
+        await self.delete_pod(names, timeout)
+        await self._config_map.delete(names.env_config_map, namespace, timeout)
+
     async def wait_for_pod_start(
         self, name: str, namespace: str, timeout: Timeout
     ) -> PodPhase | None:
@@ -337,7 +450,7 @@ class LabStorage:
 
     async def watch_pod_events(
         self, name: str, namespace: str, timeout: Timeout
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[PodEvent]:
         """Monitor the startup of a pod.
 
         Watches for events involving a pod, yielding them. Must be cancelled
@@ -354,7 +467,7 @@ class LabStorage:
 
         Yields
         ------
-        str
+        PodEvent
             The next observed event.
 
         Raises
@@ -364,5 +477,5 @@ class LabStorage:
         TimeoutError
             Raised if the timeout expires.
         """
-        async for msg in self._pod.events_for_pod(name, namespace, timeout):
-            yield msg
+        async for event in self._pod.events_for_pod(name, namespace, timeout):
+            yield event
@@ -204,7 +204,7 @@ class NamespaceStorage:
         watch_timeout = timeout.partial(timedelta(seconds=timeout.left() - 2))
         watcher = KubernetesWatcher(
             method=self._api.list_namespace,
-            object_type=V1Namespace,
+            object_type=dict,
             kind="Namespace",
             name=name,
             resource_version=namespace.metadata.resource_version,
@@ -4,11 +4,16 @@ from collections.abc import AsyncIterator
 from datetime import timedelta
 
 from kubernetes_asyncio import client
-from kubernetes_asyncio.client import ApiClient, CoreV1Event, V1Pod
+from kubernetes_asyncio.client import ApiClient, V1Pod
 from structlog.stdlib import BoundLogger
 
 from ...exceptions import ControllerTimeoutError
-from ...models.domain.kubernetes import PodChange, PodPhase, WatchEventType
+from ...models.domain.kubernetes import (
+    PodChange,
+    PodEvent,
+    PodPhase,
+    WatchEventType,
+)
 from ...timeout import Timeout
 from .deleter import KubernetesObjectDeleter
 from .watcher import KubernetesWatcher
@@ -96,7 +101,7 @@ class PodStorage(KubernetesObjectDeleter[V1Pod]):
 
     async def events_for_pod(
         self, name: str, namespace: str, timeout: Timeout
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[PodEvent]:
         """Iterate over Kubernetes events involving a pod.
 
         Watches for events involving a pod, yielding them. Must be cancelled
@@ -114,7 +119,7 @@ class PodStorage(KubernetesObjectDeleter[V1Pod]):
 
         Yields
         ------
-        str
+        PodEvent
             The next observed event.
 
         Raises
@@ -126,7 +131,7 @@ class PodStorage(KubernetesObjectDeleter[V1Pod]):
         logger.debug("Watching pod events")
         watcher = KubernetesWatcher(
             method=self._api.list_namespaced_event,
-            object_type=CoreV1Event,
+            object_type=dict,
             kind="Event",
             involved_object=name,
             namespace=namespace,
@@ -137,7 +142,9 @@ class PodStorage(KubernetesObjectDeleter[V1Pod]):
         try:
             async with timeout.enforce():
                 async for event in watcher.watch():
-                    yield event.object.message
+                    if message := event.object.get("message"):
+                        reason = event.object.get("reason")
+                        yield PodEvent(message=message, reason=reason)
         except ControllerTimeoutError:
             pass
         finally:
@@ -206,7 +213,7 @@ class PodStorage(KubernetesObjectDeleter[V1Pod]):
         # to change state.
         watcher = KubernetesWatcher(
             method=self._list,
-            object_type=V1Pod,
+            object_type=dict,
             kind="Pod",
             name=pod.metadata.name,
             namespace=pod.metadata.namespace,
@@ -220,7 +227,7 @@ class PodStorage(KubernetesObjectDeleter[V1Pod]):
                 async for event in watcher.watch():
                     if event.action == WatchEventType.DELETED:
                         return None
-                    phase = PodPhase(event.object.status.phase)
+                    phase = PodPhase(event.object["status"]["phase"])
                     if phase not in until_not:
                         logger.debug("Pod phase changed", status=phase.value)
                         return phase
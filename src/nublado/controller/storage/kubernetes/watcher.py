@@ -4,7 +4,7 @@ import math
 from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any, Self
+from typing import Any, Self, override
 
 from kubernetes_asyncio.client import ApiException
 from kubernetes_asyncio.watch import Watch
@@ -17,6 +17,24 @@ from ...timeout import Timeout
 __all__ = ["KubernetesWatcher", "WatchEvent"]
 
 
+class _RawWatch(Watch):
+    """Watch that leaves watched objects as parsed JSON.
+
+    The ``kubernetes_asyncio`` watch implementation parses each line of the
+    watch stream as JSON, serializes the object back into JSON, and then
+    parses it again into a model, reflecting over the model's types for every
+    nested object. When the caller only needs a few fields, or the object is a
+    custom object without a model, that work is wasted. This variant parses
+    each line once and returns the object as a `dict`.
+    """
+
+    @override
+    def unmarshal_event(
+        self, data: str | bytes, response_type: str | None
+    ) -> Any:
+        return super().unmarshal_event(data, None)
+
+
 @dataclass
 class WatchEvent[T]:
     """Parsed event from a Kubernetes watch.
@@ -82,7 +100,10 @@ class KubernetesWatcher[T]:
         method because of the problems with docstring parsing and therefore
         must be provided by the caller and must match the type of object
         returned by the method. For custom objects, this should be a `dict`
-        type.
+        type. It may also be `dict` for other objects, in which case the
+        objects are returned as parsed JSON without being converted to
+        models, which is considerably faster. Prefer this when the caller
+        only needs the event action or a few fields of the object.
     kind
         Kubernetes kind of object being watched, for error reporting.
     name
@@ -98,8 +119,18 @@ class KubernetesWatcher[T]:
     involved_object
         Involved object to watch (used when watching events). Cannot be used
         with ``name``.
+    label_selector
+        Only watch objects matching this label selector.
     resource_version
         Resource version at which to start the watch.
+    relist
+        If given, called when the watch expires with a 410 error or would be
+        restarted without a resource version. It should list the objects
+        again, replacing any state the caller built from earlier events, and
+        return the resource version of that list. The watch then resumes from
+        that resource version. Without this, the watch resumes without a
+        resource version, which means that changes, including deletions,
+        that happened while it was down are lost.
     timeout
         Timeout for the watch. This may be `None`, in which case the watch
         continues until cancelled or until the iterator is no longer called.
@@ -128,12 +159,15 @@ class KubernetesWatcher[T]:
         version: str | None = None,
         plural: str | None = None,
         involved_object: str | None = None,
+        label_selector: str | None = None,
         resource_version: str | None = None,
+        relist: Callable[[], Awaitable[str | None]] | None = None,
         timeout: Timeout | None,
         reconnect_timeout: timedelta,
         logger: BoundLogger,
     ) -> None:
         self._method = method
+        self._relist = relist
         self._type = object_type
         self._kind = kind
         self._namespace = namespace
@@ -154,6 +188,7 @@ class KubernetesWatcher[T]:
             field_selector = None
         args: dict[str, str | float | None] = {
             "field_selector": field_selector,
+            "label_selector": label_selector,
             "group": group,
             "version": version,
             "plural": plural,
@@ -167,7 +202,10 @@ class KubernetesWatcher[T]:
         # its docstring and expects native Sphinx markup. This means that if
         # the Safir MockKubernetesApi mock API is in use, the automatic type
         # discovery breaks, because we use the numpy convention.
-        self._watch = Watch(return_type=object_type.__name__)
+        if object_type.__name__ == "dict":
+            self._watch: Watch = _RawWatch()
+        else:
+            self._watch = Watch(return_type=object_type.__name__)
         self._logger = self._logger.bind(
             group=group,
             kind=kind,
@@ -193,7 +231,11 @@ class KubernetesWatcher[T]:
         the API call returns a 410 error and we should retry without a
         resource version. This is handled automatically. Unfortunately, this
         has a race condition where we may miss events that come in after the
-        error is returned but before we retry the API call.
+        error is returned but before we retry the API call. If a ``relist``
+        function was provided, it is called instead to resynchronize the
+        caller, both on a 410 error and whenever the watch would otherwise
+        be restarted without a resource version, and the watch resumes from
+        the resource version it returns.
 
         Yields
         ------
@@ -245,27 +287,55 @@ class KubernetesWatcher[T]:
                 msg = "Kubernetes event watch timed out by client, restarting"
                 logger.debug(msg)
             except ApiException as e:
-                if e.status == 410:
-                    if "resource_version" in args:
-                        rv = args["resource_version"]
-                        msg = f"Resource version {rv} expired, retrying watch"
-                        logger.info(msg)
-                        del args["resource_version"]
-                    else:
-                        # We can get a 410 error even when no resource version
-                        # is specified if there are long delays between
-                        # reportable events. Retry those as well.
-                        msg = "Watch expired (no resource version), retrying"
-                        logger.info(msg)
-                    continue
-
-                raise KubernetesError.from_exception(
-                    "Error watching objects",
-                    e,
-                    kind=self._kind,
-                    namespace=self._namespace,
-                    name=self._name,
-                ) from e
+                if e.status != 410:
+                    raise KubernetesError.from_exception(
+                        "Error watching objects",
+                        e,
+                        kind=self._kind,
+                        namespace=self._namespace,
+                        name=self._name,
+                    ) from e
+                if "resource_version" in args:
+                    rv = args["resource_version"]
+                    msg = f"Resource version {rv} expired, retrying watch"
+                    logger.info(msg)
+                    del args["resource_version"]
+                else:
+                    # We can get a 410 error even when no resource version is
+                    # specified if there are long delays between reportable
+                    # events. Retry those as well.
+                    msg = "Watch expired (no resource version), retrying"
+                    logger.info(msg)
+
+            # The watch is about to be restarted.
+            await self._maybe_relist(args, logger)
+
+    async def _maybe_relist(
+        self, args: dict[str, Any], logger: BoundLogger
+    ) -> None:
+        """Relist objects if the watch would restart without a version.
+
+        A watch restarted without a resource version will never report
+        changes made while it was down, so if a relist function was provided,
+        give the caller a chance to resynchronize and resume the watch from
+        the resource version of that list.
+
+        Parameters
+        ----------
+        args
+            Arguments to the watch method, updated in place with the resource
+            version returned by the relist function.
+        logger
+            Logger to use.
+        """
+        if not self._relist or "resource_version" in args:
+            return
+        logger.info("Relisting objects before restarting watch")
+        resource_version = await self._relist()
+        if resource_version:
+            args["resource_version"] = resource_version
+        else:
+            args.pop("resource_version", None)
 
     async def _parse_events(
         self, stream: Watch, logger: BoundLogger
@@ -0,0 +1,68 @@
+"""Probe whether a user lab is responding to HTTP requests."""
+
+import asyncio
+
+from httpx import AsyncClient, HTTPError
+from structlog.stdlib import BoundLogger
+
+from ..constants import LAB_PROBE_INITIAL_DELAY, LAB_PROBE_MAX_DELAY
+from ..timeout import Timeout
+
+__all__ = ["LabProbe"]
+
+
+class LabProbe:
+    """Probe whether a user lab is responding to HTTP requests.
+
+    Kubernetes considers a lab pod to be running as soon as its container has
+    started, but the Jupyter server inside it may not answer requests for
+    some time after that. This storage layer polls the Jupyter server API
+    until it responds.
+
+    Parameters
+    ----------
+    http_client
+        Shared HTTP client.
+    logger
+        Logger to use.
+    """
+
+    def __init__(self, http_client: AsyncClient, logger: BoundLogger) -> None:
+        self._client = http_client
+        self._logger = logger
+
+    async def wait_for_ready(self, url: str, timeout: Timeout) -> None:
+        """Wait for a lab to respond to HTTP requests.
+
+        Requests the Jupyter server version from the API under the lab URL,
+        since that route does not require authentication. Retries with
+        exponential backoff until it returns success.
+
+        Parameters
+        ----------
+        url
+            Internal URL of the lab.
+        timeout
+            How long to wait for the lab to respond.
+
+        Raises
+        ------
+        ControllerTimeoutError
+            Raised if the timeout expired before the lab responded.
+        """
+        api_url = url.rstrip("/") + "/api"
+        logger = self._logger.bind(url=api_url)
+        delay = LAB_PROBE_INITIAL_DELAY.total_seconds()
+        async with timeout.enforce():
+            while True:
+                try:
+                    r = await self._client.get(api_url, timeout=timeout.left())
+                except HTTPError as e:
+                    error = f"{type(e).__name__}: {e!s}"
+                    logger.debug("Lab not yet responding", error=error)
+                else:
+                    if r.status_code == 200:
+                        return
+                    logger.debug("Lab not yet ready", status=r.status_code)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LAB_PROBE_MAX_DELAY.total_seconds())
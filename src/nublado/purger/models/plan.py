@@ -8,7 +8,15 @@ from typing import Annotated, override
 from pydantic import Field
 from safir.pydantic import CamelCaseModel
 
-__all__ = ["FileClass", "FileReason", "FileRecord", "Plan"]
+__all__ = [
+    "FileClass",
+    "FileReason",
+    "FileRecord",
+    "HorizonWarning",
+    "OwnerWarning",
+    "Plan",
+    "UsageRecord",
+]
 
 
 class FileClass(StrEnum):
@@ -33,6 +41,10 @@ class FileRecord(CamelCaseModel):
 
     path: Annotated[Path, Field(..., title="Path for file to purge.")]
 
+    owner: Annotated[int, Field(..., title="UID of the owner of the file.")]
+
+    size: Annotated[int, Field(..., title="Size of the file in bytes.")]
+
     file_class: Annotated[
         FileClass, Field(..., title="Class of file to purge (large or small).")
     ]
@@ -58,6 +70,19 @@ class FileRecord(CamelCaseModel):
         Field(..., title="Interval at which file is marked for deletion."),
     ]
 
+    horizon: Annotated[
+        datetime.timedelta,
+        Field(
+            ...,
+            title="Earliest horizon at which file would be purged.",
+            description=(
+                "Duration into the future at which the file first matches"
+                " the purge criteria, chosen from the horizons of the plan."
+                " Zero means the file would be purged now."
+            ),
+        ),
+    ]
+
     @override
     def __str__(self) -> str:
         # The __str__ methods for this and the enclosing plan are designed
@@ -69,6 +94,72 @@ class FileRecord(CamelCaseModel):
         )
 
 
+class HorizonWarning(CamelCaseModel):
+    """Files owned by one user that will be purged at one horizon."""
+
+    horizon: Annotated[
+        datetime.timedelta,
+        Field(..., title="Duration into the future of purge."),
+    ]
+
+    count: Annotated[int, Field(..., title="Number of files to be purged.")]
+
+    size: Annotated[
+        int, Field(..., title="Total size in bytes of files to be purged.")
+    ]
+
+    files: Annotated[list[Path], Field(..., title="Files to be purged.")]
+
+
+class OwnerWarning(CamelCaseModel):
+    """Summary of pending purges for files owned by one user."""
+
+    uid: Annotated[int, Field(..., title="UID of the owner of the files.")]
+
+    horizons: Annotated[
+        list[HorizonWarning],
+        Field(
+            ...,
+            title="Files to be purged at each horizon.",
+            description=(
+                "Sorted by horizon, earliest first. Horizons at which no"
+                " files owned by this user would first be purged are"
+                " omitted."
+            ),
+        ),
+    ]
+
+
+class UsageRecord(CamelCaseModel):
+    """Disk usage of files with one owner, file class, and directory policy.
+
+    Files are attributed to the most specific directory policy that applies
+    to them, matching the policy used to decide whether to purge them.
+    """
+
+    uid: Annotated[int, Field(..., title="UID of the owner of the files.")]
+
+    file_class: Annotated[
+        FileClass, Field(..., title="Class of files (large or small).")
+    ]
+
+    directory: Annotated[
+        Path, Field(..., title="Directory of the policy for the files.")
+    ]
+
+    files: Annotated[int, Field(..., title="Number of files.")]
+
+    size: Annotated[int, Field(..., title="Total size of files in bytes.")]
+
+    purge_files: Annotated[
+        int, Field(..., title="Number of files to be purged.")
+    ]
+
+    purge_size: Annotated[
+        int, Field(..., title="Total size of files to be purged in bytes.")
+    ]
+
+
 class Plan(CamelCaseModel):
     """List of files to be purged, and why."""
 
@@ -76,6 +167,43 @@ class Plan(CamelCaseModel):
         list[Path], Field(..., title="Directories considered")
     ]
     files: Annotated[list[FileRecord], Field(..., title="Files to purge")]
+    horizons: Annotated[
+        list[datetime.timedelta],
+        Field(..., title="Durations into the future for which plan was made"),
+    ]
+
+    usage: Annotated[
+        list[UsageRecord],
+        Field(..., title="Disk usage of all files considered"),
+    ]
+
+    def summarize_by_owner(self) -> list[OwnerWarning]:
+        """Group the files to be purged by owner and horizon.
+
+        Returns
+        -------
+        list of OwnerWarning
+            Summary for each UID that owns files to be purged, sorted by UID.
+        """
+        owners: dict[int, dict[datetime.timedelta, list[FileRecord]]] = {}
+        for record in self.files:
+            by_horizon = owners.setdefault(record.owner, {})
+            by_horizon.setdefault(record.horizon, []).append(record)
+        return [
+            OwnerWarning(
+                uid=uid,
+                horizons=[
+                    HorizonWarning(
+                        horizon=horizon,
+                        count=len(records),
+                        size=sum(r.size for r in records),
+                        files=[r.path for r in records],
+                    )
+                    for horizon, records in sorted(owners[uid].items())
+                ],
+            )
+            for uid in sorted(owners)
+        ]
 
     @override
     def __str__(self) -> str:
@@ -88,5 +216,9 @@ class Plan(CamelCaseModel):
             rs += "No matching files found.\n"
         else:
             for sf in self.files:
-                rs += f"  -> {sf.path!s}\n"
+                if len(self.horizons) > 1:
+                    horizon = int(sf.horizon.total_seconds())
+                    rs += f"  -> {sf.path!s} (in {horizon}s)\n"
+                else:
+                    rs += f"  -> {sf.path!s}\n"
         return rs
@@ -5,6 +5,9 @@ executing its plans.
 
 import datetime
 import errno
+import os
+import stat
+from dataclasses import dataclass
 from pathlib import Path
 
 import yaml
@@ -13,12 +16,29 @@ from structlog.stdlib import BoundLogger, get_logger
 from .config import Config
 from .constants import ROOT_LOGGER
 from .exceptions import PlanNotReadyError, PurgeFailedError
-from .models.plan import FileClass, FileReason, FileRecord, Plan
+from .models.plan import (
+    FileClass,
+    FileReason,
+    FileRecord,
+    OwnerWarning,
+    Plan,
+    UsageRecord,
+)
 from .models.v1.policy import DirectoryPolicy, Policy
 
 __all__ = ["Purger"]
 
 
+@dataclass(slots=True)
+class _UsageCounter:
+    """Running totals of usage for one owner, file class, and policy."""
+
+    files: int = 0
+    size: int = 0
+    purge_files: int = 0
+    purge_size: int = 0
+
+
 class Purger:
     """Object to plan and execute filesystem purges."""
 
@@ -37,8 +57,21 @@ class Purger:
         self._config.policy_file = policy_file
         self._logger.debug(f"Reset policy file: '{old}' -> '{policy_file}'")
 
-    async def plan(self) -> None:
-        """Scan our directories and assemble a plan."""
+    async def plan(
+        self, horizons: list[datetime.timedelta] | None = None
+    ) -> None:
+        """Scan our directories and assemble a plan.
+
+        Parameters
+        ----------
+        horizons
+            Durations into the future at which to evaluate the policy. Each
+            file that would be purged is classified into the earliest horizon
+            at which it would be purged, so warnings for several future times
+            can be generated from a single walk of the filesystem. If not
+            given, use the configured ``future_duration``, or the current
+            time if that is not set.
+        """
         self._logger.debug(f"Reloading policy from {self._config.policy_file}")
         policy_doc = yaml.safe_load(self._config.policy_file.read_text())
         policy = Policy.model_validate(policy_doc)
@@ -52,14 +85,14 @@ class Purger:
 
         # Set time at beginning of run
         now = datetime.datetime.now(tz=datetime.UTC)
-        then = now
-        later = self._config.future_duration
-        if later:
-            self._logger.info(
-                f"Planning for time {later.total_seconds()}s from now."
-            )
-            then += later
+        if horizons is None:
+            horizons = [self._config.future_duration or datetime.timedelta(0)]
+        horizons = sorted(set(horizons))
+        if any(horizons):
+            seconds = [int(h.total_seconds()) for h in horizons]
+            self._logger.info(f"Planning for times {seconds}s from now.")
         purge: list[FileRecord] = []
+        usage: dict[tuple[int, FileClass, Path], _UsageCounter] = {}
         while directories:
             # Take a directory (the longest remaining) off the end
             # of the list, and consider it.
@@ -77,19 +110,56 @@ class Purger:
                     continue
                 # Check each file.
                 for file in files:
+                    path = root / file
+                    st = self._stat_file(path)
+                    if st is None:
+                        continue
+                    if st.st_size >= current_policy.threshold:
+                        f_class = FileClass.LARGE
+                    else:
+                        f_class = FileClass.SMALL
                     purge_file = self._check_file(
-                        path=root / file, policy=current_policy, when=then
+                        path=path,
+                        st=st,
+                        file_class=f_class,
+                        policy=current_policy,
+                        now=now,
+                        horizons=horizons,
                     )
+                    # Accumulate usage while we have the stat results, so
+                    # that usage reporting doesn't need another walk.
+                    key = (st.st_uid, f_class, consider)
+                    counter = usage.setdefault(key, _UsageCounter())
+                    counter.files += 1
+                    counter.size += st.st_size
                     if purge_file is not None:
                         self._logger.debug(
                             f"Adding {purge_file} to purge list"
                         )
                         purge.append(purge_file)
+                        counter.purge_files += 1
+                        counter.purge_size += st.st_size
             # OK, we're done with this tree.  Skip it when
             # considering higher (shorter-named) directories.
             visited.insert(0, consider)
 
-        self._plan = Plan(files=purge, directories=visited)
+        self._plan = Plan(
+            files=purge,
+            directories=visited,
+            horizons=horizons,
+            usage=[
+                UsageRecord(
+                    uid=uid,
+                    file_class=f_class,
+                    directory=directory,
+                    files=counter.files,
+                    size=counter.size,
+                    purge_files=counter.purge_files,
+                    purge_size=counter.purge_size,
+                )
+                for (uid, f_class, directory), counter in sorted(usage.items())
+            ],
+        )
 
     def _get_directory_policy(
         self, path: Path, policy: Policy
@@ -105,28 +175,18 @@ class Purger:
     def _check_visited(self, root: Path, visited: list[Path]) -> bool:
         return any(vis == root or vis in root.parents for vis in visited)
 
-    def _check_file(
-        self, path: Path, policy: DirectoryPolicy, when: datetime.datetime
-    ) -> FileRecord | None:
-        # This is the actual meat of the purger.  We've found a file.
-        # Determine if it is large or small, and then compare its three
-        # times against our removal criteria.  If any of them match, mark
-        # it for deletion.
-        #
-        # If it is a match, return a FileRecord; if not, return None.
-        #
+    def _stat_file(self, path: Path) -> os.stat_result | None:
         # If it is a symlink, ignore it.  If it's a link to an actual file
         # managed by our policy, we'll get to it there, and if it isn't,
         # we shouldn't do anything about it.  That will leave a dangling
         # symlink and the directories leading down to it.  We might want to
         # think about this sometime, but it's only going to be a handful
         # of bytes in any event.
-        if path.is_symlink():
-            self._logger.debug(f"{path!s} is a symbolic link; skipping")
-            return None
-        self._logger.debug(f"Checking {path!s} against {policy} for {when}")
+        #
+        # lstat() tells us both whether it is a symlink and, if not, all the
+        # same information as stat(), saving a system call per file.
         try:
-            st = path.stat()
+            st = path.lstat()
         except FileNotFoundError as exc:
             self._logger.warning(f"{path!s} not found: {exc!s}; skipping")
             return None
@@ -134,49 +194,63 @@ class Purger:
             self._logger.warning(
                 f"Could not stat() '{path!s}': {exc!s}; skipping"
             )
-        # Get large-or-small policy, depending.
-        size = st.st_size
-        if size >= policy.threshold:
+            return None
+        if stat.S_ISLNK(st.st_mode):
+            self._logger.debug(f"{path!s} is a symbolic link; skipping")
+            return None
+        return st
+
+    def _check_file(
+        self,
+        *,
+        path: Path,
+        st: os.stat_result,
+        file_class: FileClass,
+        policy: DirectoryPolicy,
+        now: datetime.datetime,
+        horizons: list[datetime.timedelta],
+    ) -> FileRecord | None:
+        # This is the actual meat of the purger.  We've found a file and
+        # determined whether it is large or small.  Compare its three times
+        # against our removal criteria at each horizon, earliest first.  If
+        # any of them match, mark it for deletion at that horizon.
+        #
+        # If it is a match, return a FileRecord; if not, return None.
+        self._logger.debug(f"Checking {path!s} against {policy}")
+        if file_class == FileClass.LARGE:
             ivals = policy.intervals.large
-            f_class = FileClass.LARGE
         else:
             ivals = policy.intervals.small
-            f_class = FileClass.SMALL
         atime = datetime.datetime.fromtimestamp(st.st_atime, tz=datetime.UTC)
         ctime = datetime.datetime.fromtimestamp(st.st_ctime, tz=datetime.UTC)
         mtime = datetime.datetime.fromtimestamp(st.st_mtime, tz=datetime.UTC)
-        a_max = ivals.access_interval
-        c_max = ivals.creation_interval
-        m_max = ivals.modification_interval
-
-        # Check the file against the intervals
-        if a_max and (atime + a_max < when):
-            self._logger.debug(f"atime: {path!s}")
-            return FileRecord(
-                path=path,
-                file_class=f_class,
-                file_reason=FileReason.ATIME,
-                file_interval=when - atime,
-                criterion_interval=a_max,
-            )
-        if c_max and (ctime + c_max < when):
-            self._logger.debug(f"ctime: {path!s}")
-            return FileRecord(
-                path=path,
-                file_class=f_class,
-                file_reason=FileReason.CTIME,
-                file_interval=when - ctime,
-                criterion_interval=c_max,
-            )
-        if m_max and (mtime + m_max < when):
-            self._logger.debug(f"mtime: {path!s}")
-            return FileRecord(
-                path=path,
-                file_class=f_class,
-                file_reason=FileReason.MTIME,
-                file_interval=when - mtime,
-                criterion_interval=m_max,
-            )
+        criteria = (
+            (FileReason.ATIME, atime, ivals.access_interval),
+            (FileReason.CTIME, ctime, ivals.creation_interval),
+            (FileReason.MTIME, mtime, ivals.modification_interval),
+        )
+
+        # Check the file against the intervals at each horizon.  Horizons
+        # are sorted, so the first match is the earliest time at which the
+        # file would be purged.
+        for horizon in horizons:
+            when = now + horizon
+            for reason, timestamp, max_interval in criteria:
+                if max_interval and (timestamp + max_interval < when):
+                    self._logger.debug(
+                        f"{reason.value.lower()}: {path!s}",
+                        horizon=int(horizon.total_seconds()),
+                    )
+                    return FileRecord(
+                        path=path,
+                        owner=st.st_uid,
+                        size=st.st_size,
+                        file_class=file_class,
+                        file_reason=reason,
+                        file_interval=when - timestamp,
+                        criterion_interval=max_interval,
+                        horizon=horizon,
+                    )
         return None
 
     async def report(self) -> None:
@@ -186,6 +260,42 @@ class Purger:
         rpt_text = str(self._plan)
         self._logger.info(rpt_text)
 
+    async def warn(self) -> list[OwnerWarning]:
+        """Summarize the files to be purged by owner and horizon.
+
+        Returns
+        -------
+        list of OwnerWarning
+            One entry per UID owning files in the plan, sorted by UID,
+            suitable for use by a job that notifies users of pending purges.
+
+        Raises
+        ------
+        PlanNotReadyError
+            Raised if `plan` has not been called.
+        """
+        if self._plan is None:
+            raise PlanNotReadyError("Cannot warn: plan not ready")
+        return self._plan.summarize_by_owner()
+
+    async def usage(self) -> list[UsageRecord]:
+        """Return the disk usage gathered while making the plan.
+
+        Returns
+        -------
+        list of UsageRecord
+            Usage and purge candidates by owner, file class, and directory
+            policy, sorted in that order.
+
+        Raises
+        ------
+        PlanNotReadyError
+            Raised if `plan` has not been called.
+        """
+        if self._plan is None:
+            raise PlanNotReadyError("Cannot report usage: plan not ready")
+        return self._plan.usage
+
     async def purge(self) -> None:
         if self._plan is None:
             raise PlanNotReadyError("Cannot purge: plan not ready")
@@ -195,9 +305,9 @@ class Purger:
             )
             await self.report()
             return
-        if self._config.future_duration:
+        if self._config.future_duration or any(self._plan.horizons):
             self._logger.warning(
-                "Cannot purge because future_duration is set; reporting"
+                "Cannot purge because plan is for a future time; reporting"
                 " instead"
             )
             await self.report()
@@ -1,6 +1,7 @@
 """Test fixtures for jupyterlab-controller tests."""
 
 from collections.abc import AsyncIterator, Iterator
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
@@ -133,7 +134,18 @@ def mock_kubernetes(data: NubladoData) -> Iterator[MockKubernetesApi]:
         account = V1ServiceAccount(metadata=V1ObjectMeta(name="default"))
         await mock.create_namespaced_service_account(name, account)
 
-    with patch_kubernetes() as mock:
+    # The Safir mock does not support listing ConfigMap objects, but the
+    # storage class binds the list method when it is created. Nublado never
+    # lists or watches ConfigMap objects, so any call is an error.
+    with (
+        patch_kubernetes() as mock,
+        patch.object(
+            mock,
+            "list_namespaced_config_map",
+            create=True,
+            side_effect=AssertionError("Listing ConfigMaps not supported"),
+        ),
+    ):
         mock.set_nodes_for_test(nodes)
         mock.register_create_hook_for_test("Namespace", create_default)
         yield mock
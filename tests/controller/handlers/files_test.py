@@ -17,8 +17,10 @@ from ...support.config import configure
 from ...support.data import NubladoData
 from ...support.fileserver import (
     create_ingress_for_user,
+    create_working_ingress,
     create_working_ingress_for_user,
     delete_ingress_for_user,
+    wait_for_shells,
 )
 from ...support.gafaelfawr import GafaelfawrTestUser
 
@@ -464,3 +466,75 @@ async def test_start_errors(
         assert [
             o for o in objs if o.kind not in ("Namespace", "ServiceAccount")
         ] == []
+
+
+@pytest.mark.asyncio
+async def test_warm_pool(
+    *,
+    client: AsyncClient,
+    data: NubladoData,
+    user: GafaelfawrTestUser,
+    mock_kubernetes: MockKubernetesApi,
+) -> None:
+    config = await configure(data, "fileserver-pool", mock_kubernetes)
+    assert config.fileserver.enabled
+    username = user.username
+    namespace = config.fileserver.namespace
+
+    # The controller should create a shell and wait for its Ingress to get an
+    # IP address. Simulate Gafaelfawr and the ingress controller.
+    shell = await wait_for_shells(mock_kubernetes, namespace, set())
+    await create_working_ingress(mock_kubernetes, shell, namespace)
+    await asyncio.sleep(0.1)
+
+    # Start a user fileserver without creating an Ingress for it. This only
+    # succeeds if the fileserver was bound to the shell.
+    r = await client.get("/files", headers=user.to_test_headers())
+    assert r.status_code == 200
+    r = await client.get("/nublado/fileserver/v1/users")
+    assert r.json() == [username]
+
+    # The shell's GafaelfawrIngress should now serve the user, and the job
+    # and pod should record and select the shell.
+    ingress = await mock_kubernetes.get_namespaced_custom_object(
+        "gafaelfawr.lsst.io",
+        "v1alpha1",
+        namespace,
+        "gafaelfawringresses",
+        shell,
+    )
+    assert ingress["config"]["username"] == username
+    assert ingress["metadata"]["labels"]["nublado.lsst.io/user"] == username
+    job = await mock_kubernetes.read_namespaced_job(
+        f"{username}-fs", namespace
+    )
+    annotation = job.metadata.annotations["nublado.lsst.io/fileserver-shell"]
+    assert annotation == shell
+    pods = await mock_kubernetes.list_namespaced_pod(
+        namespace, label_selector=f"nublado.lsst.io/fileserver-shell={shell}"
+    )
+    assert len(pods.items) == 1
+    services = await mock_kubernetes.list_namespaced_service(namespace)
+    assert f"{username}-fs" not in {s.metadata.name for s in services.items}
+
+    # The pool should be refilled with a new shell, and reconcile should not
+    # delete the bound shell.
+    new_shell = await wait_for_shells(mock_kubernetes, namespace, {shell})
+    assert new_shell != shell
+    await asyncio.sleep(config.fileserver.reconcile_interval.total_seconds())
+    r = await client.get("/nublado/fileserver/v1/users")
+    assert r.json() == [username]
+
+    # Deleting the fileserver deletes the bound shell.
+    await mock_kubernetes.delete_namespaced_ingress(shell, namespace)
+    r = await client.delete(f"/nublado/fileserver/v1/users/{username}")
+    assert r.status_code == 204
+    with pytest.raises(ApiException) as excinfo:
+        await mock_kubernetes.get_namespaced_custom_object(
+            "gafaelfawr.lsst.io",
+            "v1alpha1",
+            namespace,
+            "gafaelfawringresses",
+            shell,
+        )
+    assert excinfo.value.status == 404
@@ -15,6 +15,7 @@ from kubernetes_asyncio.client import (
     CoreV1Event,
     V1ObjectMeta,
     V1ObjectReference,
+    V1Secret,
     V1ServiceAccount,
 )
 from safir.metrics import MockEventPublisher
@@ -158,6 +159,14 @@ async def test_lab_start_stop(
                 "memory_limit": size.resources.limits.memory,
                 "memory_request": size.resources.requests.memory,
                 "elapsed": ANY,
+                "queue_elapsed": None,
+                "delete_elapsed": None,
+                "secrets_elapsed": ANY,
+                "create_elapsed": ANY,
+                "schedule_elapsed": None,
+                "pull_elapsed": None,
+                "start_elapsed": ANY,
+                "ready_elapsed": None,
             }
         ]
     )
@@ -394,6 +403,147 @@ async def test_delayed_spawn(
     events = await get_lab_events(client, user.username)
     data.assert_json_matches(events, "controller/spawn/events-delayed")
 
+    # A client that reconnects with Last-Event-ID should only get the events
+    # after that one. An unrecognized ID replays the full stream.
+    url = f"/nublado/spawner/v1/labs/{user.username}/events"
+    async with aconnect_sse(
+        client, "GET", url, headers=user.to_test_headers()
+    ) as source:
+        ids = [sse.id async for sse in source.aiter_sse()]
+    assert len(set(ids)) == len(events)
+    headers = {**user.to_test_headers(), "Last-Event-ID": ids[-3]}
+    async with aconnect_sse(client, "GET", url, headers=headers) as source:
+        resumed = [
+            {"event": sse.event, "data": sse.data}
+            async for sse in source.aiter_sse()
+        ]
+    assert resumed == events[-2:]
+    headers = {**user.to_test_headers(), "Last-Event-ID": "unknown-1"}
+    async with aconnect_sse(client, "GET", url, headers=headers) as source:
+        resumed = [
+            {"event": sse.event, "data": sse.data}
+            async for sse in source.aiter_sse()
+        ]
+    assert resumed == events
+
+
+@pytest.mark.asyncio
+async def test_spawn_metrics(
+    *,
+    client: AsyncClient,
+    data: NubladoData,
+    factory: Factory,
+    user: GafaelfawrTestUser,
+    mock_kubernetes: MockKubernetesApi,
+) -> None:
+    assert context_dependency._process_context
+    lab_events = context_dependency._process_context.lab_manager._events
+    lab = data.read_pydantic(
+        LabSpecification, "controller/base/lab-specification"
+    )
+    mock_kubernetes.initial_pod_phase = PodPhase.PENDING.value
+
+    # Before any spawns, all histograms should be empty.
+    r = await client.get("/nublado/spawner/v1/metrics/spawn")
+    assert r.status_code == 200
+    metrics = r.json()
+    assert metrics["total"]["count"] == 0
+    assert all(h["count"] == 0 for h in metrics["phases"].values())
+
+    r = await client.post(
+        f"/nublado/spawner/v1/labs/{user.username}/create",
+        json={"options": lab.options.model_dump(), "env": lab.env},
+        headers=user.to_test_headers(),
+    )
+    assert r.status_code == 201
+    await asyncio.sleep(0.1)
+
+    # Post the events that mark scheduling and image pulls.
+    namespace = f"userlabs-{user.username}"
+    name = f"{user.username}-nb"
+    for i, (reason, message) in enumerate(
+        (
+            ("Scheduled", "Successfully assigned pod to node"),
+            ("Pulling", "Pulling image"),
+            ("Pulled", "Successfully pulled image"),
+        )
+    ):
+        event = CoreV1Event(
+            metadata=V1ObjectMeta(name=f"{name}-{i}", namespace=namespace),
+            message=message,
+            reason=reason,
+            involved_object=V1ObjectReference(
+                kind="Pod", name=name, namespace=namespace
+            ),
+        )
+        await mock_kubernetes.create_namespaced_event(namespace, event)
+        await asyncio.sleep(0.1)
+    await mock_kubernetes.patch_namespaced_pod_status(
+        name,
+        namespace,
+        [
+            {
+                "op": "replace",
+                "path": "/status/phase",
+                "value": PodPhase.RUNNING.value,
+            }
+        ],
+    )
+    events = await get_lab_events(client, user.username)
+    assert events[-1]["event"] == "complete"
+
+    # The metrics event should break down the time spent in each phase.
+    assert isinstance(lab_events.spawn_success, MockEventPublisher)
+    event = lab_events.spawn_success.published[0]
+    assert event.queue_elapsed is None
+    assert event.delete_elapsed is None
+    assert event.schedule_elapsed
+    assert event.pull_elapsed
+    assert event.start_elapsed is not None
+    assert event.ready_elapsed is None
+
+    # And the spawn should be recorded in the histograms.
+    r = await client.get("/nublado/spawner/v1/metrics/spawn")
+    assert r.status_code == 200
+    metrics = r.json()
+    assert metrics["total"]["count"] == 1
+    assert metrics["total"]["buckets"][-1] == {"le": None, "count": 1}
+    assert metrics["total"]["sum"] >= 0.3
+    for phase in ("secrets", "create", "schedule", "pull", "start"):
+        assert metrics["phases"][phase]["count"] == 1
+    for phase in ("queue", "delete", "ready"):
+        assert metrics["phases"][phase]["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_secret_status(
+    *,
+    client: AsyncClient,
+    data: NubladoData,
+    mock_kubernetes: MockKubernetesApi,
+) -> None:
+    assert context_dependency._process_context
+    lab_manager = context_dependency._process_context.lab_manager
+
+    # All of the configured secrets were created before startup.
+    r = await client.get("/nublado/spawner/v1/secrets")
+    assert r.status_code == 200
+    assert r.json() == {"problems": []}
+
+    # Remove a key from one of the secrets and check that the next refresh
+    # reports it.
+    namespace = data.read_text("controller/metadata/namespace", strip=True)
+    secret = V1Secret(metadata=V1ObjectMeta(name="extra-secret"), data={})
+    await mock_kubernetes.replace_namespaced_secret(
+        "extra-secret", namespace, secret
+    )
+    await lab_manager.refresh_secrets()
+    r = await client.get("/nublado/spawner/v1/secrets")
+    assert r.status_code == 200
+    problems = r.json()["problems"]
+    assert len(problems) == 1
+    assert "db-password" in problems[0]
+
 
 @pytest.mark.asyncio
 async def test_abort_spawn(
@@ -676,12 +826,6 @@ async def test_spawn_errors(
             "Namespace",
             "userlabs-rachel",
         ),
-        (
-            "read_namespaced_secret",
-            "reading object",
-            "Secret",
-            "nublado/extra-secret",
-        ),
         (
             "create_namespaced_secret",
             "creating object",
@@ -0,0 +1,71 @@
+"""Tests for lab spawn admission control."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+import structlog
+
+from nublado.controller.constants import SPAWN_LATENCY_TARGET
+from nublado.controller.services.admission import SpawnAdmission
+
+
+@pytest.mark.asyncio
+async def test_admission() -> None:
+    admission = SpawnAdmission(2, structlog.get_logger(__name__))
+    positions: dict[str, list[int]] = {"c": [], "d": []}
+    release = {u: asyncio.Event() for u in ("a", "b", "c", "d")}
+    started: list[str] = []
+
+    async def spawn(username: str) -> None:
+        on_queued = (
+            positions[username].append if username in positions else None
+        )
+        async with admission.admit(on_queued):
+            started.append(username)
+            await release[username].wait()
+
+    tasks = {u: asyncio.create_task(spawn(u)) for u in ("a", "b", "c", "d")}
+    await asyncio.sleep(0.1)
+    assert started == ["a", "b"]
+    assert admission.active == 2
+    assert admission.queued == 2
+    assert positions == {"c": [1], "d": [2]}
+
+    # Finishing a spawn admits the next one in line and moves everyone else
+    # up.
+    release["b"].set()
+    await asyncio.sleep(0.1)
+    assert started == ["a", "b", "c"]
+    assert positions == {"c": [1], "d": [2, 1]}
+
+    # Cancelling a queued spawn removes it from the queue.
+    tasks["d"].cancel()
+    await asyncio.sleep(0.1)
+    assert admission.queued == 0
+    for event in release.values():
+        event.set()
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+    assert admission.active == 0
+
+
+@pytest.mark.asyncio
+async def test_backpressure() -> None:
+    admission = SpawnAdmission(10, structlog.get_logger(__name__))
+    assert admission.limit == 10
+    admission.record_latency(SPAWN_LATENCY_TARGET / 2)
+    assert admission.limit == 10
+    admission.record_latency(SPAWN_LATENCY_TARGET * 20)
+    limit = admission.limit
+    assert limit
+    assert 1 <= limit < 10
+    for _ in range(50):
+        admission.record_latency(timedelta(seconds=0))
+    assert admission.limit == 10
+
+    # Without a limit, spawns are always admitted immediately.
+    admission = SpawnAdmission(None, structlog.get_logger(__name__))
+    admission.record_latency(SPAWN_LATENCY_TARGET * 20)
+    assert admission.limit is None
+    async with admission.admit():
+        assert admission.queued == 0
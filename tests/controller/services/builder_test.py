@@ -0,0 +1,88 @@
+"""Tests for construction of lab Kubernetes objects."""
+
+import time
+from collections.abc import Callable
+
+import pytest
+from kubernetes_asyncio.client import ApiClient, V1Toleration
+
+from nublado.controller.config import Config
+from nublado.controller.factory import Factory
+from nublado.controller.models.domain.docker import DockerReference
+from nublado.controller.models.domain.gafaelfawr import GafaelfawrUser
+from nublado.controller.models.v1.lab import LabSpecification
+
+from ...support.data import NubladoData
+
+
+@pytest.mark.asyncio
+async def test_build_lab(
+    *,
+    config: Config,
+    data: NubladoData,
+    factory: Factory,
+    user: GafaelfawrUser,
+) -> None:
+    lab = data.read_pydantic(
+        LabSpecification, "controller/base/lab-specification"
+    )
+    await factory.image_service.refresh()
+    assert lab.options.image_list
+    reference = DockerReference.from_str(lab.options.image_list)
+    image = await factory.image_service.image_for_reference(reference)
+    lab_builder = factory.create_lab_builder()
+    other = user.model_copy(update={"username": "other", "uid": 4000})
+    api_client = ApiClient()
+
+    # Objects built from the shared skeleton must not leak between users, and
+    # modifying the objects for one lab must not affect the next lab built.
+    objects = await lab_builder.build_lab(
+        user=user, lab=lab, image=image, secrets={}
+    )
+    expected = api_client.sanitize_for_serialization(objects.pod)
+    objects.pod.spec.volumes.clear()
+    objects.pod.spec.containers[0].volume_mounts.clear()
+    objects.pod.spec.tolerations.append(V1Toleration(key="extra"))
+    other_objects = await lab_builder.build_lab(
+        user=other, lab=lab, image=image, secrets={}
+    )
+    pod = other_objects.pod
+    assert pod.metadata.name == "other-nb"
+    assert pod.spec.containers[0].security_context.run_as_user == 4000
+    assert all(
+        "rachel" not in c.metadata.name for c in other_objects.config_maps
+    )
+    objects = await lab_builder.build_lab(
+        user=user, lab=lab, image=image, secrets={}
+    )
+    assert api_client.sanitize_for_serialization(objects.pod) == expected
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_build_lab_benchmark(
+    *,
+    data: NubladoData,
+    factory: Factory,
+    user: GafaelfawrUser,
+    record_property: Callable[[str, object], None],
+) -> None:
+    lab = data.read_pydantic(
+        LabSpecification, "controller/base/lab-specification"
+    )
+    await factory.image_service.refresh()
+    assert lab.options.image_list
+    reference = DockerReference.from_str(lab.options.image_list)
+    image = await factory.image_service.image_for_reference(reference)
+    lab_builder = factory.create_lab_builder()
+
+    # Record the rate at which the builder alone can construct labs in the
+    # test report.
+    count = 200
+    start = time.perf_counter()
+    for _ in range(count):
+        await lab_builder.build_lab(
+            user=user, lab=lab, image=image, secrets={}
+        )
+    elapsed = time.perf_counter() - start
+    record_property("labs_per_second", count / elapsed)
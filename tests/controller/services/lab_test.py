@@ -6,10 +6,19 @@ state with Kubernetes.
 """
 
 import asyncio
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
-from kubernetes_asyncio.client import ApiException
+import respx
+from httpx import Response
+from kubernetes_asyncio.client import (
+    ApiException,
+    V1ConfigMap,
+    V1ObjectMeta,
+    V1Secret,
+)
 from safir.metrics import MockEventPublisher
 from safir.testing.kubernetes import MockKubernetesApi
 
@@ -18,8 +27,15 @@ from nublado.controller.factory import Factory
 from nublado.controller.models.domain.docker import DockerReference
 from nublado.controller.models.domain.gafaelfawr import GafaelfawrUser
 from nublado.controller.models.domain.kubernetes import PodPhase
+from nublado.controller.models.domain.lab import (
+    Event,
+    EventType,
+    LabJournalEntry,
+)
 from nublado.controller.models.v1.lab import (
     LabOptions,
+    LabResources,
+    LabSize,
     LabSpecification,
     LabState,
     LabStatus,
@@ -27,9 +43,17 @@ from nublado.controller.models.v1.lab import (
     UserGroup,
     UserInfo,
 )
+from nublado.controller.services.lab import (
+    _LabMonitor,
+    _LabOperation,
+    _LabStore,
+    _State,
+)
+from nublado.controller.storage.journal import LabJournal
 from nublado.controller.timeout import Timeout
 
 from ...support.data import NubladoData
+from ...support.docker import MockDockerRegistry
 
 
 async def create_lab(
@@ -210,6 +234,58 @@ async def test_reconcile_pending(
     assert state.model_dump() == expected.model_dump()
 
 
+@pytest.mark.asyncio
+async def test_reconcile_journal(
+    *,
+    config: Config,
+    data: NubladoData,
+    factory: Factory,
+    user: GafaelfawrUser,
+    mock_kubernetes: MockKubernetesApi,
+    tmp_path: Path,
+) -> None:
+    mock_kubernetes.initial_pod_phase = PodPhase.PENDING.value
+    await create_lab(
+        config=config,
+        data=data,
+        factory=factory,
+        user=user,
+        mock_kubernetes=mock_kubernetes,
+    )
+
+    # Record a journal entry for the spawn as if a previous controller had
+    # started it.
+    config.lab.journal_path = tmp_path / "journal.sqlite"
+    journal = LabJournal(config.lab.journal_path)
+    started = datetime.now(tz=UTC) - timedelta(minutes=1)
+    events = [
+        Event(type=EventType.INFO, message="Starting", progress=1),
+        Event(type=EventType.INFO, message="Created objects", progress=30),
+    ]
+    entry = LabJournalEntry(operation="spawn", started=started, events=events)
+    await journal.write(user.username, entry)
+
+    # A controller started with that journal should restore the event history
+    # when it resumes monitoring the spawn.
+    async with Factory.standalone(config) as restarted:
+        await restarted.start_background_services()
+        await asyncio.sleep(0.1)
+        iterator = restarted.lab_manager.events_for_user(user.username)
+        frames = [await anext(iterator) for _ in range(3)]
+        assert b"Starting" in frames[0]
+        assert b"Created objects" in frames[1]
+        assert b"Resuming monitoring" in frames[2]
+        assert b'"progress": 30' in frames[2]
+
+        # Flushing the journal should record the resumed operation with its
+        # original start time.
+        await restarted.lab_manager.flush_journal()
+        entries = await journal.read_all()
+        assert entries[user.username].started == started
+        assert len(entries[user.username].events) == 3
+        await restarted.stop_background_services()
+
+
 @pytest.mark.asyncio
 async def test_reconcile_succeeded(
     *,
@@ -292,3 +368,347 @@ async def test_spawn_timeout(
     assert b"Lab spawn failed" in events[-1]
     assert events[-2]
     assert b"Lab spawn timed out" in events[-2]
+
+
+@pytest.mark.asyncio
+async def test_spawn_admission(
+    *,
+    config: Config,
+    data: NubladoData,
+    user: GafaelfawrUser,
+    mock_docker: MockDockerRegistry,
+    mock_kubernetes: MockKubernetesApi,
+) -> None:
+    namespace = data.read_text("controller/metadata/namespace", strip=True)
+    for secret in data.read_secrets("controller/base/secrets"):
+        await mock_kubernetes.create_namespaced_secret(namespace, secret)
+    mock_kubernetes.initial_pod_phase = PodPhase.PENDING.value
+    config.lab.spawn_concurrency = 1
+    lab = data.read_pydantic(
+        LabSpecification, "controller/base/lab-specification"
+    )
+    other = user.model_copy(update={"username": "other"})
+
+    # Only one spawn may create Kubernetes objects at a time, but once the
+    # first spawn has created its objects, it should release its slot while
+    # waiting for its pod to start so that the second spawn can proceed.
+    async with Factory.standalone(config) as factory:
+        await factory.start_background_services()
+        await factory.lab_manager.create_lab(user, lab)
+        await factory.lab_manager.create_lab(other, lab)
+        await asyncio.sleep(0.1)
+        for username in (user.username, other.username):
+            await mock_kubernetes.read_namespace(f"userlabs-{username}")
+            state = await factory.lab_manager.get_lab_state(username)
+            assert state
+            assert state.status == LabStatus.PENDING
+        await factory.stop_background_services()
+
+
+@pytest.mark.asyncio
+async def test_refresh_secrets(
+    *,
+    data: NubladoData,
+    factory: Factory,
+    user: GafaelfawrUser,
+    mock_kubernetes: MockKubernetesApi,
+) -> None:
+    # None of the configured secrets exist yet, which should be reported as
+    # problems by the refresh.
+    await factory.lab_manager.refresh_secrets()
+    assert factory.lab_manager.get_secret_status().problems
+
+    # Create the secrets, but with one of the configured keys missing. That
+    # should be reported as a problem.
+    namespace = data.read_text("controller/metadata/namespace", strip=True)
+    secrets = data.read_secrets("controller/base/secrets")
+    for secret in secrets:
+        if secret.metadata.name == "extra-secret":
+            incomplete = V1Secret(metadata=secret.metadata, data={})
+            await mock_kubernetes.create_namespaced_secret(
+                namespace, incomplete
+            )
+        else:
+            await mock_kubernetes.create_namespaced_secret(namespace, secret)
+    await factory.lab_manager.refresh_secrets()
+    problems = factory.lab_manager.get_secret_status().problems
+    assert len(problems) == 1
+    assert "db-password" in problems[0]
+
+    # Add the missing key. Gathering the secret data for a lab should notice
+    # that the cached secret is missing the key and read it again.
+    for secret in secrets:
+        if secret.metadata.name == "extra-secret":
+            await mock_kubernetes.replace_namespaced_secret(
+                "extra-secret", namespace, secret
+            )
+    timeout = Timeout("Gather secrets", timedelta(seconds=5), user.username)
+    secret_data = await factory.lab_manager._gather_secret_data(user, timeout)
+    assert "db-password" in secret_data
+
+    # The next refresh should find no problems.
+    await factory.lab_manager.refresh_secrets()
+    assert factory.lab_manager.get_secret_status().problems == []
+
+
+@pytest.mark.asyncio
+async def test_readiness_probe(
+    *,
+    config: Config,
+    data: NubladoData,
+    factory: Factory,
+    user: GafaelfawrUser,
+    mock_kubernetes: MockKubernetesApi,
+    respx_mock: respx.Router,
+) -> None:
+    namespace = data.read_text("controller/metadata/namespace", strip=True)
+    for secret in data.read_secrets("controller/base/secrets"):
+        await mock_kubernetes.create_namespaced_secret(namespace, secret)
+    config.lab.readiness_probe = True
+    lab = data.read_pydantic(
+        LabSpecification, "controller/base/lab-specification"
+    )
+    lab_builder = factory.create_lab_builder()
+    url = lab_builder.build_internal_url(user.username, lab.env)
+    route = respx_mock.get(url.rstrip("/") + "/api")
+    route.side_effect = [
+        Response(503),
+        Response(200, json={"version": "2.14.0"}),
+    ]
+    await factory.start_background_services()
+
+    # The spawn should not complete until the lab responds to the probe.
+    await factory.lab_manager.create_lab(user, lab)
+    events = [
+        e async for e in factory.lab_manager.events_for_user(user.username)
+    ]
+    assert b"waiting for lab" in events[-2]
+    assert b"event: complete" in events[-1]
+    assert route.call_count == 2
+    state = await factory.lab_manager.get_lab_state(user.username)
+    assert state
+    assert state.status == LabStatus.RUNNING
+
+    # The time until the lab responded should be reported in the metrics.
+    lab_events = factory._context.lab_manager._events
+    assert isinstance(lab_events.spawn_success, MockEventPublisher)
+    assert lab_events.spawn_success.published[0].ready_elapsed
+
+
+@pytest.mark.asyncio
+async def test_suspend_lab(
+    *,
+    config: Config,
+    data: NubladoData,
+    factory: Factory,
+    user: GafaelfawrUser,
+    mock_kubernetes: MockKubernetesApi,
+) -> None:
+    namespace = data.read_text("controller/metadata/namespace", strip=True)
+    for secret in data.read_secrets("controller/base/secrets"):
+        await mock_kubernetes.create_namespaced_secret(namespace, secret)
+    config.lab.suspend_timeout = timedelta(hours=1)
+    lab = data.read_pydantic(
+        LabSpecification, "controller/base/lab-specification"
+    )
+    names = factory.create_lab_builder().build_object_names(user.username)
+    await factory.start_background_services()
+
+    async def spawn() -> None:
+        await factory.lab_manager.create_lab(user, lab)
+        events = factory.lab_manager.events_for_user(user.username)
+        assert b"event: complete" in [e async for e in events][-1]
+
+    async def suspend() -> None:
+        await factory.lab_manager.delete_lab(user.username)
+        assert not await factory.lab_manager.get_lab_state(user.username)
+        with pytest.raises(ApiException) as excinfo:
+            await mock_kubernetes.read_namespaced_pod(
+                names.pod, names.namespace
+            )
+        assert excinfo.value.status == 404
+        await mock_kubernetes.read_namespaced_config_map(
+            names.suspension, names.namespace
+        )
+
+    # Stopping the lab should leave the namespace in place. Add an extra
+    # object to the namespace to detect whether it is recreated.
+    await spawn()
+    await suspend()
+    sentinel = V1ConfigMap(metadata=V1ObjectMeta(name="sentinel"))
+    await mock_kubernetes.create_namespaced_config_map(
+        names.namespace, sentinel
+    )
+
+    # Spawning a lab with the same settings should reuse the namespace.
+    await spawn()
+    await mock_kubernetes.read_namespaced_config_map(
+        "sentinel", names.namespace
+    )
+    with pytest.raises(ApiException):
+        await mock_kubernetes.read_namespaced_config_map(
+            names.suspension, names.namespace
+        )
+
+    # If the preserved objects don't match, the namespace should be deleted
+    # and the lab created from scratch.
+    await suspend()
+    marker = await mock_kubernetes.read_namespaced_config_map(
+        names.suspension, names.namespace
+    )
+    await mock_kubernetes.delete_namespaced_config_map(
+        names.suspension, names.namespace
+    )
+    marker = V1ConfigMap(
+        metadata=V1ObjectMeta(name=names.suspension),
+        data={**marker.data, "digest": "mismatch"},
+    )
+    await mock_kubernetes.create_namespaced_config_map(names.namespace, marker)
+    await spawn()
+    with pytest.raises(ApiException):
+        await mock_kubernetes.read_namespaced_config_map(
+            "sentinel", names.namespace
+        )
+
+    # Reconciliation should leave recently suspended labs alone but delete
+    # ones that have been suspended for longer than the timeout.
+    await suspend()
+    await factory.lab_manager.reconcile()
+    await mock_kubernetes.read_namespace(names.namespace)
+    marker = await mock_kubernetes.read_namespaced_config_map(
+        names.suspension, names.namespace
+    )
+    await mock_kubernetes.delete_namespaced_config_map(
+        names.suspension, names.namespace
+    )
+    suspended = datetime.now(tz=UTC) - timedelta(hours=2)
+    marker = V1ConfigMap(
+        metadata=V1ObjectMeta(name=names.suspension),
+        data={**marker.data, "suspended": suspended.isoformat()},
+    )
+    await mock_kubernetes.create_namespaced_config_map(names.namespace, marker)
+    await factory.lab_manager.reconcile()
+    with pytest.raises(ApiException):
+        await mock_kubernetes.read_namespace(names.namespace)
+
+
+def build_lab_state(username: str, status: LabStatus) -> LabState:
+    """Build minimal lab state for a user for tests of the lab store."""
+    quantity = ResourceQuantity(cpu=1.0, memory=1024 * 1024 * 1024)
+    return LabState(
+        user=UserInfo(username=username, uid=1000, gid=1000),
+        options=LabOptions(
+            image="lighthouse.ceres/library/sketchbook:latest@sha256:1234",
+            size=LabSize.SMALL,
+        ),
+        resources=LabResources(limits=quantity, requests=quantity),
+        status=status,
+    )
+
+
+def build_monitor() -> Mock:
+    """Build a mock lab monitor with a completed spawn to reap."""
+    monitor = Mock(spec=_LabMonitor)
+    monitor.in_progress = _LabOperation.SPAWN
+    monitor.is_done.return_value = True
+    return monitor
+
+
+@pytest.mark.asyncio
+async def test_lab_store_index() -> None:
+    store = _LabStore()
+    for username in ("alice", "bob", "carol"):
+        state = build_lab_state(username, LabStatus.PENDING)
+        store.add(
+            username, _State(monitor=Mock(spec=_LabMonitor), state=state)
+        )
+    store.add("dave", _State(monitor=Mock(spec=_LabMonitor)))
+    assert store.count(LabStatus.PENDING) == 3
+    assert sorted(store.list_users()) == ["alice", "bob", "carol"]
+    assert store.usernames() == {"alice", "bob", "carol", "dave"}
+
+    # Status changes move users between statuses in the index.
+    alice = store["alice"].state
+    assert alice
+    store.set_status(alice, LabStatus.RUNNING)
+    store.set_status(alice, LabStatus.RUNNING)
+    assert store.list_users(LabStatus.RUNNING) == ["alice"]
+    assert sorted(store.list_users(LabStatus.PENDING)) == ["bob", "carol"]
+
+    # Changing the status of state that is no longer current does not affect
+    # the index.
+    bob = store["bob"].state
+    assert bob
+    store.set_state("bob", build_lab_state("bob", LabStatus.PENDING))
+    store.set_status(bob, LabStatus.FAILED)
+    assert store.count(LabStatus.FAILED) == 0
+    assert sorted(store.list_users(LabStatus.PENDING)) == ["bob", "carol"]
+
+    # Replacing the state reindexes the user, and removing it drops them from
+    # the index but not the store.
+    store.set_state("carol", build_lab_state("carol", LabStatus.TERMINATED))
+    store.set_state("dave", build_lab_state("dave", LabStatus.PENDING))
+    store.set_state("bob", None)
+    assert store.list_users(LabStatus.TERMINATED) == ["carol"]
+    assert store.list_users(LabStatus.PENDING) == ["dave"]
+    assert sorted(store.list_users()) == ["alice", "carol", "dave"]
+    assert "bob" in store
+
+    # Clearing the store also clears the index and the completed queue.
+    store.mark_completed("alice")
+    assert len(store.clear()) == 4
+    assert store.list_users() == []
+    assert all(store.count(s) == 0 for s in LabStatus)
+
+
+@pytest.mark.asyncio
+async def test_lab_store_completed() -> None:
+    store = _LabStore()
+    store.mark_completed("bob")
+    store.mark_completed("alice")
+    store.mark_completed("bob")
+    assert await store.wait_for_completed() == ["bob", "alice"]
+
+    # Once the queue is drained, waiting blocks until another operation
+    # completes.
+    waiter = asyncio.create_task(store.wait_for_completed())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    store.mark_completed("carol")
+    async with asyncio.timeout(1):
+        assert await waiter == ["carol"]
+
+
+@pytest.mark.asyncio
+async def test_reap_spawners(factory: Factory) -> None:
+    lab_manager = factory.lab_manager
+    monitors: dict[str, Mock] = {}
+    reaped: dict[str, asyncio.Event] = {}
+    for username in ("alice", "bob", "carol"):
+        reaped[username] = asyncio.Event()
+        monitor = build_monitor()
+        monitor.wait.side_effect = reaped[username].set
+        state = build_lab_state(username, LabStatus.RUNNING)
+        lab_manager._labs.add(username, _State(monitor=monitor, state=state))
+        monitors[username] = monitor
+
+    # Only users whose operations were marked completed should be reaped,
+    # even though the operations of all users are done.
+    reaper = asyncio.create_task(lab_manager.reap_spawners())
+    lab_manager._labs.mark_completed("bob")
+    async with asyncio.timeout(1):
+        await reaped["bob"].wait()
+    for username in ("alice", "carol"):
+        monitors[username].is_done.assert_not_called()
+        monitors[username].wait.assert_not_awaited()
+
+    # A later completion wakes the reaper again and reaps only that user.
+    lab_manager._labs.mark_completed("carol")
+    async with asyncio.timeout(1):
+        await reaped["carol"].wait()
+    monitors["alice"].wait.assert_not_awaited()
+    monitors["bob"].wait.assert_awaited_once()
+
+    reaper.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await reaper
@@ -0,0 +1,129 @@
+"""Tests for the watch-backed Kubernetes object cache."""
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+import pytest
+import structlog
+from kubernetes_asyncio.client import (
+    ApiClient,
+    ApiException,
+    V1ObjectMeta,
+    V1Service,
+)
+from safir.testing.kubernetes import MockKubernetesApi
+
+from nublado.controller.storage.kubernetes.cache import KubernetesObjectCache
+from nublado.controller.storage.kubernetes.deleter import ServiceStorage
+
+
+async def wait_for(condition: Callable[[], bool], timeout: float = 5) -> None:
+    """Wait for a condition to become true.
+
+    Parameters
+    ----------
+    condition
+        Condition to poll.
+    timeout
+        How long to wait in seconds before failing.
+
+    Raises
+    ------
+    TimeoutError
+        Raised if the condition did not become true within the timeout.
+    """
+    async with asyncio.timeout(timeout):
+        while True:
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+
+
+def cached_names(cache: KubernetesObjectCache[V1Service]) -> list[str]:
+    """Return the sorted names of the cached objects."""
+    return sorted(s.metadata.name for s in cache.list())
+
+
+@pytest.mark.asyncio
+async def test_cache(mock_kubernetes: MockKubernetesApi) -> None:
+    logger = structlog.get_logger(__name__)
+    storage = ServiceStorage(ApiClient(), timedelta(minutes=1), logger)
+    namespace = "cache"
+    labels = {"nublado.lsst.io/category": "fileserver"}
+    for name in ("existing", "other"):
+        service = V1Service(metadata=V1ObjectMeta(name=name, labels=labels))
+        await mock_kubernetes.create_namespaced_service(namespace, service)
+    service = V1Service(metadata=V1ObjectMeta(name="unrelated", labels={}))
+    await mock_kubernetes.create_namespaced_service(namespace, service)
+
+    # Start the cache and check that it picks up the existing objects that
+    # match the label selector.
+    cache = storage.build_cache(
+        namespace, label_selector="nublado.lsst.io/category=fileserver"
+    )
+    assert not cache.ready
+    task = asyncio.create_task(cache.watch())
+    await wait_for(lambda: cache.ready)
+    assert cached_names(cache) == ["existing", "other"]
+
+    # Additions and deletions should be reflected in the cache.
+    service = V1Service(metadata=V1ObjectMeta(name="new", labels=labels))
+    await mock_kubernetes.create_namespaced_service(namespace, service)
+    await mock_kubernetes.delete_namespaced_service("other", namespace)
+    await wait_for(lambda: cached_names(cache) == ["existing", "new"])
+    new = cache.get("new")
+    assert new
+    assert new.metadata.labels == labels
+    assert cache.get("other") is None
+
+    # Once the watch stops, the cache should no longer be used.
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await wait_for(lambda: not cache.ready)
+
+
+@pytest.mark.asyncio
+async def test_cache_expired(mock_kubernetes: MockKubernetesApi) -> None:
+    logger = structlog.get_logger(__name__)
+    namespace = "cache"
+    for name in ("existing", "other"):
+        service = V1Service(metadata=V1ObjectMeta(name=name))
+        await mock_kubernetes.create_namespaced_service(namespace, service)
+
+    # Wrap the list method so that the next watch call deletes an object and
+    # then fails with a 410 error, simulating a deletion that happens while
+    # the watch is down and whose event is therefore never seen.
+    expire = asyncio.Event()
+
+    async def list_services(*args: Any, **kwargs: Any) -> Any:
+        if kwargs.get("watch") and expire.is_set():
+            expire.clear()
+            await mock_kubernetes.delete_namespaced_service("other", namespace)
+            raise ApiException(status=410, reason="Gone")
+        return await mock_kubernetes.list_namespaced_service(*args, **kwargs)
+
+    cache = KubernetesObjectCache(
+        method=list_services,
+        object_type=V1Service,
+        kind="Service",
+        namespace=namespace,
+        reconnect_timeout=timedelta(seconds=1),
+        logger=logger,
+    )
+    task = asyncio.create_task(cache.watch())
+    await wait_for(lambda: cache.ready)
+    assert cached_names(cache) == ["existing", "other"]
+
+    # The next time the watch restarts, it will expire. The cache should
+    # relist and drop the deleted object.
+    expire.set()
+    await wait_for(lambda: cached_names(cache) == ["existing"])
+    assert not expire.is_set()
+    assert cache.ready
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
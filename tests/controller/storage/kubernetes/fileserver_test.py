@@ -0,0 +1,47 @@
+"""Tests for the Kubernetes storage layer for user fileservers."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+import structlog
+from kubernetes_asyncio.client import ApiClient
+from safir.testing.kubernetes import MockKubernetesApi
+
+from nublado.controller.exceptions import KubernetesError
+from nublado.controller.storage.kubernetes.fileserver import FileserverStorage
+
+
+@pytest.mark.asyncio
+async def test_run_steps_failure(mock_kubernetes: MockKubernetesApi) -> None:
+    logger = structlog.get_logger(__name__)
+    storage = FileserverStorage(ApiClient(), timedelta(minutes=1), logger)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+    error = KubernetesError("Error deleting object", kind="Job")
+
+    async def succeed() -> None:
+        pass
+
+    async def fail() -> None:
+        await started.wait()
+        raise error
+
+    async def block() -> None:
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    # The failure of one step should be raised directly rather than wrapped
+    # in an exception group, and the steps still running should be cancelled.
+    timings: dict[str, float] = {}
+    steps = {"Succeed": succeed(), "Fail": fail(), "Block": block()}
+    async with asyncio.timeout(1):
+        with pytest.raises(KubernetesError) as exc_info:
+            await storage._run_steps(steps, timings)
+    assert exc_info.value is error
+    assert cancelled.is_set()
+    assert list(timings) == ["Succeed"]
@@ -0,0 +1,62 @@
+"""Tests for the generic Kubernetes watch wrapper."""
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import pytest
+import structlog
+from kubernetes_asyncio.client import (
+    V1Container,
+    V1Namespace,
+    V1ObjectMeta,
+    V1Pod,
+    V1PodSpec,
+)
+from safir.testing.kubernetes import MockKubernetesApi
+
+from nublado.controller.models.domain.kubernetes import WatchEventType
+from nublado.controller.storage.kubernetes.watcher import KubernetesWatcher
+
+
+@pytest.mark.asyncio
+async def test_raw_watch(mock_kubernetes: MockKubernetesApi) -> None:
+    logger = structlog.get_logger(__name__)
+    namespace = "raw"
+    await mock_kubernetes.create_namespace(
+        V1Namespace(metadata=V1ObjectMeta(name=namespace))
+    )
+    watcher = KubernetesWatcher(
+        method=mock_kubernetes.list_namespaced_pod,
+        object_type=dict,
+        kind="Pod",
+        namespace=namespace,
+        timeout=None,
+        reconnect_timeout=timedelta(minutes=1),
+        logger=logger,
+    )
+
+    async def first_event() -> tuple[WatchEventType, dict[str, Any]]:
+        async for event in watcher.watch():
+            return (event.action, event.object)
+        raise AssertionError("Watch ended without events")
+
+    task = asyncio.create_task(first_event())
+    await asyncio.sleep(0.1)
+    labels = {"nublado.lsst.io/category": "lab"}
+    pod = V1Pod(
+        metadata=V1ObjectMeta(name="pod", namespace=namespace, labels=labels),
+        spec=V1PodSpec(containers=[V1Container(name="lab", image="lab")]),
+    )
+    await mock_kubernetes.create_namespaced_pod(namespace, pod)
+
+    # Objects should be returned as parsed JSON using the Kubernetes API
+    # field names rather than converted to models.
+    action, obj = await task
+    assert action == WatchEventType.ADDED
+    assert isinstance(obj, dict)
+    assert obj["metadata"]["name"] == "pod"
+    assert obj["metadata"]["labels"] == labels
+    assert obj["spec"]["containers"][0]["name"] == "lab"
+    assert obj["status"]["phase"] == mock_kubernetes.initial_pod_phase
+    await watcher.close()
@@ -0,0 +1,48 @@
+"""Test usage reporting functionality."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nublado.purger.config import Config
+from nublado.purger.exceptions import PlanNotReadyError
+from nublado.purger.models.plan import FileClass, FileReason
+from nublado.purger.purger import Purger
+
+from .util import set_age
+
+
+@pytest.mark.asyncio
+async def test_usage(purger_config: Config, fake_root: Path) -> None:
+    set_age(fake_root / "scratch" / "large", FileReason.ATIME, "8h")
+    (fake_root / "scratch" / "link").symlink_to(
+        fake_root / "scratch" / "large"
+    )
+    purger = Purger(config=purger_config)
+    with pytest.raises(PlanNotReadyError):
+        await purger.usage()
+    await purger.plan()
+    usage = await purger.usage()
+
+    # Files are attributed to the most specific policy, and symlinks are not
+    # counted. "medium" is large under the scratch policy but small under the
+    # foo/bar policy.
+    scratch = fake_root / "scratch"
+    bar = scratch / "foo" / "bar"
+    seen = {
+        (u.file_class, u.directory): (
+            u.files,
+            u.size,
+            u.purge_files,
+            u.purge_size,
+        )
+        for u in usage
+    }
+    assert {u.uid for u in usage} == {os.getuid()}
+    assert seen == {
+        (FileClass.LARGE, bar): (1, 45, 0, 0),
+        (FileClass.SMALL, bar): (2, 15, 0, 0),
+        (FileClass.LARGE, scratch): (2, 58, 1, 45),
+        (FileClass.SMALL, scratch): (1, 2, 0, 0),
+    }
@@ -1,11 +1,19 @@
 """Test reporting functionality."""
 
+import os
+from datetime import timedelta
+from pathlib import Path
+
 import pytest
 from safir.datetime import parse_timedelta
 
 from nublado.purger.config import Config
+from nublado.purger.exceptions import PlanNotReadyError
+from nublado.purger.models.plan import FileReason
 from nublado.purger.purger import Purger
 
+from .util import set_age
+
 
 @pytest.mark.asyncio
 async def test_warn(purger_config: Config) -> None:
@@ -25,3 +33,47 @@ async def test_file_count(purger_config: Config) -> None:
     # We expect that medium and small in `foobar` will not be marked, since
     # they have intervals of 0.
     assert len(victims) == 4
+
+
+@pytest.mark.asyncio
+async def test_horizons(purger_config: Config, fake_root: Path) -> None:
+    set_age(fake_root / "scratch" / "large", FileReason.ATIME, "8h")
+    set_age(fake_root / "scratch" / "small", FileReason.ATIME, "28d")
+    purger = Purger(config=purger_config)
+    horizons = [parse_timedelta(h) for h in ("7d", "1d", "3d")]
+    await purger.plan(horizons=[timedelta(0), *horizons])
+    assert purger._plan is not None
+    seen = {
+        f.path.relative_to(fake_root): f.horizon for f in purger._plan.files
+    }
+    assert seen[Path("scratch") / "large"] == timedelta(0)
+    assert seen[Path("scratch") / "small"] == timedelta(days=3)
+
+    # Fresh large files are purged within hours, so fall into the first
+    # non-zero horizon.
+    bar = Path("scratch") / "foo" / "bar"
+    assert seen[Path("scratch") / "medium"] == timedelta(days=1)
+    assert seen[bar / "large"] == timedelta(days=1)
+    assert len(seen) == 4
+
+    # Everything is owned by the user running the tests.
+    warnings = await purger.warn()
+    assert len(warnings) == 1
+    assert warnings[0].uid == os.getuid()
+    summary = {h.horizon: h.count for h in warnings[0].horizons}
+    assert summary == {
+        timedelta(0): 1,
+        timedelta(days=1): 2,
+        timedelta(days=3): 1,
+    }
+
+    # A plan for the future must not be executed.
+    await purger.purge()
+    assert (fake_root / "scratch" / "large").exists()
+
+
+@pytest.mark.asyncio
+async def test_warn_not_ready(purger_config: Config) -> None:
+    purger = Purger(config=purger_config)
+    with pytest.raises(PlanNotReadyError):
+        await purger.warn()
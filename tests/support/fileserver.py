@@ -1,5 +1,7 @@
 """Helper functions for fileserver tests."""
 
+import asyncio
+
 from kubernetes_asyncio.client import (
     V1Ingress,
     V1LoadBalancerIngress,
@@ -10,8 +12,10 @@ from safir.testing.kubernetes import MockKubernetesApi
 __all__ = [
     "activate_ingress_for_user",
     "create_ingress_for_user",
+    "create_working_ingress",
     "create_working_ingress_for_user",
     "delete_ingress_for_user",
+    "wait_for_shells",
 ]
 
 
@@ -60,3 +64,45 @@ async def delete_ingress_for_user(
     await mock_kubernetes.delete_namespaced_ingress(
         name=f"{username}-fs", namespace=namespace
     )
+
+
+async def create_working_ingress(
+    mock_kubernetes: MockKubernetesApi, name: str, namespace: str
+) -> None:
+    """Create an ``Ingress`` with an IP address for a warm pool shell."""
+    await mock_kubernetes.create_namespaced_ingress(
+        namespace=namespace,
+        body=V1Ingress(metadata=V1ObjectMeta(name=name, namespace=namespace)),
+    )
+    await mock_kubernetes.patch_namespaced_ingress_status(
+        name=name,
+        namespace=namespace,
+        body=[
+            {
+                "op": "replace",
+                "path": "/status/loadBalancer/ingress",
+                "value": [V1LoadBalancerIngress(ip="127.0.0.1")],
+            }
+        ],
+    )
+
+
+async def wait_for_shells(
+    mock_kubernetes: MockKubernetesApi, namespace: str, exclude: set[str]
+) -> str:
+    """Wait for a new warm pool shell to be created.
+
+    Shells are found by their ``Service``, as the file server storage layer
+    does, since the mock does not support listing custom objects by label.
+    Returns the name of the first shell found that is not in ``exclude``.
+    """
+    for _ in range(100):
+        services = await mock_kubernetes.list_namespaced_service(
+            namespace,
+            label_selector="nublado.lsst.io/category=fileserver-pool",
+        )
+        names = {s.metadata.name for s in services.items} - exclude
+        if names:
+            return names.pop()
+        await asyncio.sleep(0.01)
+    raise AssertionError("No warm pool shell was created")